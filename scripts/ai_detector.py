@@ -13,17 +13,34 @@ AI 味自动检测脚本
 
 import re
 import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
 import sys
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
-from collections import Counter
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional
+from collections import Counter, OrderedDict
+
+try:
+    from scripts.markdown_document import ParsedDocument, parse_document
+except ImportError:  # 作为脚本直接运行（python scripts/ai_detector.py）
+    from markdown_document import ParsedDocument, parse_document
 
 # 可选依赖：jieba 用于中文分词
 try:
     import jieba
     JIEBA_AVAILABLE = True
+    JIEBA_VERSION = getattr(jieba, "__version__", "")
 except ImportError:
     JIEBA_AVAILABLE = False
+    JIEBA_VERSION = ""
 
 
 @dataclass
@@ -73,6 +90,525 @@ class AIDetectionReport:
                 for r in self.results
             ]
         }
+    
+    def to_json(self) -> str:
+        """无损序列化（用于结果缓存）"""
+        return json.dumps(asdict(self), ensure_ascii=False)
+    
+    @classmethod
+    def from_json(cls, data: str) -> "AIDetectionReport":
+        """从 to_json 的输出还原报告"""
+        fields = json.loads(data)
+        fields["results"] = [DetectionResult(**r) for r in fields["results"]]
+        return cls(**fields)
+
+
+class KeywordMatcher:
+    """
+    多关键词单遍匹配器
+
+    把一组字面量关键词构建成字典树，再编译为一个正则，
+    一次扫描即可找出所有关键词（含相互重叠的）出现位置，
+    效果等价于 Aho-Corasick 自动机：
+
+    - 每个位置贪婪命中最长关键词，被它覆盖的较短关键词
+      （前缀及内部子串）通过预先计算的包含闭包补齐；
+    - 若有关键词可能从命中内部开始并越过其结尾，
+      则从最早的这种位置继续扫描，而不是跳到命中结尾。
+    """
+
+    # 按关键词元组缓存已构建的匹配器（进程级共享）
+    _cache: Dict[Tuple[str, ...], "KeywordMatcher"] = {}
+
+    def __init__(self, words: Iterable[str]):
+        """
+        构建匹配器
+
+        Args:
+            words: 关键词列表（字面量，不含正则语法）
+        """
+        self.words: Tuple[str, ...] = tuple(dict.fromkeys(w for w in words if w))
+        # 命中某关键词后，下一次扫描的起点偏移
+        self._resume: Dict[str, int] = {}
+        # 命中某关键词时，随之确定的 (偏移, 关键词) 列表
+        self._inner: Dict[str, Tuple[Tuple[int, str], ...]] = {}
+        for word in self.words:
+            resume = next(
+                (
+                    offset for offset in range(1, len(word))
+                    if any(
+                        len(other) > len(word) - offset and other.startswith(word[offset:])
+                        for other in self.words
+                    )
+                ),
+                len(word),
+            )
+            self._resume[word] = resume
+            self._inner[word] = tuple(
+                (offset, other)
+                for offset in range(resume)
+                for other in self.words
+                if word.startswith(other, offset)
+            )
+        self._regex = None
+        if self.words:
+            self._regex = re.compile(self._build_trie_pattern(self.words))
+
+    @classmethod
+    def for_words(cls, words: Iterable[str]) -> "KeywordMatcher":
+        """获取（或构建并缓存）指定关键词集合的匹配器"""
+        key = tuple(words)
+        matcher = cls._cache.get(key)
+        if matcher is None:
+            matcher = cls(key)
+            cls._cache[key] = matcher
+        return matcher
+
+    @staticmethod
+    def _build_trie_pattern(words: Iterable[str]) -> str:
+        """把关键词集合转为字典树结构的正则（贪婪匹配最长关键词）"""
+        root: Dict = {}
+        for word in words:
+            node = root
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        def render(node: Dict) -> str:
+            branches = [
+                re.escape(ch) + render(child)
+                for ch, child in node.items() if ch != ""
+            ]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            if "" in node:
+                # 当前节点本身是完整关键词，后续分支可选
+                return f"(?:{body})?"
+            return body
+
+        return render(root)
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """
+        查找所有关键词的出现位置
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            Dict[str, List[int]]: 关键词 -> 起始位置列表（升序，含重叠）
+        """
+        positions: Dict[str, List[int]] = {word: [] for word in self.words}
+        if self._regex is None:
+            return positions
+        inner = self._inner
+        resume = self._resume
+        search = self._regex.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            word = match.group()
+            for offset, other in inner[word]:
+                positions[other].append(start + offset)
+            pos = start + resume[word]
+        return positions
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        统计每个关键词的出现次数
+
+        与逐词 re.findall 的语义一致：同一关键词的多次出现互不重叠。
+
+        Args:
+            text: 待扫描文本
+
+        Returns:
+            Dict[str, int]: 关键词 -> 出现次数
+        """
+        return {
+            word: self._count_non_overlapping(starts, len(word))
+            for word, starts in self.find_all(text).items()
+        }
+
+    @staticmethod
+    def _count_non_overlapping(starts: List[int], length: int) -> int:
+        """从升序起始位置中按从左到右、互不重叠的规则计数"""
+        count = 0
+        next_free = 0
+        for start in starts:
+            if start >= next_free:
+                count += 1
+                next_free = start + length
+        return count
+
+
+# 连续汉字片段（与 PATTERN_SENTENCES 中的写法保持一致）
+HAN_RUN = r"[\u4e00-\u9fa5]+"
+_HAN_RUN_RE = re.compile(HAN_RUN)
+_REGEX_META = set(".^$*+?{}[]|()\\")
+
+
+def _is_han(ch: str) -> bool:
+    """是否为 CJK 统一汉字（与 HAN_RUN 的字符范围一致）"""
+    return "\u4e00" <= ch <= "\u9fa5"
+
+
+def _is_literal(pattern: str) -> bool:
+    """是否为不含正则语法的字面量"""
+    return not any(ch in _REGEX_META for ch in pattern)
+
+
+def _leading_literal(pattern: str) -> str:
+    """
+    提取正则的字面量前缀（每个匹配都必然以它开头）
+
+    顶层含有 | 分支时返回空串。
+    """
+    depth = 0
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return ""
+    end = 0
+    while end < len(pattern) and pattern[end] not in _REGEX_META:
+        end += 1
+    # 字面量后紧跟可选量词时，最后一个字符不是必然出现的
+    if end < len(pattern) and pattern[end] in "*?{":
+        end -= 1
+    return pattern[:max(end, 0)]
+
+
+# 机械连接词模式中的分隔间隙：至少一个空白/逗号后接任意内容
+SEP_GAP = r"[\s，,]+.*?"
+# 无分隔要求的任意间隙
+ANY_GAP = ".*?"
+_SEP_CHARS = "，,"
+
+
+class MarkerChain:
+    """
+    有序标记链检测器
+
+    识别形如 "A[\\s，,]+.*?B[\\s，,]+.*?C" 与 "A.*?B.*?(?:C|D)" 的模式
+    （按 DOTALL 语义），基于各标记词的出现位置做二分查找，
+    逐步推进扫描游标，匹配结果与 re.findall 一致。
+
+    回溯正则在"首先"很多而"最后"很少的长文上会退化为多项式级回溯，
+    标记链只访问每个命中位置常数次，耗时与文本长度线性相关。
+    """
+
+    def __init__(self, steps: List[Tuple[str, ...]], separated: bool):
+        """
+        Args:
+            steps: 各步骤的候选标记词（同一步骤内按正则分支顺序排列）
+            separated: 非末尾标记后是否必须紧跟空白或逗号
+        """
+        self.steps = steps
+        self.separated = separated
+        self.literals: Tuple[str, ...] = tuple(
+            dict.fromkeys(word for step in steps for word in step)
+        )
+        self._matcher = KeywordMatcher.for_words(self.literals)
+
+    @classmethod
+    def from_pattern(cls, pattern: str) -> Optional["MarkerChain"]:
+        """
+        从正则模式构建标记链
+
+        Args:
+            pattern: 机械连接词正则
+
+        Returns:
+            MarkerChain 或 None（模式不是有序标记链时）
+        """
+        if SEP_GAP in pattern:
+            parts, separated = pattern.split(SEP_GAP), True
+        elif ANY_GAP in pattern:
+            parts, separated = pattern.split(ANY_GAP), False
+        else:
+            return None
+
+        steps = []
+        for part in parts:
+            if part.startswith("(?:") and part.endswith(")"):
+                options = part[3:-1].split("|")
+            else:
+                options = [part]
+            if not all(option and _is_literal(option) for option in options):
+                return None
+            # 等长分支才能保证同一位置的匹配终点唯一
+            if len({len(option) for option in options}) != 1:
+                return None
+            steps.append(tuple(options))
+        if len(steps) < 2:
+            return None
+        return cls(steps, separated)
+
+    def count(
+        self,
+        text: str,
+        hits: Optional[Dict[str, List[int]]] = None,
+        limit: int = 0,
+    ) -> int:
+        """
+        统计标记链的非重叠匹配次数
+
+        Args:
+            text: 待检测文本
+            hits: 共享的关键词命中位置（缺省时自行扫描）
+            limit: 达到该次数即停止（0 表示不限）
+
+        Returns:
+            int: 匹配次数
+        """
+        if hits is None:
+            hits = self._matcher.find_all(text)
+
+        last = len(self.steps) - 1
+        candidates = []
+        for index, step in enumerate(self.steps):
+            # 同一位置只保留最先列出的分支（与正则分支优先级一致）
+            merged: Dict[int, int] = {}
+            for word in step:
+                for pos in hits.get(word, ()):
+                    merged.setdefault(pos, pos + len(word))
+            positions = sorted(merged.items())
+            if self.separated and index < last:
+                positions = [
+                    (pos, end) for pos, end in positions
+                    if end < len(text) and (text[end] in _SEP_CHARS or text[end].isspace())
+                ]
+            candidates.append(([pos for pos, _ in positions], [end for _, end in positions]))
+
+        gap = 1 if self.separated else 0
+        count = 0
+        cursor = 0
+        while True:
+            bound = cursor
+            end = -1
+            for index, (starts, ends) in enumerate(candidates):
+                i = bisect_left(starts, bound)
+                if i == len(starts):
+                    # 更靠后的起点只会让后续步骤更难满足，直接结束
+                    return count
+                end = ends[i]
+                bound = end + gap if index < last else end
+            count += 1
+            cursor = end
+            if limit and count >= limit:
+                return count
+
+
+@dataclass
+class TextScan:
+    """单遍扫描结果，供各检测维度共享"""
+    lines: List[str]                              # 按行切分的文本
+    titles: List[Tuple[int, str]]                 # 标题行 (行号, 标题)
+    transition_words: List[Tuple[str, int]]       # 过渡词计数
+    pattern_sentences: List[Tuple[str, int]]      # 套路化句式计数
+    mechanical_connectors: List[Tuple[str, int]]  # 机械连接词计数
+    continuous_transition: bool                   # 是否存在连续过渡词序列
+
+
+class FusedScanner:
+    """
+    融合扫描引擎
+
+    把各检测维度用到的字面量（过渡词、句式锚点、连接词起始词）
+    合并到一个 KeywordMatcher 中，对文本只做一次关键词扫描和一次分行，
+    各维度基于共享的命中位置计数，结果与逐维度的正则扫描完全一致：
+
+    - "汉字串+锚点" / "前缀+汉字串+后缀" 形式的句式直接由锚点位置判定；
+    - 有序标记链形式的连接词模式由 MarkerChain 线性判定；
+    - 其余以字面量开头的连接词模式只在该字面量的命中位置上锚定匹配；
+    - 无法识别的模式回退为整篇正则扫描。
+    """
+
+    def __init__(self, detector: "AIDetector"):
+        """
+        根据检测器的规则表构建引擎
+
+        Args:
+            detector: 已完成模式编译的检测器
+        """
+        self._detector = detector
+        keywords: List[str] = list(detector.TRANSITION_WORDS)
+
+        # 套路化句式：(描述, 类型, 参数)
+        self._sentence_specs = []
+        for pattern, desc in detector.PATTERN_SENTENCES:
+            spec = self._compile_sentence_spec(pattern)
+            if spec is None:
+                self._sentence_specs.append((desc, "regex", detector._pattern_cache[desc]))
+            else:
+                self._sentence_specs.append((desc,) + spec)
+                keywords.append(spec[1])
+
+        # 机械连接词：(原始模式, 标记链, 起始字面量, 编译后的正则)
+        self._connector_specs = []
+        for pattern, chain, compiled in zip(
+            detector.MECHANICAL_CONNECTORS,
+            detector._mechanical_chains,
+            detector._mechanical_patterns,
+        ):
+            leading = _leading_literal(pattern)
+            self._connector_specs.append((pattern, chain, leading, compiled))
+            keywords.extend(chain.literals if chain else [leading])
+
+        self._continuous_spec = (
+            detector.CONTINUOUS_TRANSITION_PATTERN,
+            detector._continuous_chain,
+            _leading_literal(detector.CONTINUOUS_TRANSITION_PATTERN),
+            detector._continuous_pattern,
+        )
+        chain, leading = self._continuous_spec[1:3]
+        keywords.extend(chain.literals if chain else [leading])
+
+        self._matcher = KeywordMatcher.for_words(keywords)
+
+    @staticmethod
+    def _compile_sentence_spec(pattern: str):
+        """识别可由锚点判定的句式模式，无法识别时返回 None"""
+        if pattern.startswith(HAN_RUN):
+            anchor = pattern[len(HAN_RUN):]
+            if anchor and _is_literal(anchor) and all(_is_han(ch) for ch in anchor):
+                return ("suffix", anchor)
+            return None
+        index = pattern.find(HAN_RUN)
+        if index > 0:
+            prefix = pattern[:index]
+            suffix = pattern[index + len(HAN_RUN):]
+            if (_is_literal(prefix) and all(_is_han(ch) for ch in prefix)
+                    and suffix and _is_literal(suffix) and not _is_han(suffix[0])):
+                return ("bracket", prefix, suffix)
+        return None
+
+    def scan(self, document: ParsedDocument) -> TextScan:
+        """
+        扫描文本
+
+        Args:
+            document: 待检测文本的解析文档（分行和标题复用文档上的结果）
+
+        Returns:
+            TextScan: 各维度共享的扫描结果
+        """
+        text = document.text
+        hits = self._matcher.find_all(text)
+
+        transition_words = []
+        for word in self._detector.TRANSITION_WORDS:
+            count = KeywordMatcher._count_non_overlapping(hits[word], len(word))
+            if count > 0:
+                transition_words.append((word, count))
+
+        pattern_sentences = []
+        for spec in self._sentence_specs:
+            count = self._count_sentence(text, hits, spec)
+            if count > 0:
+                pattern_sentences.append((spec[0], count))
+
+        mechanical_connectors = []
+        for spec in self._connector_specs:
+            count = self._count_connector(text, hits, spec)
+            if count > 0:
+                mechanical_connectors.append((spec[0], count))
+
+        continuous = self._count_connector(text, hits, self._continuous_spec, limit=1) > 0
+
+        return TextScan(
+            lines=document.lines,
+            titles=self._detector._document_titles(document),
+            transition_words=transition_words,
+            pattern_sentences=pattern_sentences,
+            mechanical_connectors=mechanical_connectors,
+            continuous_transition=continuous,
+        )
+
+    @staticmethod
+    def _count_sentence(text: str, hits: Dict[str, List[int]], spec) -> int:
+        """按锚点位置统计句式出现次数（与 findall 的非重叠语义一致）"""
+        kind = spec[1]
+        if kind == "regex":
+            return len(spec[2].findall(text))
+
+        count = 0
+        if kind == "suffix":
+            # 汉字串+锚点：贪婪匹配使每个连续汉字串至多命中一次，
+            # 且锚点前至少要有一个同串汉字；记录已计数汉字串的结尾，
+            # 串内后续锚点直接跳过，每个汉字只扫描一次
+            run_end = -1
+            for pos in hits[spec[2]]:
+                if pos < run_end or pos == 0 or not _is_han(text[pos - 1]):
+                    continue
+                count += 1
+                run_end = _HAN_RUN_RE.match(text, pos).end()
+            return count
+
+        # 前缀+汉字串+后缀：汉字串须延伸到串尾并紧跟后缀
+        prefix, suffix = spec[2], spec[3]
+        cursor = 0
+        checked_until = 0
+        for pos in hits[prefix]:
+            if pos < cursor or pos < checked_until:
+                continue
+            start = pos + len(prefix)
+            run = _HAN_RUN_RE.match(text, start)
+            end = run.end() if run else start
+            # 同一汉字串中的后续前缀结果相同，无需重复判定
+            checked_until = end
+            if run and text.startswith(suffix, end):
+                count += 1
+                cursor = end + len(suffix)
+        return count
+
+    @classmethod
+    def _count_connector(
+        cls, text: str, hits: Dict[str, List[int]], spec, limit: int = 0
+    ) -> int:
+        """统计连接词模式：优先使用标记链，否则锚定正则"""
+        _, chain, leading, compiled = spec
+        if chain:
+            return chain.count(text, hits, limit=limit)
+        return cls._count_anchored(text, hits, leading, compiled, limit=limit)
+
+    @staticmethod
+    def _count_anchored(
+        text: str,
+        hits: Dict[str, List[int]],
+        leading: str,
+        compiled: "re.Pattern",
+        limit: int = 0,
+    ) -> int:
+        """只在起始字面量的命中位置上尝试匹配（与 findall 的非重叠语义一致）"""
+        if not leading:
+            matches = compiled.findall(text)
+            return min(len(matches), limit) if limit else len(matches)
+
+        count = 0
+        cursor = 0
+        for pos in hits[leading]:
+            if pos < cursor:
+                continue
+            match = compiled.match(text, pos)
+            if match:
+                count += 1
+                cursor = max(match.end(), pos + 1)
+                if limit and count >= limit:
+                    break
+        return count
 
 
 class AIDetector:
@@ -117,6 +653,12 @@ class AIDetector:
         r"首先.*?其次.*?(?:最后|总之)",
     ]
     
+    # 连续过渡词序列（检测到即判定表达AI化满分）
+    CONTINUOUS_TRANSITION_PATTERN = r"首先.*?其次.*?(?:最后|总之)"
+    
+    # 评分逻辑版本：修改打分规则时递增，使已缓存的检测结果失效
+    SCORING_VERSION = 1
+    
     # 标题模式
     TITLE_PATTERNS = [
         r"^#{1,6}\s+",  # Markdown 标题
@@ -134,6 +676,39 @@ class AIDetector:
         self.threshold = threshold
         self._init_patterns()
     
+    @classmethod
+    def rule_signature(cls) -> Tuple:
+        """
+        规则集签名
+
+        由各规则表的内容组成，规则表不同（如子类覆盖）的检测器签名不同。
+        """
+        return (
+            tuple(cls.TRANSITION_WORDS),
+            tuple(cls.PATTERN_SENTENCES),
+            tuple(cls.MECHANICAL_CONNECTORS),
+            cls.CONTINUOUS_TRANSITION_PATTERN,
+            tuple(cls.TITLE_PATTERNS),
+        )
+    
+    def rules_version(self) -> str:
+        """
+        规则集版本号
+
+        由评分逻辑版本、检测器类、分词方式（是否安装 jieba 及其版本）、阈值和规则集签名
+        哈希得到，用作检测结果缓存键的一部分，任一项变化都会使旧缓存失效。
+        子类只重写检测方法而不改规则表时，也因类名不同而不共用缓存。
+        """
+        signature = (
+            self.SCORING_VERSION,
+            type(self).__qualname__,
+            JIEBA_AVAILABLE,
+            JIEBA_VERSION,
+            self.threshold,
+            self.rule_signature(),
+        )
+        return hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()[:16]
+    
     def _init_patterns(self):
         """编译正则表达式"""
         self._pattern_cache = {}
@@ -147,6 +722,24 @@ class AIDetector:
         self._title_patterns = [
             re.compile(p, re.MULTILINE) for p in self.TITLE_PATTERNS
         ]
+        # 合并为一个分支正则，每行只需匹配一次
+        self._title_regex = re.compile(
+            "|".join(f"(?:{p})" for p in self.TITLE_PATTERNS), re.MULTILINE
+        )
+
+        self._continuous_pattern = re.compile(self.CONTINUOUS_TRANSITION_PATTERN, re.DOTALL)
+
+        # 有序标记链：替代回溯正则，线性时间完成匹配（无法识别的模式为 None）
+        self._mechanical_chains = [
+            MarkerChain.from_pattern(p) for p in self.MECHANICAL_CONNECTORS
+        ]
+        self._continuous_chain = MarkerChain.from_pattern(self.CONTINUOUS_TRANSITION_PATTERN)
+
+        # 过渡词单遍匹配器（按词表缓存，进程内只构建一次）
+        self._transition_matcher = KeywordMatcher.for_words(self.TRANSITION_WORDS)
+
+        # 融合扫描引擎：detect() 对全文只扫描一次
+        self._scanner = FusedScanner(self)
     
     def detect_vocabulary_ai(self, text: str) -> DetectionResult:
         """
@@ -158,12 +751,17 @@ class AIDetector:
           4个过渡词得40分
           5个以上过渡词得20分
         """
-        found_words = []
-        for word in self.TRANSITION_WORDS:
-            count = len(re.findall(word, text))
-            if count > 0:
-                found_words.append((word, count))
-        
+        # 单遍扫描统计所有过渡词，保持词表顺序输出
+        word_counts = self._transition_matcher.count(text)
+        found_words = [
+            (word, word_counts[word])
+            for word in self._transition_matcher.words
+            if word_counts[word] > 0
+        ]
+        return self._vocabulary_result(found_words)
+    
+    def _vocabulary_result(self, found_words: List[Tuple[str, int]]) -> DetectionResult:
+        """根据过渡词计数生成词汇AI化结果"""
         total_count = sum(count for _, count in found_words)
         
         # 计算分数：按照新阈值规则
@@ -202,6 +800,10 @@ class AIDetector:
             if matches:
                 found_patterns.append((desc, len(matches)))
         
+        return self._structure_result(found_patterns)
+    
+    def _structure_result(self, found_patterns: List[Tuple[str, int]]) -> DetectionResult:
+        """根据套路化句式计数生成句式AI化结果"""
         # 计算分数：累积计分方式，每个模式扣分减少
         total_patterns = sum(count for _, count in found_patterns)
         # 降低惩罚力度：从20分改为12分
@@ -223,16 +825,30 @@ class AIDetector:
         权重：15%
         检测过度层级化
         """
-        lines = text.split('\n')
-        
-        # 查找所有标题行
+        document = parse_document(text)
+        return self._hierarchy_result(document.lines, self._document_titles(document))
+
+    def _document_titles(self, document: ParsedDocument) -> List[Tuple[int, str]]:
+        """文档的标题行（按标题规则缓存在文档上，同一正文只查找一次）"""
+        return document.memo(
+            ("titles", self._title_regex.pattern),
+            lambda: self._find_titles(document.lines),
+        )
+    
+    def _find_titles(self, lines: List[str]) -> List[Tuple[int, str]]:
+        """查找所有标题行"""
         titles = []
+        match = self._title_regex.match
         for i, line in enumerate(lines):
-            for pattern in self._title_patterns:
-                if pattern.match(line.strip()):
-                    titles.append((i, line.strip()))
-                    break
-        
+            stripped = line.strip()
+            if match(stripped):
+                titles.append((i, stripped))
+        return titles
+    
+    def _hierarchy_result(
+        self, lines: List[str], titles: List[Tuple[int, str]]
+    ) -> DetectionResult:
+        """根据标题行分布生成结构AI化结果"""
         # 检测连续3个以上同级标题
         continuous_count = 1
         max_continuous = 1
@@ -252,7 +868,6 @@ class AIDetector:
         for i, (line_num, title) in enumerate(titles):
             # 获取标题下的内容行数
             next_title_line = titles[i+1][0] if i+1 < len(titles) else len(lines)
-            content_lines = next_title_line - line_num - 1
             
             # 统计非空内容行
             non_empty = sum(1 for j in range(line_num+1, next_title_line) 
@@ -289,15 +904,24 @@ class AIDetector:
 
         # 1. 检测机械连接词
         for i, pattern in enumerate(self._mechanical_patterns):
-            matches = pattern.findall(text)
-            if matches:
-                found_patterns.append((self.MECHANICAL_CONNECTORS[i], len(matches)))
+            chain = self._mechanical_chains[i]
+            count = chain.count(text) if chain else len(pattern.findall(text))
+            if count:
+                found_patterns.append((self.MECHANICAL_CONNECTORS[i], count))
 
         # 2. 连续过渡词序列检测（直接满分）
         # 检测"首先"+"其次"+"最后/总之"连续出现
-        continuous_transition_pattern = re.compile(r"首先.*?其次.*?(?:最后|总之)", re.DOTALL)
-        continuous_match = continuous_transition_pattern.search(text)
+        if self._continuous_chain:
+            continuous_match = self._continuous_chain.count(text, limit=1) > 0
+        else:
+            continuous_match = self._continuous_pattern.search(text) is not None
 
+        return self._expression_result(found_patterns, continuous_match)
+    
+    def _expression_result(
+        self, found_patterns: List[Tuple[str, int]], continuous_match: bool
+    ) -> DetectionResult:
+        """根据机械连接词计数生成表达AI化结果"""
         # 计算分数
         mechanical_total = sum(count for _, count in found_patterns)
 
@@ -335,8 +959,8 @@ class AIDetector:
     
     def _detect_originality_jieba(self, text: str) -> DetectionResult:
         """使用jieba分词检测原创度"""
-        # 分词
-        words = list(jieba.cut(text))
+        # 分词（缓存在共享文档上）
+        words = parse_document(text).memo("jieba_words", lambda: list(jieba.cut(text)))
         
         # 过滤停用词和短词
         words = [w.strip() for w in words if len(w.strip()) >= 2]
@@ -382,10 +1006,10 @@ class AIDetector:
     
     def _detect_originality_simple(self, text: str) -> DetectionResult:
         """简单字符级原创度检测"""
-        # 移除空白字符
-        text_clean = re.sub(r'\s+', '', text)
+        # 移除空白字符（共享文档上的 compact）
+        document = parse_document(text)
         
-        if len(text_clean) < 10:
+        if len(document.compact) < 10:
             return DetectionResult(
                 dimension="内容原创度",
                 score=0,
@@ -394,8 +1018,7 @@ class AIDetector:
             )
         
         # 计算句子数
-        sentences = re.split(r'[。！？\n]', text_clean)
-        sentences = [s for s in sentences if len(s) >= 5]
+        sentences = [s for s in document.sentences if len(s) >= 5]
         
         if not sentences:
             return DetectionResult(
@@ -430,21 +1053,32 @@ class AIDetector:
             items=items
         )
     
-    def detect(self, text: str) -> AIDetectionReport:
+    def detect(self, text: str, fused: bool = True) -> AIDetectionReport:
         """
         执行完整检测
         
         Args:
             text: 待检测文本
+            fused: 是否使用融合扫描引擎（默认启用）；
+                   为 False 时逐维度调用 detect_* 分别扫描，结果相同
             
         Returns:
             AIDetectionReport: 检测报告
         """
         # 执行各项检测
-        vocab_result = self.detect_vocabulary_ai(text)
-        struct_result = self.detect_structure_ai(text)
-        hier_result = self.detect_hierarchy_ai(text)
-        expr_result = self.detect_expression_ai(text)
+        if fused:
+            scan = self._scanner.scan(parse_document(text))
+            vocab_result = self._vocabulary_result(scan.transition_words)
+            struct_result = self._structure_result(scan.pattern_sentences)
+            hier_result = self._hierarchy_result(scan.lines, scan.titles)
+            expr_result = self._expression_result(
+                scan.mechanical_connectors, scan.continuous_transition
+            )
+        else:
+            vocab_result = self.detect_vocabulary_ai(text)
+            struct_result = self.detect_structure_ai(text)
+            hier_result = self.detect_hierarchy_ai(text)
+            expr_result = self.detect_expression_ai(text)
         orig_result = self.detect_originality(text)
         
         results = [vocab_result, struct_result, hier_result, expr_result, orig_result]
@@ -536,21 +1170,379 @@ def format_report(report: AIDetectionReport, verbose: bool = False) -> str:
     return "\n".join(lines)
 
 
-def detect_ai_score(text: str) -> float:
+class DetectorRegistry:
+    """
+    检测器注册表
+
+    按配置（检测器类型、阈值、规则集签名）缓存已编译的检测器，
+    供便捷函数、发布器等调用方共享，避免每次检测都重新编译规则。
+    检测器构建后只读，可在多线程间共享。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._detectors: Dict[Tuple, AIDetector] = {}
+        self._hits = 0
+        self._builds = 0
+        self._build_seconds = 0.0
+        self._last_build_seconds = 0.0
+
+    def get(self, threshold: int = 5, detector_class: type = AIDetector) -> AIDetector:
+        """
+        获取（或构建并缓存）指定配置的检测器
+
+        Args:
+            threshold: 过渡词阈值
+            detector_class: 检测器类型（AIDetector 或其子类）
+
+        Returns:
+            AIDetector: 共享的检测器实例
+        """
+        key = (detector_class, threshold, detector_class.rule_signature())
+        detector = self._detectors.get(key)
+        if detector is not None:
+            with self._lock:
+                self._hits += 1
+            return detector
+
+        with self._lock:
+            # 双重检查，避免并发时重复构建
+            detector = self._detectors.get(key)
+            if detector is not None:
+                self._hits += 1
+                return detector
+            start = time.perf_counter()
+            detector = detector_class(threshold=threshold)
+            elapsed = time.perf_counter() - start
+            self._detectors[key] = detector
+            self._builds += 1
+            self._build_seconds += elapsed
+            self._last_build_seconds = elapsed
+            return detector
+
+    def stats(self) -> Dict:
+        """
+        获取构建统计
+
+        Returns:
+            Dict: 缓存数量、命中次数、构建次数及构建耗时（毫秒）
+        """
+        with self._lock:
+            return {
+                "detectors": len(self._detectors),
+                "hits": self._hits,
+                "builds": self._builds,
+                "build_ms_total": round(self._build_seconds * 1000, 3),
+                "build_ms_last": round(self._last_build_seconds * 1000, 3),
+            }
+
+    def clear(self) -> None:
+        """清空缓存的检测器和统计"""
+        with self._lock:
+            self._detectors.clear()
+            self._hits = 0
+            self._builds = 0
+            self._build_seconds = 0.0
+            self._last_build_seconds = 0.0
+
+
+# 全局检测器注册表
+_detector_registry = DetectorRegistry()
+
+
+def get_detector(threshold: int = 5, detector_class: type = AIDetector) -> AIDetector:
+    """
+    获取共享的检测器实例（按配置缓存）
+
+    Args:
+        threshold: 过渡词阈值
+        detector_class: 检测器类型
+
+    Returns:
+        AIDetector: 检测器实例
+    """
+    return _detector_registry.get(threshold, detector_class)
+
+
+def get_detector_stats() -> Dict:
+    """获取全局检测器注册表的构建统计"""
+    return _detector_registry.stats()
+
+
+# 项目根目录与默认的磁盘缓存位置
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / ".cache" / "ai_detection.sqlite3"
+
+
+class DetectionCache:
+    """
+    检测结果缓存
+
+    以"文本内容哈希 + 检测器规则集版本"为键，两级存储：
+    - 内存层：容量有限的 LRU
+    - 磁盘层（可选）：SQLite 文件，跨进程、跨运行复用
+
+    同一正文多次检测（多平台发布、重复运行 CLI）只需计算一次。
+    返回的报告为共享对象，调用方不应修改。
+    """
+
+    def __init__(self, max_entries: int = 256, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: 内存层最大条目数
+            db_path: SQLite 缓存文件路径，None 表示不启用磁盘层
+        """
+        self.max_entries = max_entries
+        self.db_path = str(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, AIDetectionReport]" = OrderedDict()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.db_path:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS detection_cache ("
+                "key TEXT PRIMARY KEY, report TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(detector: AIDetector, text: str) -> str:
+        """生成缓存键"""
+        # 摘要取自共享文档，检测时不再重复哈希正文
+        return f"{detector.rules_version()}:{parse_document(text).digest}"
+
+    def get(self, key: str) -> Optional[AIDetectionReport]:
+        """查询缓存，磁盘层命中时回填内存层"""
+        with self._lock:
+            report = self._memory.get(key)
+            if report is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return report
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT report FROM detection_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    report = AIDetectionReport.from_json(row[0])
+                    self._remember(key, report)
+                    self._disk_hits += 1
+                    return report
+            self._misses += 1
+            return None
+
+    def put(self, key: str, report: AIDetectionReport) -> None:
+        """写入缓存（内存层 + 磁盘层）"""
+        with self._lock:
+            self._remember(key, report)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO detection_cache (key, report, created_at) VALUES (?, ?, ?)",
+                    (key, report.to_json(), time.time()),
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, report: AIDetectionReport) -> None:
+        """写入内存层并按 LRU 淘汰"""
+        self._memory[key] = report
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def detect(self, detector: AIDetector, text: str) -> AIDetectionReport:
+        """
+        带缓存的检测
+
+        Args:
+            detector: 检测器
+            text: 待检测文本
+
+        Returns:
+            AIDetectionReport: 检测报告（命中缓存时不重新计算）
+        """
+        key = self.make_key(detector, text)
+        report = self.get(key)
+        if report is None:
+            report = detector.detect(text)
+            self.put(key, report)
+        return report
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict: 各层命中次数、未命中次数、命中率和条目数
+        """
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            total = hits + self._misses
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_enabled": self._conn is not None,
+            }
+
+    def clear(self) -> None:
+        """清空缓存（含磁盘层）和统计"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_hits = self._disk_hits = self._misses = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM detection_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """关闭磁盘层连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 全局检测结果缓存（默认仅内存层）
+_detection_cache = DetectionCache()
+
+
+def get_detection_cache() -> DetectionCache:
+    """获取全局检测结果缓存"""
+    return _detection_cache
+
+
+def set_detection_cache(cache: DetectionCache) -> None:
+    """替换全局检测结果缓存（如启用磁盘层）"""
+    global _detection_cache
+    _detection_cache = cache
+
+
+def detect_ai_score(text: str, threshold: int = 5) -> float:
     """
     便捷函数：检测文本的AI味分数
 
     Args:
         text: 待检测文本
+        threshold: 过渡词阈值，默认5个
 
     Returns:
         float: AI味分数 (0-100)，分数越高AI味越重
     """
-    detector = AIDetector()
-    report = detector.detect(text)
+    report = get_detection_cache().detect(get_detector(threshold), text)
     return report.total_score
 
 
+# ============================================================
+# 批量（语料）检测
+# ============================================================
+
+# 工作进程内复用的检测器（由进程池 initializer 创建）
+_worker_detector: Optional[AIDetector] = None
+
+
+def _init_worker(threshold: int, cache_path: Optional[str] = None) -> None:
+    """进程池初始化：每个工作进程只构建一次检测器（及磁盘缓存连接）"""
+    global _worker_detector
+    _worker_detector = get_detector(threshold)
+    if cache_path:
+        set_detection_cache(DetectionCache(db_path=cache_path))
+
+
+def _detect_path(path: str) -> Dict:
+    """检测单个文件，返回一行 JSON Lines 记录"""
+    detector = _worker_detector or get_detector()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        report = get_detection_cache().detect(detector, text)
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+    return {"file": path, **report.to_dict()}
+
+
+def collect_corpus_files(targets: Iterable[str], pattern: str = "*.md") -> List[str]:
+    """
+    展开语料路径
+
+    Args:
+        targets: 目录、文件或 glob 模式（支持 ** 递归）
+        pattern: 目录下匹配的文件名模式，默认 *.md
+
+    Returns:
+        List[str]: 去重并排序后的文件路径列表
+    """
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            files.extend(str(p) for p in Path(target).rglob(pattern) if p.is_file())
+        elif glob.has_magic(target):
+            files.extend(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+        else:
+            files.append(target)
+    return sorted(dict.fromkeys(files))
+
+
+def detect_corpus(
+    paths: List[str],
+    threshold: int = 5,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    并行检测多个文件，按完成顺序逐个产出结果
+
+    Args:
+        paths: 文件路径列表
+        threshold: 过渡词阈值
+        workers: 进程数，默认为 CPU 核数；为 1 时在当前进程内顺序执行
+        cache_path: 磁盘结果缓存路径（可选），未修改的文件重复运行时直接复用
+
+    Yields:
+        Dict: {"file": 路径, ...检测报告} 或 {"file": 路径, "error": 错误信息}
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker(threshold, cache_path)
+        for path in paths:
+            yield _detect_path(path)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(threshold, cache_path),
+    ) as executor:
+        futures = [executor.submit(_detect_path, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_corpus(
+    targets: List[str],
+    threshold: int = 5,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+) -> None:
+    """批量检测命令：逐行输出 JSON Lines，并以是否全部通过作为退出码"""
+    paths = collect_corpus_files(targets)
+    if not paths:
+        print(f"错误: 未找到待检测文件: {' '.join(targets)}", file=sys.stderr)
+        sys.exit(1)
+    
+    passed = True
+    for result in detect_corpus(paths, threshold=threshold, workers=workers, cache_path=cache_path):
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        if "error" in result or result["total_score"] >= 60:
+            passed = False
+    
+    sys.exit(0 if passed else 1)
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -561,6 +1553,9 @@ def main():
   python ai_detector.py --text "这是一段测试文本..."
   python ai_detector.py --file article.md
   python ai_detector.py --file article.md --verbose
+  python ai_detector.py --corpus content
+  python ai_detector.py --corpus "content/**/文章.md" --workers 4
+  python ai_detector.py --corpus content --cache
         """
     )
     
@@ -595,8 +1590,38 @@ def main():
         help="过渡词阈值 (默认5)"
     )
     
+    parser.add_argument(
+        "--corpus", "-c",
+        nargs="+",
+        metavar="PATH",
+        help="批量检测：目录或 glob 模式，结果按完成顺序以 JSON Lines 输出"
+    )
+    
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="批量检测的进程数 (默认CPU核数)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=str(DEFAULT_CACHE_PATH),
+        default=None,
+        metavar="PATH",
+        help=f"启用磁盘结果缓存 (默认路径 {DEFAULT_CACHE_PATH.relative_to(PROJECT_ROOT)})"
+    )
+    
     args = parser.parse_args()
     
+    if args.cache:
+        set_detection_cache(DetectionCache(db_path=args.cache))
+    
+    # 批量检测
+    if args.corpus:
+        run_corpus(args.corpus, threshold=args.threshold, workers=args.workers, cache_path=args.cache)
+    
     # 检查输入
     if not args.text and not args.file:
         parser.print_help()
@@ -617,12 +1642,11 @@ def main():
         text = args.text
     
     # 执行检测
-    detector = AIDetector(threshold=args.threshold)
-    report = detector.detect(text)
+    detector = get_detector(args.threshold)
+    report = get_detection_cache().detect(detector, text)
     
     # 输出结果
     if args.json:
-        import json
         print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
     else:
         print(format_report(report, verbose=args.verbose))
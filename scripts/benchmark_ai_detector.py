@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 味检测器 - 性能基准脚本
+
+1. 对比融合扫描引擎与逐维度扫描在语料上的耗时，并校验两者结果一致
+2. 构造病态输入（大量"首先"、缺少"最后"），对比回溯正则与标记链的耗时
+
+示例:
+  python scripts/benchmark_ai_detector.py
+  python scripts/benchmark_ai_detector.py --corpus content docs --rounds 5
+  python scripts/benchmark_ai_detector.py --sizes 1000 2000 50000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.ai_detector import AIDetector
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def load_corpus(paths: List[str]) -> List[str]:
+    """加载语料：目录下的所有 Markdown 文件或单个文件"""
+    texts = []
+    for path in paths:
+        target = Path(path)
+        if not target.is_absolute():
+            target = PROJECT_ROOT / target
+        files = sorted(target.rglob("*.md")) if target.is_dir() else [target]
+        for file in files:
+            texts.append(file.read_text(encoding="utf-8"))
+    return texts
+
+
+def time_run(func: Callable[[str], object], texts: List[str], rounds: int) -> float:
+    """多轮运行取最快一轮的耗时（秒）"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_fused(texts: List[str], rounds: int) -> None:
+    """融合扫描 vs 逐维度扫描"""
+    detector = AIDetector()
+
+    mismatched = [
+        i for i, text in enumerate(texts)
+        if detector.detect(text).to_dict() != detector.detect(text, fused=False).to_dict()
+    ]
+    if mismatched:
+        print(f"错误: {len(mismatched)} 篇文档的检测结果不一致")
+        sys.exit(1)
+
+    per_dimension = time_run(lambda t: detector.detect(t, fused=False), texts, rounds)
+    fused = time_run(detector.detect, texts, rounds)
+
+    print("融合扫描 vs 逐维度扫描")
+    print(f"  逐维度扫描: {per_dimension * 1000:.1f} ms")
+    print(f"  融合扫描:   {fused * 1000:.1f} ms")
+    print(f"  加速比:     {per_dimension / fused:.2f}x")
+
+
+def make_pathological(size: int) -> str:
+    """构造病态输入：大量起始标记、缺少收尾标记"""
+    unit = "首先，然后，第一，第二，第三，其次，一是，二是，"
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def bench_pathological(sizes: List[int], regex_max: int) -> None:
+    """回溯正则 vs 标记链（表达AI化维度）"""
+    detector = AIDetector()
+    regexes = [
+        re.compile(p, re.MULTILINE | re.DOTALL) for p in AIDetector.MECHANICAL_CONNECTORS
+    ]
+
+    print("病态输入: 回溯正则 vs 标记链")
+    for size in sizes:
+        text = make_pathological(size)
+
+        start = time.perf_counter()
+        result = detector.detect_expression_ai(text)
+        chain_ms = (time.perf_counter() - start) * 1000
+
+        if size <= regex_max:
+            start = time.perf_counter()
+            counts = [len(r.findall(text)) for r in regexes]
+            regex_ms = (time.perf_counter() - start) * 1000
+            if sum(counts) != int(result.details.split()[1]):
+                print(f"错误: {size} 字符输入的匹配次数不一致")
+                sys.exit(1)
+            regex_str = f"{regex_ms:10.1f} ms"
+        else:
+            regex_str = "     (跳过)"
+        print(f"  {size:>7} 字符  正则: {regex_str}  标记链: {chain_ms:8.1f} ms")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="AI味检测器性能基准")
+    parser.add_argument(
+        "--corpus", "-c",
+        nargs="+",
+        default=["content"],
+        help="语料目录或文件（默认 content）"
+    )
+    parser.add_argument(
+        "--rounds", "-r",
+        type=int,
+        default=3,
+        help="运行轮数，取最快一轮 (默认3)"
+    )
+    parser.add_argument(
+        "--sizes", "-s",
+        nargs="+",
+        type=int,
+        default=[1000, 2000, 50000],
+        help="病态输入长度列表（字符）"
+    )
+    parser.add_argument(
+        "--regex-max",
+        type=int,
+        default=2000,
+        help="超过该长度时跳过回溯正则 (默认2000)"
+    )
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    total_chars = sum(len(t) for t in texts)
+    print(f"语料: {len(texts)} 篇, {total_chars} 字符")
+    print("=" * 50)
+
+    bench_fused(texts, args.rounds)
+    print("=" * 50)
+    bench_pathological(args.sizes, args.regex_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown 渲染器 - 性能基准脚本
+
+对比单遍扫描渲染器（markdown_renderer）与原先知乎适配器中的
+六次 re.sub + 分段拼接实现，在语料和按倍数拼接的长文上的耗时。
+
+示例:
+  python scripts/benchmark_markdown.py
+  python scripts/benchmark_markdown.py --corpus content docs --rounds 5
+  python scripts/benchmark_markdown.py --scales 1 10 100
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.publisher.markdown_renderer import markdown_to_html
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def legacy_convert(text: str) -> str:
+    """原知乎适配器的转换实现（逐个 re.sub，用作基准）"""
+    html = text
+    html = re.sub(r'```(\w+)?\n(.*?)```', r'<pre><code>\2</code></pre>', html, flags=re.DOTALL)
+    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
+    html = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', html)
+    html = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', html)
+    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', html)
+    html = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', r'<img src="\2" alt="\1"/>', html)
+    paragraphs = html.split('\n\n')
+    return ''.join(f'<p>{p}</p>' for p in paragraphs if p.strip())
+
+
+def load_corpus(paths: List[str]) -> List[str]:
+    """加载语料：目录下的所有 Markdown 文件或单个文件"""
+    texts = []
+    for path in paths:
+        target = Path(path)
+        if not target.is_absolute():
+            target = PROJECT_ROOT / target
+        files = sorted(target.rglob("*.md")) if target.is_dir() else [target]
+        for file in files:
+            texts.append(file.read_text(encoding="utf-8"))
+    return texts
+
+
+def time_run(func: Callable[[str], object], texts: List[str], rounds: int) -> float:
+    """多轮运行取最快一轮的耗时（秒）"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(label: str, texts: List[str], rounds: int) -> None:
+    """单遍渲染器 vs 正则链"""
+    legacy = time_run(legacy_convert, texts, rounds)
+    renderer = time_run(markdown_to_html, texts, rounds)
+    chars = sum(len(t) for t in texts)
+    print(f"{label}（{len(texts)} 篇, {chars} 字符）")
+    print(f"  正则链:       {legacy * 1000:9.1f} ms")
+    print(f"  单遍渲染器:   {renderer * 1000:9.1f} ms")
+    print(f"  耗时比:       {renderer / legacy:9.2f}x")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Markdown 渲染器性能基准")
+    parser.add_argument(
+        "--corpus", "-c",
+        nargs="+",
+        default=["content"],
+        help="语料目录或文件（默认 content）"
+    )
+    parser.add_argument(
+        "--rounds", "-r",
+        type=int,
+        default=3,
+        help="运行轮数，取最快一轮 (默认3)"
+    )
+    parser.add_argument(
+        "--scales", "-s",
+        nargs="+",
+        type=int,
+        default=[10, 100],
+        help="长文测试：将全部语料拼接后重复的倍数"
+    )
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print("错误: 语料为空")
+        sys.exit(1)
+
+    print("=" * 50)
+    bench("语料", texts, args.rounds)
+    joined = "\n\n".join(texts)
+    for scale in args.scales:
+        print("=" * 50)
+        bench(f"长文 x{scale}", ["\n\n".join([joined] * scale)], args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown 文档解析（AI 检测与平台转换共享）
+
+同一篇正文会被多处使用：AI 检测按行查找标题、按句比较重复度，
+平台适配器把它转换为 HTML。这里把正文解析为一个共享的文档表示：
+
+- lines: 按行切分的文本（AI 检测的标题、结构分析）
+- blocks: 块级元素列表（代码块、标题、引用、列表、段落，HTML 渲染）
+- headings / paragraphs: 从块列表中提取的标题和段落
+- sentences: 去除空白后按句末标点切分的句子（原创度检测）
+
+各字段在首次访问时计算并保存在文档上；文档按正文的 SHA-256 哈希缓存（LRU），
+检测时完成的解析在发布转换时直接复用。返回的文档为共享对象，调用方不应修改。
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# ============================================================
+# 块级解析
+# ============================================================
+
+
+@dataclass(slots=True)
+class Block:
+    """块级元素"""
+    kind: str                     # paragraph / heading / code / list / quote
+    text: str = ""                # 段落、标题的行内文本；代码块的内容
+    level: int = 0                # 标题级别（1-6）
+    ordered: bool = False         # 列表是否有序
+    lang: str = ""                # 代码块语言
+    items: List[str] = field(default_factory=list)         # 列表项的行内文本
+    children: List["Block"] = field(default_factory=list)  # 引用块内的块
+
+
+# 会打断段落的块起始行（段落中的有序列表只有从 1 开始才算）
+_BLOCK_START = r"""
+    [ ]{0,3}(?: `{3} | ~{3} | \#{1,6}(?:[ \t]|\n|\Z) | > | [-*+][ \t] | 1[.)][ \t] )
+"""
+_ITEM = r"[ ]{0,3}(?:[-*+]|\d{1,9}[.)])[ \t]+[^\n]*(?:\n|\Z)"
+
+# 块级词法：每次匹配一个完整的块，由 re 在 C 层完成逐行判断
+_BLOCK = re.compile(r"""
+    (?P<blank> (?:[ \t]*\n)+ | [ \t]+\Z )
+  | (?P<fence>
+        [ ]{0,3}(?P<fchar>`{3,}|~{3,})[ \t]*(?P<lang>[^`\s]*)[^`\n]*(?:\n|\Z)
+        (?P<code>.*?)
+        (?: ^[ ]{0,3}(?P=fchar)[`~]*[ \t]*(?:\n|\Z) | \Z )
+    )
+  | (?P<heading>
+        [ ]{0,3}(?P<hashes>\#{1,6})(?:[ \t]+(?P<htext>[^\n]*?))?(?:[ \t]+\#+)?[ \t]*(?:\n|\Z)
+    )
+  | (?P<quote> (?: [ ]{0,3}>[^\n]*(?:\n|\Z) )+ )
+  | (?P<list>
+        """ + _ITEM + r"""
+        (?:
+            """ + _ITEM + r"""
+          | (?:[ \t]*\n)+ (?=""" + _ITEM + r""")
+          | (?!""" + _BLOCK_START + r""")[ \t]*[^\s][^\n]*(?:\n|\Z)
+        )*
+    )
+  | (?P<para> (?: (?!""" + _BLOCK_START + r""")[ \t]*[^\s][^\n]*(?:\n|\Z) )+ )
+""", re.MULTILINE | re.DOTALL | re.VERBOSE)
+
+_ITEM_LINE = re.compile(r"[ ]{0,3}(?:([-*+])|(\d{1,9})[.)])[ \t]+(.*)")
+_QUOTE_MARKER = re.compile(r"^[ ]{0,3}>[ ]?", re.MULTILINE)
+_HARD_BREAK = re.compile(r" {2,}\n[ \t]*")
+_SOFT_BREAK = re.compile(r"[ \t]*\n[ \t]*")
+
+
+def _inline_text(text: str) -> str:
+    """规整块内行内文本：行尾两个以上空格转为反斜杠硬换行，去掉各行首尾空白"""
+    text = text.strip()
+    if "\n" in text:
+        text = _SOFT_BREAK.sub("\n", _HARD_BREAK.sub("\\\\\n", text))
+    return text
+
+
+def _list_blocks(chunk: str) -> List[Block]:
+    """将列表块拆分为列表项；有序、无序交替时拆成多个列表"""
+    blocks: List[Block] = []
+    items: List[List[str]] = []
+    ordered = False
+    for line in chunk.split("\n"):
+        m = _ITEM_LINE.match(line)
+        if m:
+            is_ordered = m.group(2) is not None
+            if items and is_ordered != ordered:
+                blocks.append(Block("list", ordered=ordered,
+                                    items=[_inline_text("\n".join(i)) for i in items]))
+                items = []
+            ordered = is_ordered
+            items.append([m.group(3)])
+        elif line.strip():
+            items[-1].append(line)
+    blocks.append(Block("list", ordered=ordered, items=[_inline_text("\n".join(i)) for i in items]))
+    return blocks
+
+
+def parse_blocks(text: str) -> List[Block]:
+    """
+    将 Markdown 文本解析为块列表
+
+    Args:
+        text: Markdown 文本
+
+    Returns:
+        List[Block]: 块列表
+    """
+    text = text.replace("\r\n", "\n")
+    blocks: List[Block] = []
+    pos, n = 0, len(text)
+    match = _BLOCK.match
+    while pos < n:
+        m = match(text, pos)
+        if m is None or m.end() == pos:
+            # 兜底：无法识别的行按段落处理
+            end = text.find("\n", pos)
+            end = n if end == -1 else end + 1
+            line = _inline_text(text[pos:end])
+            if line:
+                blocks.append(Block("paragraph", line))
+            pos = end
+            continue
+        kind = m.lastgroup
+        if kind == "para":
+            blocks.append(Block("paragraph", _inline_text(m.group("para"))))
+        elif kind == "heading":
+            blocks.append(Block("heading", (m.group("htext") or "").strip(),
+                                level=len(m.group("hashes"))))
+        elif kind == "fence":
+            code = m.group("code")
+            blocks.append(Block("code", code[:-1] if code.endswith("\n") else code,
+                                lang=m.group("lang")))
+        elif kind == "quote":
+            inner = _QUOTE_MARKER.sub("", m.group("quote"))
+            blocks.append(Block("quote", children=parse_blocks(inner)))
+        elif kind == "list":
+            blocks.extend(_list_blocks(m.group("list")))
+        pos = m.end()
+    return blocks
+
+
+# ============================================================
+# 共享文档
+# ============================================================
+
+# 句末标点（原创度检测的分句规则）
+_SENTENCE_END = re.compile(r"[。！？]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def text_digest(text: str) -> str:
+    """正文的 SHA-256 十六进制摘要（文档缓存和检测结果缓存共用）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(eq=False)
+class ParsedDocument:
+    """解析后的 Markdown 文档，各字段按需计算且只计算一次"""
+    text: str
+    digest: str
+    _memo: Dict[Any, Any] = field(default_factory=dict, repr=False)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """按换行切分的原始行"""
+        return self.text.split("\n")
+
+    @cached_property
+    def blocks(self) -> List[Block]:
+        """块级元素列表"""
+        return parse_blocks(self.text)
+
+    @cached_property
+    def headings(self) -> List[Tuple[int, str]]:
+        """Markdown 标题 (级别, 文本)，含引用块内的标题"""
+        return [(b.level, b.text) for b in self._walk() if b.kind == "heading"]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        """段落的行内文本，含引用块内的段落"""
+        return [b.text for b in self._walk() if b.kind == "paragraph"]
+
+    @cached_property
+    def compact(self) -> str:
+        """去除全部空白字符后的文本"""
+        return _WHITESPACE.sub("", self.text)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """去除空白后按句末标点（。！？）切分的句子，保留空句"""
+        return _SENTENCE_END.split(self.compact)
+
+    def memo(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        缓存调用方基于本文档的派生结果（如按检测规则找到的标题行、分词结果）
+
+        Args:
+            key: 结果键，由调用方保证包含影响结果的规则信息
+            compute: 未缓存时的计算函数
+
+        Returns:
+            Any: 缓存或新计算的结果
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            return self._memo.setdefault(key, compute())
+
+    def _walk(self):
+        """按文档顺序遍历块（展开引用块）"""
+        stack = list(reversed(self.blocks))
+        while stack:
+            block = stack.pop()
+            yield block
+            if block.children:
+                stack.extend(reversed(block.children))
+
+
+class DocumentCache:
+    """
+    解析文档缓存
+
+    以正文哈希为键的 LRU，同一正文在 AI 检测、各平台转换中只解析一次。
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Args:
+            max_entries: 最大缓存文档数
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, ParsedDocument]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, text: str) -> ParsedDocument:
+        """
+        获取正文的解析文档，未缓存时新建
+
+        Args:
+            text: Markdown 正文
+
+        Returns:
+            ParsedDocument: 共享的文档对象
+        """
+        digest = text_digest(text)
+        with self._lock:
+            document = self._documents.get(digest)
+            if document is not None:
+                self._documents.move_to_end(digest)
+                self._hits += 1
+                return document
+            self._misses += 1
+            document = ParsedDocument(text, digest)
+            self._documents[digest] = document
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+            return document
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict: 命中次数、未命中次数、命中率和文档数
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "documents": len(self._documents),
+            }
+
+    def clear(self) -> None:
+        """清空缓存和统计"""
+        with self._lock:
+            self._documents.clear()
+            self._hits = self._misses = 0
+
+
+# 全局文档缓存
+_document_cache = DocumentCache()
+
+
+def get_document_cache() -> DocumentCache:
+    """获取全局文档缓存"""
+    return _document_cache
+
+
+def set_document_cache(cache: DocumentCache) -> None:
+    """替换全局文档缓存"""
+    global _document_cache
+    _document_cache = cache
+
+
+def parse_document(text: str) -> ParsedDocument:
+    """
+    便捷函数：从全局缓存获取正文的解析文档
+
+    Args:
+        text: Markdown 正文
+
+    Returns:
+        ParsedDocument: 共享的文档对象
+    """
+    return _document_cache.get(text)
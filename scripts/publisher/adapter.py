@@ -4,6 +4,7 @@
 提供平台适配器的通用实现
 """
 
+import asyncio
 import logging
 from abc import ABC
 from typing import Optional
@@ -16,6 +17,11 @@ from .base import (
     PostStatusResult,
     PostStatus,
 )
+from .preprocess import PreprocessPipeline
+from .retry import (
+    CircuitBreaker, RetryPolicy, get_circuit_breaker, get_retry_policy, is_retryable_error, is_transient_error,
+)
+from .transport import AsyncTransport, Transport, get_async_transport, get_transport
 
 
 logger = logging.getLogger(__name__)
@@ -28,9 +34,67 @@ class BaseAdapter(PlatformPublisher, ABC):
     提供通用的适配器实现，子类只需重写特定方法
     """
     
+    # 预处理流水线（子类声明平台特定的步骤，见 preprocess 模块）
+    preprocess_pipeline: PreprocessPipeline = PreprocessPipeline()
+    
     def __init__(self):
         self._logged_in = False
-        self._session = None
+        # 为 None 时使用全局共享连接池
+        self._transport: Optional[Transport] = None
+        self._async_transport: Optional[AsyncTransport] = None
+        # 为 None 时使用按发布配置创建的全局重试策略
+        self._retry_policy: Optional[RetryPolicy] = None
+    
+    @property
+    def transport(self) -> Transport:
+        """同步 HTTP 传输（默认为所有适配器共享的连接池）"""
+        return self._transport or get_transport()
+    
+    @transport.setter
+    def transport(self, transport: Optional[Transport]) -> None:
+        self._transport = transport
+    
+    @property
+    def async_transport(self) -> AsyncTransport:
+        """异步 HTTP 传输（默认为所有适配器共享的异步连接池）"""
+        return self._async_transport or get_async_transport()
+    
+    @async_transport.setter
+    def async_transport(self, transport: Optional[AsyncTransport]) -> None:
+        self._async_transport = transport
+    
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """发布重试策略（默认按 PublishSettings.max_retries / timeout）"""
+        return self._retry_policy or get_retry_policy()
+    
+    @retry_policy.setter
+    def retry_policy(self, policy: Optional[RetryPolicy]) -> None:
+        self._retry_policy = policy
+    
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """本平台的熔断器（同一平台的适配器和统一发布器共享）"""
+        return get_circuit_breaker(self.platform_name)
+    
+    def _attempt_failed(self, error: Exception) -> PublishResult:
+        """单次发布尝试抛出异常时的失败结果（按异常类型判断能否重试）"""
+        logger.exception(f"[{self.platform_name}] 发布异常: {str(error)}")
+        return PublishResult.failed_result(
+            f"发布异常: {str(error)}",
+            platform=self.platform,
+            retryable=is_retryable_error(error),
+            transient=is_transient_error(error),
+        )
+    
+    def _log_result(self, result: PublishResult) -> None:
+        if result.success:
+            logger.info(f"[{self.platform_name}] 发布成功: {result.post_url}")
+        else:
+            logger.error(
+                f"[{self.platform_name}] 发布失败（尝试 {result.attempts} 次，"
+                f"熔断器 {result.circuit_state}）: {result.error}"
+            )
     
     @property
     def platform(self) -> Platform:
@@ -91,21 +155,17 @@ class BaseAdapter(PlatformPublisher, ABC):
         # 预处理内容
         processed_content = self.preprocess_content(content)
         
-        # 执行发布
-        try:
-            logger.info(f"[{self.platform_name}] 开始发布: {content.title}")
-            result = self._do_publish(processed_content)
-            if result.success:
-                logger.info(f"[{self.platform_name}] 发布成功: {result.post_url}")
-            else:
-                logger.error(f"[{self.platform_name}] 发布失败: {result.error}")
-            return result
-        except Exception as e:
-            logger.exception(f"[{self.platform_name}] 发布异常: {str(e)}")
-            return PublishResult.failed_result(
-                f"发布异常: {str(e)}",
-                platform=self.platform
-            )
+        # 执行发布（瞬时错误按重试策略重试，平台熔断时直接失败）
+        def attempt() -> PublishResult:
+            try:
+                return self._do_publish(processed_content)
+            except Exception as e:
+                return self._attempt_failed(e)
+        
+        logger.info(f"[{self.platform_name}] 开始发布: {content.title}")
+        result = self.retry_policy.run(attempt, breaker=self.circuit_breaker, platform=self.platform)
+        self._log_result(result)
+        return result
     
     def get_status(self, post_id: str) -> PostStatusResult:
         """获取发布状态（子类可以重写具体实现）"""
@@ -116,6 +176,63 @@ class BaseAdapter(PlatformPublisher, ABC):
             )
         return self._do_get_status(post_id)
     
+    # ========== 异步接口 ==========
+    
+    async def alogin(self) -> bool:
+        """异步登录账号（流程同 login）"""
+        logger.info(f"[{self.platform_name}] 开始登录...")
+        result = await self._ado_login()
+        self._logged_in = result
+        if result:
+            logger.info(f"[{self.platform_name}] 登录成功")
+        else:
+            logger.warning(f"[{self.platform_name}] 登录失败")
+        return result
+    
+    async def apublish(self, content: Content) -> PublishResult:
+        """异步发布内容（流程同 publish）"""
+        # 检查登录状态
+        if not self.is_logged_in():
+            logger.warning(f"[{self.platform_name}] 未登录，尝试自动登录...")
+            if not await self.alogin():
+                return PublishResult.failed_result(
+                    f"发布失败：未登录且自动登录失败",
+                    platform=self.platform
+                )
+        
+        # 验证内容
+        is_valid, error_msg = self.validate_content(content)
+        if not is_valid:
+            logger.warning(f"[{self.platform_name}] 内容验证失败: {error_msg}")
+            return PublishResult.failed_result(
+                f"内容验证失败: {error_msg}",
+                platform=self.platform
+            )
+        
+        # 预处理内容
+        processed_content = self.preprocess_content(content)
+        
+        # 执行发布（同 publish）
+        async def attempt() -> PublishResult:
+            try:
+                return await self._ado_publish(processed_content)
+            except Exception as e:
+                return self._attempt_failed(e)
+        
+        logger.info(f"[{self.platform_name}] 开始发布: {content.title}")
+        result = await self.retry_policy.arun(attempt, breaker=self.circuit_breaker, platform=self.platform)
+        self._log_result(result)
+        return result
+    
+    async def aget_status(self, post_id: str) -> PostStatusResult:
+        """异步获取发布状态"""
+        if not self.is_logged_in():
+            return PostStatusResult(
+                status=PostStatus.FAILED,
+                post_id=post_id,
+            )
+        return await self._ado_get_status(post_id)
+    
     # ========== 子类需要重写的方法 ==========
     
     def _do_login(self) -> bool:
@@ -142,6 +259,20 @@ class BaseAdapter(PlatformPublisher, ABC):
         """
         raise NotImplementedError(f"[{self.platform_name}] 子类必须实现 _do_get_status 方法")
     
+    # ========== 异步实现（默认在线程池中运行同步实现，子类可重写为原生异步） ==========
+    
+    async def _ado_login(self) -> bool:
+        """执行具体的登录逻辑（异步）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self._do_login)
+    
+    async def _ado_publish(self, content: Content) -> PublishResult:
+        """执行具体的发布逻辑（异步）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self._do_publish, content)
+    
+    async def _ado_get_status(self, post_id: str) -> PostStatusResult:
+        """执行具体的状态查询逻辑（异步）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self._do_get_status, post_id)
+    
     # ========== 可选重写的方法 ==========
     
     def validate_content(self, content: Content) -> tuple[bool, str]:
@@ -177,9 +308,10 @@ class BaseAdapter(PlatformPublisher, ABC):
         """
         预处理内容
         
-        子类可以重写此方法进行平台特定的预处理
+        执行类上声明的 preprocess_pipeline，不修改也不深拷贝原内容；
+        子类通常只需声明流水线步骤，特殊需求时也可以重写此方法
         """
-        return content
+        return self.preprocess_pipeline.apply(content)
 
 
 class LazyAdapter(BaseAdapter):
@@ -217,3 +349,15 @@ class LazyAdapter(BaseAdapter):
     
     def _do_get_status(self, post_id: str) -> PostStatusResult:
         return self._get_adapter()._do_get_status(post_id)
+    
+    async def _ado_login(self) -> bool:
+        return await self._get_adapter()._ado_login()
+    
+    async def _ado_publish(self, content: Content) -> PublishResult:
+        return await self._get_adapter()._ado_publish(content)
+    
+    async def _ado_get_status(self, post_id: str) -> PostStatusResult:
+        return await self._get_adapter()._ado_get_status(post_id)
+    
+    def preprocess_content(self, content: Content) -> Content:
+        return self._get_adapter().preprocess_content(content)
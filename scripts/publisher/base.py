@@ -4,12 +4,15 @@
 定义多平台发布的标准接口和数据模型
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
+from scripts.markdown_document import ParsedDocument, parse_document
+
 
 class PostStatus(Enum):
     """帖子状态枚举"""
@@ -45,6 +48,11 @@ class Content:
     topic_id: str = ""                   # 选题ID（扩展字段）
     case_count: int = 0                  # 案例数量（扩展字段）
     
+    @property
+    def document(self) -> ParsedDocument:
+        """正文的解析文档（按正文哈希共享，AI 检测和平台转换只解析一次）"""
+        return parse_document(self.body)
+    
     def validate(self) -> bool:
         """验证内容是否符合发布要求"""
         if not self.title or len(self.title.strip()) == 0:
@@ -76,6 +84,11 @@ class PublishResult:
     error: str = ""                      # 错误信息（失败时）
     timestamp: datetime = field(default_factory=datetime.now)  # 发布时间
     platform: Platform = Platform.CUSTOM # 发布的平台
+    elapsed_ms: float = 0.0              # 发布耗时（毫秒，多平台发布时填写）
+    attempts: int = 1                    # 尝试次数（含重试；被熔断拒绝时为 0）
+    retryable: bool = False              # 失败是否可以安全重试（请求未被平台受理，重发不会重复发布）
+    transient: bool = False              # 失败是否因平台不可用（连接失败、超时、5xx），计入熔断
+    circuit_state: str = ""              # 发布后平台熔断器状态（closed / open / half_open）
     
     @classmethod
     def success_result(cls, post_id: str, post_url: str, platform: Platform = Platform.CUSTOM) -> 'PublishResult':
@@ -89,13 +102,21 @@ class PublishResult:
         )
     
     @classmethod
-    def failed_result(cls, error: str, platform: Platform = Platform.CUSTOM) -> 'PublishResult':
-        """创建失败结果"""
+    def failed_result(
+        cls,
+        error: str,
+        platform: Platform = Platform.CUSTOM,
+        retryable: bool = False,
+        transient: bool = False,
+    ) -> 'PublishResult':
+        """创建失败结果（retryable 表示可以安全重试，transient 表示平台暂时不可用）"""
         return cls(
             success=False,
             error=error,
             platform=platform,
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            retryable=retryable,
+            transient=transient,
         )
 
 
@@ -177,6 +198,22 @@ class PlatformPublisher(ABC):
         """
         pass
     
+    # ========== 异步接口 ==========
+    # 默认实现在线程池中运行同步方法，避免阻塞事件循环；
+    # 支持原生异步的发布器可以直接重写。
+    
+    async def apublish(self, content: Content) -> PublishResult:
+        """异步发布内容（参见 publish）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.publish, content)
+    
+    async def aget_status(self, post_id: str) -> PostStatusResult:
+        """异步获取发布状态（参见 get_status）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_status, post_id)
+    
+    async def alogin(self) -> bool:
+        """异步登录账号（参见 login）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.login)
+    
     def validate_content(self, content: Content) -> tuple[bool, str]:
         """
         验证内容是否符合平台要求
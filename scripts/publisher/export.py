@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+发布记录导出模块
+
+将追踪器中的发布记录流式导出为 JSON Lines、CSV 或紧凑的列式文件，
+支持按平台、选题、状态和时间范围过滤，用于周数据复盘的全量历史导出。
+
+记录按块（chunk_size 条）从存储读取并写出，内存占用与总记录数无关；
+行数据直接来自存储的行格式（record_row），不经过 PublishRecord.to_dict。
+文件名以 .gz 结尾时使用 gzip 压缩。
+
+列式格式（columnar）：
+    第一行为文件头 {"format": "publish-records-columnar", "version": 1, "columns": [...]}；
+    之后每行是一个行组 {"rows": n, "columns": {列名: 值列表 | {"dict": [...], "codes": [...]}}}，
+    重复较多的字符串列（平台、账号、状态等）按行组做字典编码。
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Union
+
+from .tracker import RECORD_COLUMNS, PostStatus, RecordStore, get_record_store
+
+
+EXPORT_FORMATS = ("jsonl", "csv", "columnar")
+DEFAULT_CHUNK_SIZE = 1000
+
+COLUMNAR_FORMAT = "publish-records-columnar"
+COLUMNAR_VERSION = 1
+
+_SUFFIX_FORMATS = {".jsonl": "jsonl", ".csv": "csv", ".pcol": "columnar"}
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _write_jsonl(f: TextIO, chunks: Iterator[List[tuple]]) -> int:
+    """每行一条记录（键为 RECORD_COLUMNS）"""
+    count = 0
+    for chunk in chunks:
+        f.write("".join(_encode_json(dict(zip(RECORD_COLUMNS, row))) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+def _write_csv(f: TextIO, chunks: Iterator[List[tuple]]) -> int:
+    """首行为表头，空值写为空字符串"""
+    writer = csv.writer(f)
+    writer.writerow(RECORD_COLUMNS)
+    count = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def _encode_column(values: List[Any]) -> Any:
+    """字符串列去重后不超过一半时做字典编码"""
+    if not values or not all(isinstance(v, str) for v in values):
+        return values
+    codes: Dict[str, int] = {}
+    encoded = [codes.setdefault(v, len(codes)) for v in values]
+    if len(codes) * 2 > len(values):
+        return values
+    return {"dict": list(codes), "codes": encoded}
+
+
+def _decode_column(column: Any) -> List[Any]:
+    if isinstance(column, dict):
+        dictionary = column["dict"]
+        return [dictionary[code] for code in column["codes"]]
+    return column
+
+
+def _write_columnar(f: TextIO, chunks: Iterator[List[tuple]]) -> int:
+    """每块写为一个行组，列内字典编码"""
+    f.write(_encode_json({
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "columns": list(RECORD_COLUMNS),
+    }) + "\n")
+    count = 0
+    for chunk in chunks:
+        columns = {
+            name: _encode_column(list(values))
+            for name, values in zip(RECORD_COLUMNS, zip(*chunk))
+        }
+        f.write(_encode_json({"rows": len(chunk), "columns": columns}) + "\n")
+        count += len(chunk)
+    return count
+
+
+_WRITERS = {"jsonl": _write_jsonl, "csv": _write_csv, "columnar": _write_columnar}
+
+
+def _open_text(path: Path, mode: str, compress: Optional[bool] = None) -> TextIO:
+    """打开文本文件，compress 默认按扩展名（.gz）决定是否 gzip 压缩"""
+    if compress is None:
+        compress = path.suffix == ".gz"
+    newline = "" if mode.startswith("w") else None
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline=newline)
+    return open(path, mode, encoding="utf-8", newline=newline)
+
+
+def guess_format(path: Union[str, Path]) -> str:
+    """
+    根据文件扩展名推断导出格式（忽略 .gz）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        str: 格式名，无法识别时为 "jsonl"
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        path = path.with_suffix("")
+    return _SUFFIX_FORMATS.get(path.suffix, "jsonl")
+
+
+def export_records(
+    target: Union[str, Path, TextIO],
+    fmt: Optional[str] = None,
+    platform: Optional[str] = None,
+    topic_id: Optional[str] = None,
+    status: Optional[PostStatus] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    store: Optional[RecordStore] = None,
+) -> int:
+    """
+    流式导出发布记录
+
+    写入文件路径时先写临时文件，完成后原子替换，中途失败不会留下半个文件。
+
+    Args:
+        target: 输出文件路径或已打开的文本文件对象
+        fmt: 导出格式（jsonl / csv / columnar），默认按扩展名推断
+        platform: 只导出该平台
+        topic_id: 只导出该选题
+        status: 只导出该状态
+        start: 发布时间下限（包含）
+        end: 发布时间上限（不包含）
+        chunk_size: 每块读取和写出的记录数
+        store: 记录存储，默认使用全局存储
+
+    Returns:
+        int: 导出的记录数
+
+    Raises:
+        ValueError: 格式不支持时
+    """
+    if fmt is None:
+        fmt = guess_format(target) if isinstance(target, (str, Path)) else "jsonl"
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的导出格式: {fmt}，可选: {', '.join(EXPORT_FORMATS)}")
+    if store is None:
+        store = get_record_store()
+    chunks = store.iter_rows(platform, topic_id, status, start, end, chunk_size=chunk_size)
+    write = _WRITERS[fmt]
+
+    if not isinstance(target, (str, Path)):
+        return write(target, chunks)
+
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with _open_text(tmp_path, "w", compress=path.suffix == ".gz") as f:
+            count = write(f, chunks)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def read_columnar(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    逐行组读取列式导出文件，按行返回字典
+
+    Args:
+        path: 文件路径
+
+    Raises:
+        ValueError: 文件头不是列式导出格式时
+    """
+    with _open_text(Path(path), "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != COLUMNAR_FORMAT:
+            raise ValueError(f"不是列式导出文件: {path}")
+        names = header["columns"]
+        for line in f:
+            group = json.loads(line)
+            columns = [_decode_column(group["columns"][name]) for name in names]
+            for values in zip(*columns):
+                yield dict(zip(names, values))
+
+
+def main():
+    """命令行入口函数"""
+    import argparse
+    import sys
+
+    # Windows 环境下配置 UTF-8 输出
+    if sys.platform == "win32":
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    parser = argparse.ArgumentParser(
+        description="发布追踪器 - 发布记录导出"
+    )
+    parser.add_argument("output", help="输出文件路径（.jsonl / .csv / .pcol，可加 .gz 压缩）")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="导出格式，默认按扩展名推断")
+    parser.add_argument("--platform", help="只导出该平台")
+    parser.add_argument("--topic", help="只导出该选题ID")
+    parser.add_argument(
+        "--status",
+        choices=[s.value for s in PostStatus],
+        help="只导出该状态"
+    )
+    parser.add_argument("--since", help="起始日期（包含），格式 YYYY-MM-DD")
+    parser.add_argument("--until", help="截止日期（不包含），格式 YYYY-MM-DD")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"每块记录数，默认 {DEFAULT_CHUNK_SIZE}"
+    )
+
+    args = parser.parse_args()
+    count = export_records(
+        args.output,
+        fmt=args.format,
+        platform=args.platform,
+        topic_id=args.topic,
+        status=PostStatus(args.status) if args.status else None,
+        start=datetime.strptime(args.since, "%Y-%m-%d") if args.since else None,
+        end=datetime.strptime(args.until, "%Y-%m-%d") if args.until else None,
+        chunk_size=args.chunk_size,
+    )
+    print(f"已导出 {count} 条记录到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
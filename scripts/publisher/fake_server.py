@@ -0,0 +1,139 @@
+"""
+统一发布框架 - 本地假服务器
+
+在 127.0.0.1 的随机端口上运行的 HTTP/1.1 服务器（支持 keep-alive），
+按 (方法, 路径) 注册处理函数，记录收到的请求和建立的连接数。
+用于在不访问真实平台的情况下测试适配器和传输层：
+
+    with FakeServer() as server:
+        server.route("POST", "/api/v4/articles", lambda req: (200, {"id": "1"}))
+        adapter = ZhihuAdapter(cookies=..., api_base=server.url)
+
+以完整 URL 为请求目标的请求（经 HTTP 代理转发的形式）同样按路径匹配，
+并标记 proxied=True，因此假服务器也可以作为 HTTP 代理地址使用。
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class FakeRequest:
+    """假服务器收到的请求"""
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]               # 小写的头部名 -> 值
+    body: bytes = b""
+    proxied: bool = False                 # 请求目标为完整 URL（经代理）
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+# 处理函数返回 (状态码, 响应体) 或 (状态码, 响应体, 额外头部)；
+# 响应体为 dict/list 时按 JSON 编码；返回 None 时不响应，直接断开连接
+Handler = Callable[[FakeRequest], tuple]
+
+
+class FakeServer:
+    """本地假 HTTP 服务器"""
+
+    def __init__(self, routes: Optional[Dict[Tuple[str, str], Handler]] = None):
+        """
+        Args:
+            routes: 初始路由 {(方法, 路径): 处理函数}
+        """
+        self.routes: Dict[Tuple[str, str], Handler] = dict(routes or {})
+        self.requests: List[FakeRequest] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        """注册处理函数"""
+        self.routes[(method.upper(), path)] = handler
+
+    @property
+    def url(self) -> str:
+        """服务器根地址，如 http://127.0.0.1:54321"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _handle(self):
+                target = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = FakeRequest(
+                    method=self.command,
+                    path=target.path or "/",
+                    query=parse_qs(target.query),
+                    headers={k.lower(): v for k, v in self.headers.items()},
+                    body=self.rfile.read(length) if length else b"",
+                    proxied=bool(target.scheme),
+                )
+                with server._lock:
+                    server.requests.append(request)
+                handler = server.routes.get((request.method, request.path))
+                if handler is None:
+                    result = (404, {"error": f"no route: {request.method} {request.path}"})
+                else:
+                    result = handler(request)
+                if result is None:
+                    # 模拟服务器收到请求后连接中断
+                    self.close_connection = True
+                    return
+                status, body = result[0], result[1]
+                headers = dict(result[2]) if len(result) > 2 else {}
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                    headers.setdefault("Content-Type", "application/json; charset=utf-8")
+                elif isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if "Transfer-Encoding" not in headers:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
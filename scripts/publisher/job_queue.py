@@ -0,0 +1,778 @@
+"""
+统一发布框架 - 持久化发布任务队列
+
+发布任务保存在 SQLite 中，按 (选题ID, 平台) 唯一，状态为
+pending → running → succeeded / failed。批量发布中途崩溃后重新运行：
+
+- 已成功的任务不会再次发布（重复入队也不会重置）
+- 租约过期的 running 任务（进程崩溃时正在发布）重新领取；
+  领取前先查发布记录（tracker），已有发布成功记录的直接标记成功，不重复发布；
+  没有发布记录、但崩溃前已开始调用平台发布的任务无法确认是否已发布，记为 failed
+  并注明需人工核实，核实后用 retry-failed 重新发布
+- 可重试的失败（瞬时错误）延后重新排队，达到最大尝试次数后记为 failed
+
+JobRunner 以线程池领取任务，按 scheduler.RateLimiter 的发布间隔限流：
+名额不足的任务延后放回队列，不占用工作线程。
+
+命令行：
+    python -m scripts.publisher.job_queue enqueue                 # 将 content/ 下的文章入队
+    python -m scripts.publisher.job_queue drain --workers 4       # 发布全部待发布任务
+    python -m scripts.publisher.job_queue status
+    python -m scripts.publisher.job_queue retry-failed
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .base import Content, PublishResult
+from .publisher import UnifiedPublisher
+from .scheduler import RateLimiter, get_rate_limiter
+from .tracker import PROJECT_ROOT, PostStatus as TrackerPostStatus, get_record_store
+
+
+DEFAULT_JOB_DB_PATH = PROJECT_ROOT / "data" / "publish_jobs.db"
+DEFAULT_CONTENT_ROOT = PROJECT_ROOT / "content"
+ARTICLE_FILENAME = "文章.md"        # content/<选题>/<平台>/文章.md
+
+DEFAULT_LEASE_TIMEOUT = 600.0       # 租约时长（秒），超过后视为领取者已崩溃
+DEFAULT_MAX_ATTEMPTS = 3            # 单个任务的最大尝试次数
+DEFAULT_RETRY_DELAY = 60.0          # 可重试失败后重新排队的延迟（秒），之后每次翻倍
+
+
+class JobState(Enum):
+    """发布任务状态"""
+    PENDING = "pending"       # 待发布
+    RUNNING = "running"       # 已被领取，发布中
+    SUCCEEDED = "succeeded"   # 发布成功
+    FAILED = "failed"         # 发布失败（不再自动重试）
+
+
+@dataclass
+class PublishJob:
+    """发布任务"""
+    job_id: int
+    topic_id: str
+    platform: str
+    content: Content
+    account: str = ""                     # 空表示使用发布器配置中的默认账号
+    source: str = ""                      # 来源文件路径
+    priority: int = 0                     # 数字越小越优先
+    state: JobState = JobState.PENDING
+    attempts: int = 0
+    not_before: float = 0.0               # 最早领取时间（Unix 时间戳）
+    lease_owner: str = ""
+    lease_expires: float = 0.0
+    publish_started: float = 0.0          # 开始调用平台发布的时间，发布结果记录后清零
+    post_id: str = ""
+    post_url: str = ""
+    error: str = ""
+    updated_at: float = 0.0
+
+
+class JobQueue:
+    """
+    SQLite 发布任务队列（线程安全，多个进程可共享同一数据库文件）
+
+    领取任务在 BEGIN IMMEDIATE 事务中完成，同一任务不会被两个领取者同时持有；
+    同一平台同一账号同时只有一个任务在发布，按优先级和入队顺序依次领取。
+    完成和放回都校验租约持有者，租约已被他人接管时操作无效。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS publish_jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_id TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            account TEXT NOT NULL DEFAULT '',
+            content TEXT NOT NULL,
+            source TEXT NOT NULL DEFAULT '',
+            priority INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            not_before REAL NOT NULL DEFAULT 0,
+            lease_owner TEXT NOT NULL DEFAULT '',
+            lease_expires REAL NOT NULL DEFAULT 0,
+            publish_started REAL NOT NULL DEFAULT 0,
+            post_id TEXT NOT NULL DEFAULT '',
+            post_url TEXT NOT NULL DEFAULT '',
+            error TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            UNIQUE (topic_id, platform)
+        );
+        CREATE INDEX IF NOT EXISTS idx_publish_jobs_state
+            ON publish_jobs (state, priority, job_id);
+        CREATE INDEX IF NOT EXISTS idx_publish_jobs_lane
+            ON publish_jobs (platform, account, state);
+    """
+
+    COLUMNS = (
+        "job_id", "topic_id", "platform", "content", "account", "source", "priority", "state",
+        "attempts", "not_before", "lease_owner", "lease_expires", "publish_started", "post_id",
+        "post_url", "error", "updated_at",
+    )
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        """
+        Args:
+            db_path: 数据库文件路径，":memory:" 表示内存数据库
+            lease_timeout: 租约时长（秒）
+            max_attempts: 单个任务的最大尝试次数
+            retry_delay: 可重试失败后重新排队的延迟（秒），之后每次翻倍
+        """
+        self.db_path = str(db_path)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 显式管理事务（isolation_level=None），领取时使用 BEGIN IMMEDIATE 加写锁
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(publish_jobs)")}
+        if "publish_started" not in existing:
+            # 旧版本创建的数据库没有该列
+            self._conn.execute(
+                "ALTER TABLE publish_jobs ADD COLUMN publish_started REAL NOT NULL DEFAULT 0"
+            )
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> PublishJob:
+        data = dict(zip(cls.COLUMNS, row))
+        data["content"] = Content(**json.loads(data["content"]))
+        data["state"] = JobState(data["state"])
+        return PublishJob(**data)
+
+    def _select(self, where: str = "1", params: tuple = ()) -> List[PublishJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM publish_jobs WHERE {where} "
+                f"ORDER BY priority, job_id",
+                params,
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def _update(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def enqueue(
+        self,
+        content: Content,
+        platforms: List[str],
+        account: str = "",
+        source: str = "",
+        priority: int = 0,
+    ) -> int:
+        """
+        添加发布任务（幂等）
+
+        已存在的 (选题ID, 平台) 任务不会重复添加；仍为 pending 的任务更新为新内容，
+        其他状态的任务保持不变。
+
+        Args:
+            content: 要发布的内容（topic_id 不能为空）
+            platforms: 目标平台列表
+            account: 发布账号（可选）
+            source: 来源文件路径（可选）
+            priority: 优先级，数字越小越优先
+
+        Returns:
+            int: 新添加的任务数
+        """
+        if not content.topic_id:
+            raise ValueError("发布任务需要 topic_id")
+        payload = json.dumps(asdict(content), ensure_ascii=False)
+        now = time.time()
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for platform in platforms:
+                    cursor = self._conn.execute(
+                        "INSERT INTO publish_jobs (topic_id, platform, account, content, source, "
+                        "priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (topic_id, platform) DO NOTHING",
+                        (content.topic_id, platform, account, payload, source, priority, now, now),
+                    )
+                    if cursor.rowcount:
+                        added += 1
+                        continue
+                    self._conn.execute(
+                        "UPDATE publish_jobs SET account = ?, content = ?, source = ?, priority = ?, "
+                        "updated_at = ? WHERE topic_id = ? AND platform = ? AND state = 'pending'",
+                        (account, payload, source, priority, now, content.topic_id, platform),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    @staticmethod
+    def _platform_filter(platforms: Optional[List[str]]) -> Tuple[str, tuple]:
+        """平台过滤条件（None 表示不过滤，空列表表示不匹配任何任务）"""
+        if platforms is None:
+            return "", ()
+        if not platforms:
+            return " AND 0", ()
+        return f" AND platform IN ({', '.join('?' * len(platforms))})", tuple(platforms)
+
+    def lease(self, owner: str, limit: int = 1, platforms: Optional[List[str]] = None) -> List[PublishJob]:
+        """
+        领取可发布的任务：到期的 pending 任务，以及租约已过期的 running 任务；
+        已有任务在发布的平台账号跳过，每个平台账号最多领取一个
+
+        Args:
+            owner: 领取者标识
+            limit: 最多领取数量
+            platforms: 只领取这些平台的任务（可选）
+
+        Returns:
+            List[PublishJob]: 已领取的任务（state 为 running，attempts 已加一）
+        """
+        now = time.time()
+        condition, platform_params = self._platform_filter(platforms)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids, lanes = [], set()
+                for job_id, lane in self._conn.execute(
+                    "SELECT job_id, platform || char(0) || account FROM publish_jobs AS job "
+                    "WHERE ((state = 'pending' AND not_before <= ?) "
+                    "OR (state = 'running' AND lease_expires <= ?)) "
+                    "AND NOT EXISTS (SELECT 1 FROM publish_jobs AS busy "
+                    "WHERE busy.platform = job.platform AND busy.account = job.account "
+                    "AND busy.state = 'running' AND busy.lease_expires > ?)"
+                    f"{condition} ORDER BY priority, job_id",
+                    (now, now, now, *platform_params),
+                ):
+                    if lane not in lanes:
+                        lanes.add(lane)
+                        ids.append(job_id)
+                        if len(ids) >= limit:
+                            break
+                placeholders = ", ".join("?" * len(ids))
+                if ids:
+                    self._conn.execute(
+                        f"UPDATE publish_jobs SET state = 'running', lease_owner = ?, lease_expires = ?, "
+                        f"attempts = attempts + 1, updated_at = ? WHERE job_id IN ({placeholders})",
+                        (owner, now + self.lease_timeout, now, *ids),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if not ids:
+            return []
+        return self._select(f"job_id IN ({placeholders})", tuple(ids))
+
+    def complete(self, job: PublishJob, owner: str, result: PublishResult) -> bool:
+        """
+        记录发布结果
+
+        成功记为 succeeded；可重试的失败在未达到最大尝试次数时延后重新排队，否则记为 failed。
+
+        Args:
+            job: 已领取的任务
+            owner: 领取者标识
+            result: 发布结果
+
+        Returns:
+            bool: 是否仍持有租约（False 表示租约已过期并被他人接管，结果未记录）
+        """
+        now = time.time()
+        if result.success:
+            state, not_before = JobState.SUCCEEDED, 0.0
+        elif result.retryable and job.attempts < self.max_attempts:
+            state, not_before = JobState.PENDING, now + self.retry_delay * (2 ** (job.attempts - 1))
+        else:
+            state, not_before = JobState.FAILED, 0.0
+        return self._update(
+            "UPDATE publish_jobs SET state = ?, not_before = ?, lease_owner = '', lease_expires = 0, "
+            "publish_started = 0, post_id = ?, post_url = ?, error = ?, updated_at = ? "
+            "WHERE job_id = ? AND state = 'running' AND lease_owner = ?",
+            (state.value, not_before, result.post_id, result.post_url, result.error, now,
+             job.job_id, owner),
+        ) > 0
+
+    def mark_publishing(self, job: PublishJob, owner: str) -> bool:
+        """
+        记录任务开始调用平台发布（发布结果由 complete 记录）
+
+        租约过期后重新领取的任务据此判断上次是否可能已经发布。
+
+        Args:
+            job: 已领取的任务
+            owner: 领取者标识
+
+        Returns:
+            bool: 是否仍持有租约（False 时不应发布）
+        """
+        now = time.time()
+        job.publish_started = now
+        return self._update(
+            "UPDATE publish_jobs SET publish_started = ?, updated_at = ? "
+            "WHERE job_id = ? AND state = 'running' AND lease_owner = ?",
+            (now, now, job.job_id, owner),
+        ) > 0
+
+    def release(self, job: PublishJob, owner: str, not_before: float = 0.0) -> bool:
+        """
+        放回未发布的任务（不计入尝试次数）
+
+        Args:
+            job: 已领取的任务
+            owner: 领取者标识
+            not_before: 最早重新领取时间（Unix 时间戳）
+
+        Returns:
+            bool: 是否仍持有租约
+        """
+        return self._update(
+            "UPDATE publish_jobs SET state = 'pending', not_before = ?, lease_owner = '', "
+            "lease_expires = 0, publish_started = 0, attempts = attempts - 1, updated_at = ? "
+            "WHERE job_id = ? AND state = 'running' AND lease_owner = ?",
+            (not_before, time.time(), job.job_id, owner),
+        ) > 0
+
+    def defer(self, platform: str, account: str, not_before: float) -> int:
+        """
+        将同一平台同一账号的 pending 任务推迟到不早于 not_before（限流时整体推迟，
+        各任务的领取时间相同，仍按优先级和入队顺序领取）
+
+        Args:
+            platform: 平台
+            account: 任务的发布账号
+            not_before: 最早领取时间（Unix 时间戳）
+
+        Returns:
+            int: 推迟的任务数
+        """
+        return self._update(
+            "UPDATE publish_jobs SET not_before = ? "
+            "WHERE state = 'pending' AND platform = ? AND account = ? AND not_before < ?",
+            (not_before, platform, account, not_before),
+        )
+
+    def retry_failed(self, platform: Optional[str] = None) -> int:
+        """
+        将 failed 任务重新置为 pending（尝试次数清零）
+
+        Args:
+            platform: 只重置该平台（可选）
+
+        Returns:
+            int: 重置的任务数
+        """
+        sql = ("UPDATE publish_jobs SET state = 'pending', attempts = 0, not_before = 0, "
+               "publish_started = 0, updated_at = ? WHERE state = 'failed'")
+        params: tuple = (time.time(),)
+        if platform:
+            sql += " AND platform = ?"
+            params += (platform,)
+        return self._update(sql, params)
+
+    def next_ready_at(self, platforms: Optional[List[str]] = None) -> Optional[float]:
+        """
+        最早的任务可领取时间（Unix 时间戳）：pending 任务的 not_before，
+        以及 running 任务的租约到期时间（领取者崩溃后在此时被重新领取）
+
+        Args:
+            platforms: 只看这些平台的任务（可选）
+
+        Returns:
+            Optional[float]: 没有 pending 或 running 任务时返回 None
+        """
+        condition, params = self._platform_filter(platforms)
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(CASE state WHEN 'pending' THEN not_before ELSE lease_expires END) "
+                f"FROM publish_jobs WHERE state IN ('pending', 'running'){condition}", params
+            ).fetchone()[0]
+
+    def platforms(self) -> List[str]:
+        """有 pending 或 running 任务的平台"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT platform FROM publish_jobs "
+                "WHERE state IN ('pending', 'running') ORDER BY platform"
+            )]
+
+    def get(self, topic_id: str, platform: str) -> Optional[PublishJob]:
+        jobs = self._select("topic_id = ? AND platform = ?", (topic_id, platform))
+        return jobs[0] if jobs else None
+
+    def jobs(self, state: Optional[JobState] = None, platform: Optional[str] = None) -> List[PublishJob]:
+        """按状态和平台查询任务"""
+        conditions, params = [], []
+        if state is not None:
+            conditions.append("state = ?")
+            params.append(state.value)
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        return self._select(" AND ".join(conditions) or "1", tuple(params))
+
+    def counts(self) -> Dict[str, int]:
+        """
+        各状态的任务数
+
+        Returns:
+            Dict[str, int]: {状态: 任务数}，包含所有状态
+        """
+        counts = {state.value: 0 for state in JobState}
+        with self._lock:
+            for state, count in self._conn.execute(
+                "SELECT state, COUNT(*) FROM publish_jobs GROUP BY state"
+            ):
+                counts[state] = count
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """
+    发布任务执行器
+
+    多个工作线程各自领取任务并调用 UnifiedPublisher.publish。发布前向限流器申请名额，
+    名额不足时按等待时间放回队列；重新领取的任务先对照发布记录，避免崩溃后重复发布，
+    没有发布记录而上次已开始发布的任务记为失败，等待人工核实。
+    其他领取者崩溃遗留的 running 任务会等到租约过期后接手，队列中没有 pending 和
+    running 任务时才退出。
+    发布器未注册的平台的任务不领取，保持 pending，注册后再运行即可发布。
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        publisher: UnifiedPublisher,
+        workers: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+        owner: Optional[str] = None,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            queue: 发布任务队列
+            publisher: 统一发布器
+            workers: 工作线程数，默认取发布器的 max_concurrency
+            limiter: 限流器，默认使用全局限流器
+            owner: 领取者标识前缀，默认按主机进程生成
+            poll_interval: 没有可领取任务时的最长等待时间（秒）
+        """
+        self.queue = queue
+        self.publisher = publisher
+        self.workers = workers or publisher.config.max_concurrency
+        self.limiter = limiter or get_rate_limiter()
+        self.owner = owner or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._metrics = {
+            "succeeded": 0,
+            "failed": 0,
+            "requeued": 0,
+            "throttled": 0,
+            "reconciled": 0,
+            "interrupted": 0,
+        }
+
+    def run(self) -> Dict[str, int]:
+        """
+        执行到队列中没有待发布任务为止（阻塞）
+
+        Returns:
+            Dict[str, int]: 本次运行的成功、失败、重新排队、限流推迟、按发布记录补记成功
+                和发布中断待核实的次数
+        """
+        self._stop.clear()
+        threads = [
+            threading.Thread(target=self._work, args=(f"{self.owner}-{i}",), name=f"publish-job-{i}")
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.stats()
+
+    def stop(self) -> None:
+        """通知工作线程在当前任务完成后退出"""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._metrics)
+
+    def supported_platforms(self) -> List[str]:
+        """队列中有任务且已注册发布器的平台"""
+        return [p for p in self.queue.platforms() if self.publisher.get_publisher(p) is not None]
+
+    def unsupported_platforms(self) -> List[str]:
+        """队列中有任务但未注册发布器的平台（这些任务保持 pending）"""
+        return [p for p in self.queue.platforms() if self.publisher.get_publisher(p) is None]
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+
+    def _idle_wait(self) -> bool:
+        """
+        没有可领取任务时等待，队列已清空时返回 False
+
+        其他领取者遗留的 running 任务等到租约过期后重新领取，不视为已清空。
+        """
+        ready_at = self.queue.next_ready_at(self.supported_platforms())
+        with self._lock:
+            in_flight = self._in_flight
+        if ready_at is None and not in_flight:
+            return False
+        wait = self.poll_interval if ready_at is None else ready_at - time.time()
+        self._stop.wait(min(max(wait, 0.01), self.poll_interval))
+        return True
+
+    def _work(self, owner: str) -> None:
+        while not self._stop.is_set():
+            jobs = self.queue.lease(owner, platforms=self.supported_platforms())
+            if not jobs:
+                if not self._idle_wait():
+                    return
+                continue
+            with self._lock:
+                self._in_flight += 1
+            try:
+                self._process(jobs[0], owner)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def _process(self, job: PublishJob, owner: str) -> None:
+        account = job.account or self.publisher.config.default_account
+        if job.attempts > 1:
+            published = self._published_result(job)
+            if published is not None:
+                self.queue.complete(job, owner, published)
+                self._count("reconciled")
+                return
+            if job.publish_started:
+                # 上次发布过程中领取者崩溃，平台上可能已经发布，不自动重发
+                interrupted = PublishResult.failed_result(
+                    "上次发布中断，无法确认是否已发布，请在平台核实后用 retry-failed 重新发布"
+                )
+                if self.queue.complete(job, owner, interrupted):
+                    self._count("interrupted")
+                return
+        if not self.limiter.try_acquire(job.platform, account):
+            not_before = time.time() + self.limiter.wait_time(job.platform, account)
+            self.queue.release(job, owner, not_before=not_before)
+            self.queue.defer(job.platform, job.account, not_before)
+            self._count("throttled")
+            return
+        if not self.queue.mark_publishing(job, owner):
+            return
+        try:
+            result = self.publisher.publish(job.content, job.platform, account)
+        except Exception as e:
+            result = PublishResult.failed_result(f"发布异常: {e}")
+        if not self.queue.complete(job, owner, result):
+            return
+        if result.success:
+            self._count("succeeded")
+        elif result.retryable and job.attempts < self.queue.max_attempts:
+            self._count("requeued")
+        else:
+            self._count("failed")
+
+    @staticmethod
+    def _published_result(job: PublishJob) -> Optional[PublishResult]:
+        """
+        发布记录中已有该选题在该平台的成功记录时，返回对应的成功结果
+
+        发布记录不保存平台的帖子ID，结果中只有帖子链接。
+        """
+        records = get_record_store().query(
+            platform=job.platform, topic_id=job.topic_id, status=TrackerPostStatus.PUBLISHED
+        )
+        if not records:
+            return None
+        return PublishResult.success_result("", records[-1].post_url or "")
+
+
+def parse_article(path: Path) -> Tuple[str, str]:
+    """
+    读取文章文件：第一个一级标题为标题，其余为正文
+
+    Args:
+        path: Markdown 文件路径
+
+    Returns:
+        Tuple[str, str]: (标题, 正文)，没有一级标题时标题为空
+    """
+    text = path.read_text(encoding="utf-8")
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("# "):
+            return line[2:].strip(), "\n".join(lines[:i] + lines[i + 1:]).strip()
+    return "", text.strip()
+
+
+def topic_id_for(topic_dir: Path) -> str:
+    """选题目录的选题ID：目录名的编号前缀（如 011-MCP是什么 → 011），没有编号时为目录名"""
+    prefix = topic_dir.name.split("-", 1)[0]
+    return prefix if prefix.isdigit() else topic_dir.name
+
+
+def load_content_tree(
+    root: Path = DEFAULT_CONTENT_ROOT,
+    platforms: Optional[List[str]] = None,
+) -> List[Tuple[str, Content, Path]]:
+    """
+    读取内容仓库中的平台文章（content/<选题>/<平台>/文章.md）
+
+    Args:
+        root: 内容仓库目录
+        platforms: 只读取这些平台（可选）
+
+    Returns:
+        List[Tuple[str, Content, Path]]: (平台, 内容, 文件路径)，按选题和平台排序
+    """
+    articles = []
+    for path in sorted(Path(root).glob(f"*/*/{ARTICLE_FILENAME}")):
+        topic_dir, platform = path.parent.parent, path.parent.name
+        if platforms and platform not in platforms:
+            continue
+        title, body = parse_article(path)
+        articles.append((platform, Content(
+            title=title or topic_dir.name,
+            body=body,
+            topic_id=topic_id_for(topic_dir),
+        ), path))
+    return articles
+
+
+def enqueue_content_tree(
+    queue: JobQueue,
+    root: Path = DEFAULT_CONTENT_ROOT,
+    platforms: Optional[List[str]] = None,
+    account: str = "",
+) -> int:
+    """
+    将内容仓库中的平台文章加入发布队列（幂等）
+
+    Args:
+        queue: 发布任务队列
+        root: 内容仓库目录
+        platforms: 只入队这些平台（可选）
+        account: 发布账号（可选）
+
+    Returns:
+        int: 新添加的任务数
+    """
+    return sum(
+        queue.enqueue(content, [platform], account=account, source=str(path))
+        for platform, content, path in load_content_tree(root, platforms)
+    )
+
+
+# ============================================================
+# 命令行接口
+# ============================================================
+
+def main():
+    """命令行入口函数"""
+    import argparse
+    import sys
+
+    # Windows 环境下配置 UTF-8 输出
+    if sys.platform == "win32":
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')
+        except Exception:
+            pass
+
+    parser = argparse.ArgumentParser(
+        description="发布任务队列 - 批量发布与断点续发"
+    )
+    parser.add_argument(
+        "--db",
+        default=str(DEFAULT_JOB_DB_PATH),
+        help=f"任务数据库路径，默认 {DEFAULT_JOB_DB_PATH.relative_to(PROJECT_ROOT)}"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="将内容仓库中的文章入队")
+    enqueue_parser.add_argument("--root", default=str(DEFAULT_CONTENT_ROOT), help="内容仓库目录")
+    enqueue_parser.add_argument("--platform", action="append", help="只入队该平台（可重复）")
+    enqueue_parser.add_argument("--account", default="", help="发布账号，默认使用配置中的账号")
+
+    drain_parser = subparsers.add_parser("drain", help="发布全部待发布任务")
+    drain_parser.add_argument("--workers", type=int, help="工作线程数")
+    drain_parser.add_argument(
+        "--interval",
+        type=float,
+        help="同一账号同一平台的发布间隔（秒），默认取 publish_interval"
+    )
+
+    subparsers.add_parser("status", help="显示各状态任务数")
+
+    retry_parser = subparsers.add_parser("retry-failed", help="将失败任务重新置为待发布")
+    retry_parser.add_argument("--platform", help="只重置该平台")
+
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return
+
+    queue = JobQueue(args.db)
+    if args.command == "enqueue":
+        added = enqueue_content_tree(queue, Path(args.root), args.platform, args.account)
+        print(f"新入队 {added} 个任务")
+    elif args.command == "drain":
+        from .publisher import create_unified_publisher
+        from .zhihu import ZhihuAdapter
+
+        publisher = create_unified_publisher()
+        publisher.register_publisher(ZhihuAdapter())
+        limiter = RateLimiter(args.interval) if args.interval is not None else None
+        runner = JobRunner(queue, publisher, workers=args.workers, limiter=limiter)
+        stats = runner.run()
+        print(
+            f"成功 {stats['succeeded']}，失败 {stats['failed']}，重新排队 {stats['requeued']}，"
+            f"按发布记录补记 {stats['reconciled']}，发布中断待核实 {stats['interrupted']}"
+        )
+        unsupported = runner.unsupported_platforms()
+        if unsupported:
+            print(f"未注册发布器的平台（任务保持 pending）: {', '.join(unsupported)}")
+    elif args.command == "retry-failed":
+        print(f"已重置 {queue.retry_failed(args.platform)} 个失败任务")
+    for state, count in queue.counts().items():
+        print(f"  {state}: {count}")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
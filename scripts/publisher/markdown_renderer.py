@@ -0,0 +1,299 @@
+"""
+统一发布框架 - Markdown 渲染器
+
+将 Markdown 正文转换为平台支持的 HTML 子集（知乎）：
+p, br, h1-h6, ul, ol, li, img, a, blockquote, code, pre, strong, em
+
+分两步完成，每步只遍历一次：
+1. 块级解析：由共享的文档解析（scripts.markdown_document）完成，
+   同一正文在 AI 检测和各平台转换之间只解析一次
+2. 行内渲染：在每个块的文本上从左到右扫描特殊字符（` * [ ! \\），
+   代码段原样输出（不再解析其中的强调），强调、链接按嵌套递归渲染；
+   普通文本成段转义后拼接
+"""
+
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+
+from scripts.markdown_document import Block, parse_blocks, parse_document
+
+
+# 行内特殊字符
+_SPECIAL = re.compile(r"[`*!\[\\]")
+# 可用反斜杠转义的字符
+_ESCAPABLE = frozenset("\\`*_{}[]()#+-.!>")
+# 链接文本、强调的最大嵌套层数，更深的内容按普通文本转义输出
+MAX_INLINE_NESTING = 32
+
+
+# ============================================================
+# 行内渲染
+# ============================================================
+
+
+def _escape(text: str) -> str:
+    return html.escape(text, quote=False) if text else ""
+
+
+def _backtick_run(text: str, i: int) -> int:
+    """从 i 开始的连续反引号个数"""
+    j = i
+    while j < len(text) and text[j] == "`":
+        j += 1
+    return j - i
+
+
+def _find_code_close(text: str, start: int, run: int) -> int:
+    """查找与开始标记等长的反引号串，返回其位置，找不到返回 -1"""
+    fence = "`" * run
+    i = start
+    while True:
+        j = text.find(fence, i)
+        if j == -1:
+            return -1
+        k = _backtick_run(text, j)
+        if k == run:
+            return j
+        i = j + k
+
+
+def _find_closer(text: str, delim: str, start: int) -> int:
+    """
+    查找强调的结束标记
+
+    跳过代码段和转义字符；查找单个 * 时跳过 ** 等多星号串（它们属于内层加粗）。
+    """
+    i = start
+    while True:
+        j = text.find(delim, i)
+        if j == -1:
+            return -1
+        tick = text.find("`", i, j)
+        if tick != -1:
+            run = _backtick_run(text, tick)
+            close = _find_code_close(text, tick + run, run)
+            i = close + run if close != -1 else tick + run
+            continue
+        backslashes = 0
+        while j - backslashes - 1 >= i and text[j - backslashes - 1] == "\\":
+            backslashes += 1
+        if backslashes % 2:
+            i = j + 1
+            continue
+        if delim == "*" and text[j + 1:j + 2] == "*":
+            while j < len(text) and text[j] == "*":
+                j += 1
+            i = j
+            continue
+        return j
+
+
+class _LinkIndex:
+    """
+    单次行内渲染中的链接定位缓存
+
+    从某个 "[" 向后找匹配的 "]" 时用栈一并确定途经的每个 "[" 的匹配位置
+    （扫到末尾仍未闭合的记为 -1），之后遇到这些 "[" 直接查表或整段跳过；
+    查找 ")" 时复用上一次的结果。未闭合的方括号很多时每个字符也只扫描一次。
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._close: Dict[int, int] = {}
+        # 上一次查找 ")"：(起点, 结果)，[起点, 结果) 内没有 ")"，结果 -1 表示起点之后没有
+        self._paren: Optional[Tuple[int, int]] = None
+
+    def closing(self, i: int) -> int:
+        """text[i] == "[" 对应的 "]" 的位置，未闭合返回 -1"""
+        cached = self._close.get(i)
+        if cached is not None:
+            return cached
+        text = self.text
+        n = len(text)
+        stack: List[int] = []
+        j = i
+        while j < n:
+            c = text[j]
+            if c == "\\":
+                j += 2
+                continue
+            if c == "[":
+                known = self._close.get(j)
+                if known == -1:
+                    break
+                if known is not None:
+                    # 已扫描过的括号对内部都已确定
+                    j = known + 1
+                    continue
+                stack.append(j)
+            elif c == "]":
+                self._close[stack.pop()] = j
+                if not stack:
+                    return j
+            j += 1
+        for start in stack:
+            self._close[start] = -1
+        return -1
+
+    def paren(self, start: int) -> int:
+        """start 之后第一个 ")" 的位置，没有返回 -1"""
+        if self._paren is not None:
+            begin, found = self._paren
+            if begin <= start and (found == -1 or start <= found):
+                return found
+        found = self.text.find(")", start)
+        self._paren = (start, found)
+        return found
+
+
+def _parse_link(index: _LinkIndex, i: int) -> Optional[Tuple[str, str, int]]:
+    """
+    解析从 text[i] == "[" 开始的 [文本](链接)
+
+    Returns:
+        (文本, 链接, 结束位置)，格式不符时返回 None
+    """
+    text = index.text
+    j = index.closing(i)
+    if j == -1:
+        return None
+    if j + 1 >= len(text) or text[j + 1] != "(":
+        return None
+    close = index.paren(j + 2)
+    if close == -1:
+        return None
+    target = text[j + 2:close].strip()
+    url = target.split(None, 1)[0] if target else ""
+    return text[i + 1:j], url, close + 1
+
+
+def render_inline(text: str, depth: int = 0) -> str:
+    """
+    渲染行内元素：代码段、图片、链接、加粗、斜体、转义和硬换行
+
+    链接文本和强调内容递归渲染，嵌套超过 MAX_INLINE_NESTING 层时内层按普通文本
+    转义输出，深层嵌套的输入不会超出递归深度，耗时也与层数无关。
+
+    Args:
+        text: 行内 Markdown 文本
+        depth: 当前嵌套层数（递归时使用）
+
+    Returns:
+        str: HTML
+    """
+    if depth >= MAX_INLINE_NESTING:
+        return _escape(text)
+    out: List[str] = []
+    plain = i = 0
+    n = len(text)
+    links = _LinkIndex(text)
+    while True:
+        m = _SPECIAL.search(text, i)
+        if m is None:
+            break
+        i = m.start()
+        c = text[i]
+        rendered = None
+        end = i + 1
+
+        if c == "\\":
+            nxt = text[i + 1:i + 2]
+            if nxt == "\n":
+                rendered, end = "<br/>\n", i + 2
+            elif nxt and nxt in _ESCAPABLE:
+                rendered, end = _escape(nxt), i + 2
+        elif c == "`":
+            run = _backtick_run(text, i)
+            close = _find_code_close(text, i + run, run)
+            if close == -1:
+                rendered, end = "`" * run, i + run
+            else:
+                rendered = f"<code>{_escape(text[i + run:close])}</code>"
+                end = close + run
+        elif c == "!":
+            if text[i + 1:i + 2] == "[":
+                link = _parse_link(links, i + 1)
+                if link is not None:
+                    alt, src, end = link
+                    rendered = f'<img src="{html.escape(src)}" alt="{html.escape(alt)}"/>'
+        elif c == "[":
+            link = _parse_link(links, i)
+            if link is not None:
+                label, href, end = link
+                rendered = f'<a href="{html.escape(href)}">{render_inline(label, depth + 1)}</a>'
+        else:  # "*"
+            run = 1
+            while i + run < n and text[i + run] == "*":
+                run += 1
+            if run >= 2:
+                close = _find_closer(text, "**", i + 2)
+                # *** 结尾时加粗取最后两个星号，内层斜体取第一个
+                while close != -1 and text[close + 2:close + 3] == "*":
+                    close += 1
+                if close > i + 2:
+                    rendered = f"<strong>{render_inline(text[i + 2:close], depth + 1)}</strong>"
+                    end = close + 2
+            else:
+                close = _find_closer(text, "*", i + 1)
+                if close > i + 1:
+                    rendered = f"<em>{render_inline(text[i + 1:close], depth + 1)}</em>"
+                    end = close + 1
+            if rendered is None:
+                rendered, end = "*" * run, i + run
+
+        if rendered is None:
+            i += 1
+            continue
+        out.append(_escape(text[plain:i]))
+        out.append(rendered)
+        plain = i = end
+
+    out.append(_escape(text[plain:]))
+    return "".join(out)
+
+
+# ============================================================
+# HTML 输出
+# ============================================================
+
+
+def render_blocks(blocks: List[Block]) -> str:
+    """
+    将块列表渲染为 HTML
+
+    Args:
+        blocks: parse_blocks 的结果
+
+    Returns:
+        str: HTML
+    """
+    out: List[str] = []
+    for block in blocks:
+        kind = block.kind
+        if kind == "paragraph":
+            out.append(f"<p>{render_inline(block.text)}</p>")
+        elif kind == "heading":
+            out.append(f"<h{block.level}>{render_inline(block.text)}</h{block.level}>")
+        elif kind == "code":
+            out.append(f"<pre><code>{_escape(block.text)}</code></pre>")
+        elif kind == "list":
+            tag = "ol" if block.ordered else "ul"
+            items = "".join(f"<li>{render_inline(item)}</li>" for item in block.items)
+            out.append(f"<{tag}>{items}</{tag}>")
+        elif kind == "quote":
+            out.append(f"<blockquote>{render_blocks(block.children)}</blockquote>")
+    return "".join(out)
+
+
+def markdown_to_html(text: str) -> str:
+    """
+    将 Markdown 转换为 HTML（知乎支持的标签子集）
+
+    Args:
+        text: Markdown 文本
+
+    Returns:
+        str: HTML
+    """
+    return render_blocks(parse_document(text).blocks)
@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+发布追踪器 - MCP Memory 同步
+
+将发布记录写入知识图谱（MCP Memory）：
+- MemoryClient：写入接口，MCPMemoryClient 调用 MCP 工具，LocalMemoryServer 为本地替身
+- save_records_to_memory：批量写入，返回 BatchSaveReport
+- MemoryWriteQueue：后台写入队列，发布流程不等待知识图谱写入
+
+这些名称也从 tracker 模块导出。
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Iterable
+from time import monotonic, perf_counter
+import atexit
+import heapq
+import queue
+import threading
+
+from .record_store import PublishRecord
+
+
+class MemoryClient(ABC):
+    """知识图谱（MCP Memory）写入接口"""
+
+    @abstractmethod
+    def create_entities(self, entities: List[dict]) -> Any:
+        """创建实体（一次调用可包含多个实体）"""
+
+    @abstractmethod
+    def create_relations(self, relations: List[dict]) -> Any:
+        """创建关系（一次调用可包含多个关系）"""
+
+
+class MCPMemoryClient(MemoryClient):
+    """调用 MCP Memory 工具函数的客户端"""
+
+    def create_entities(self, entities: List[dict]) -> Any:
+        from mcp__memory__create_entities import mcp__memory__create_entities
+        return mcp__memory__create_entities(entities=entities)
+
+    def create_relations(self, relations: List[dict]) -> Any:
+        from mcp__memory__create_relations import mcp__memory__create_relations
+        return mcp__memory__create_relations(relations=relations)
+
+
+class LocalMemoryServer(MemoryClient):
+    """
+    本地 MCP Memory 替身（用于测试和离线演示）
+
+    在内存中保存实体和关系并统计调用次数；可指定写入时失败的实体名，
+    模拟服务端拒绝整批请求的情况。
+    """
+
+    def __init__(
+        self,
+        fail_entities: Iterable[str] = (),
+        fail_relations: bool = False,
+        unavailable: bool = False,
+    ):
+        """
+        Args:
+            fail_entities: 包含这些实体名的 create_entities 调用整体失败
+            fail_relations: create_relations 调用是否失败
+            unavailable: 模拟服务不可用，所有调用抛出 ConnectionError
+        """
+        self.fail_entities = set(fail_entities)
+        self.fail_relations = fail_relations
+        self.unavailable = unavailable
+        self.entities: Dict[str, dict] = {}
+        self.relations: List[dict] = []
+        self.calls: Dict[str, int] = {"create_entities": 0, "create_relations": 0}
+        self._lock = threading.Lock()
+
+    def create_entities(self, entities: List[dict]) -> Any:
+        with self._lock:
+            self.calls["create_entities"] += 1
+            if self.unavailable:
+                raise ConnectionError("MCP Memory 服务不可用")
+            rejected = [e["name"] for e in entities if e["name"] in self.fail_entities]
+            if rejected:
+                raise RuntimeError(f"实体写入失败: {', '.join(rejected)}")
+            for entity in entities:
+                self.entities[entity["name"]] = entity
+            return {"created": len(entities)}
+
+    def create_relations(self, relations: List[dict]) -> Any:
+        with self._lock:
+            self.calls["create_relations"] += 1
+            if self.unavailable:
+                raise ConnectionError("MCP Memory 服务不可用")
+            if self.fail_relations:
+                raise RuntimeError("关系写入失败")
+            self.relations.extend(relations)
+            return {"created": len(relations)}
+
+
+# 全局 MCP Memory 客户端
+_memory_client: MemoryClient = MCPMemoryClient()
+
+
+def get_memory_client() -> MemoryClient:
+    """获取全局 MCP Memory 客户端"""
+    return _memory_client
+
+
+def set_memory_client(client: MemoryClient) -> None:
+    """替换全局 MCP Memory 客户端（如测试时使用 LocalMemoryServer）"""
+    global _memory_client
+    _memory_client = client
+
+
+def save_to_memory(record: PublishRecord) -> dict:
+    """Save publish record to MCP Memory.
+
+    Args:
+        record: PublishRecord object
+
+    Returns:
+        MCP Memory API response
+    """
+    entity = record.to_entity()
+    result = get_memory_client().create_entities([entity])
+    
+    # 同时创建关系：内容 -> 已发布到 -> 平台
+    _create_publish_relation(record)
+    
+    return result
+
+
+def _publish_relations(record: PublishRecord) -> List[dict]:
+    """Build publish relations: topic -> published to -> platform, record -> topic.
+
+    Args:
+        record: PublishRecord object
+
+    Returns:
+        List of relation dicts
+    """
+    return [
+        {
+            "from": record.topic_id,
+            "relationType": "已发布到",
+            "to": record.platform
+        },
+        {
+            "from": record.record_id,
+            "relationType": "关联选题",
+            "to": record.topic_id
+        }
+    ]
+
+
+def _create_publish_relation(record: PublishRecord) -> None:
+    """Create publish relation: topic -> published to -> platform.
+
+    Args:
+        record: PublishRecord object
+    """
+    try:
+        get_memory_client().create_relations(_publish_relations(record))
+    except Exception as e:
+        # 关系创建失败不影响主流程，只记录日志
+        print(f"创建关系失败: {e}")
+
+
+# 批量写入 MCP Memory 时每次调用包含的记录数
+DEFAULT_MEMORY_BATCH_SIZE = 50
+
+# 与具体记录无关的写入错误（服务不可达、超时、工具未安装），逐条重试没有意义
+_MEMORY_OUTAGE_ERRORS = (OSError, ImportError)
+
+
+@dataclass
+class BatchSaveReport:
+    """批量写入 MCP Memory 的结果"""
+    saved: List[str] = field(default_factory=list)          # 写入成功的记录ID
+    failed: Dict[str, str] = field(default_factory=dict)    # 写入失败的记录ID -> 错误信息
+    relation_errors: List[str] = field(default_factory=list)  # 关系写入失败信息（不影响实体）
+    calls: int = 0                                          # 远程调用次数
+
+    @property
+    def ok(self) -> bool:
+        """是否全部成功"""
+        return not self.failed and not self.relation_errors
+
+
+def save_records_to_memory(
+    records: List[PublishRecord],
+    batch_size: int = DEFAULT_MEMORY_BATCH_SIZE,
+    isolate_failures: bool = True,
+) -> BatchSaveReport:
+    """Batch save publish records to MCP Memory.
+
+    Each batch of up to ``batch_size`` records costs one create_entities call
+    and one create_relations call (duplicate relations within a batch are
+    sent once). When a batch is rejected and ``isolate_failures`` is set, its
+    records are retried one by one so only the offending records are
+    reported as failed.
+
+    An outage error (connection failure, timeout, missing MCP tool) is not
+    caused by any single record: no further calls are made and every record
+    not yet written is reported as failed with that error.
+
+    Args:
+        records: List of PublishRecord objects
+        batch_size: Records per create call, defaults to 50
+        isolate_failures: Whether to retry a rejected batch record by record
+
+    Returns:
+        BatchSaveReport with saved/failed record IDs and call count
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size 必须大于 0")
+
+    client = get_memory_client()
+    report = BatchSaveReport()
+    outage: Optional[Exception] = None
+
+    for offset in range(0, len(records), batch_size):
+        batch = records[offset:offset + batch_size]
+        if outage is not None:
+            report.failed.update((r.record_id, str(outage)) for r in batch)
+            continue
+
+        # 1. 实体：整批一次调用，失败时按需逐条重试定位问题记录
+        saved: List[PublishRecord] = []
+        try:
+            report.calls += 1
+            client.create_entities([r.to_entity() for r in batch])
+            saved = batch
+        except _MEMORY_OUTAGE_ERRORS as e:
+            outage = e
+            report.failed.update((r.record_id, str(e)) for r in batch)
+        except Exception as e:
+            if not isolate_failures or len(batch) == 1:
+                report.failed.update((r.record_id, str(e)) for r in batch)
+            else:
+                for record in batch:
+                    if outage is not None:
+                        report.failed[record.record_id] = str(outage)
+                        continue
+                    try:
+                        report.calls += 1
+                        client.create_entities([record.to_entity()])
+                        saved.append(record)
+                    except Exception as single_error:
+                        if isinstance(single_error, _MEMORY_OUTAGE_ERRORS):
+                            outage = single_error
+                        report.failed[record.record_id] = str(single_error)
+        report.saved.extend(r.record_id for r in saved)
+
+        # 2. 关系：已写入实体的关系去重后一次调用
+        relations: Dict[tuple, dict] = {}
+        for record in saved:
+            for relation in _publish_relations(record):
+                relations.setdefault(
+                    (relation["from"], relation["relationType"], relation["to"]), relation
+                )
+        if relations:
+            try:
+                report.calls += 1
+                client.create_relations(list(relations.values()))
+            except Exception as e:
+                report.relation_errors.append(
+                    f"记录 {saved[0].record_id}..{saved[-1].record_id} 的关系写入失败: {e}"
+                )
+                if isinstance(e, _MEMORY_OUTAGE_ERRORS):
+                    outage = e
+
+    return report
+
+
+def batch_save_records(records: List[PublishRecord]) -> List[dict]:
+    """Batch save publish records to MCP Memory (compatibility wrapper).
+
+    Writes through save_records_to_memory in batches; use that function
+    directly for the full BatchSaveReport.
+
+    Args:
+        records: List of PublishRecord objects
+
+    Returns:
+        List of per-record results: {"record_id", "success", "error"}
+    """
+    report = save_records_to_memory(records)
+    return [
+        {
+            "record_id": record.record_id,
+            "success": record.record_id not in report.failed,
+            "error": report.failed.get(record.record_id, ""),
+        }
+        for record in records
+    ]
+
+
+class MemoryWriteQueue:
+    """
+    MCP Memory 后台写入队列（write-behind）
+
+    发布流程只把记录放入有界队列即返回；后台线程按批写入（save_records_to_memory），
+    写入失败的记录按指数退避重试。队列满时丢弃新记录并计数，绝不阻塞调用方。
+    进程退出时自动刷新（atexit）。
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        batch_size: int = DEFAULT_MEMORY_BATCH_SIZE,
+        flush_interval: float = 0.5,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Args:
+            capacity: 队列容量（条）
+            batch_size: 每批写入的最大记录数
+            flush_interval: 攒批的最长等待时间（秒）
+            max_retries: 单条记录最多重试次数
+            backoff: 首次重试的等待时间（秒），之后每次翻倍
+            max_backoff: 重试等待时间上限（秒）
+        """
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._queue: "queue.Queue[PublishRecord]" = queue.Queue(maxsize=capacity)
+        # 等待重试的记录：(到期时间, 序号, 已重试次数, 记录)
+        self._retry: List[tuple] = []
+        self._retry_seq = 0
+        self._pending = 0  # 已入队但尚未完成（成功或放弃）的记录数
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "retries": 0,
+            "relation_errors": 0,
+            "batches": 0,
+            "flush_ms_total": 0.0,
+            "flush_ms_max": 0.0,
+            "last_flush_ms": 0.0,
+        }
+
+    def submit(self, record: PublishRecord) -> bool:
+        """
+        提交一条记录（非阻塞）
+
+        Returns:
+            bool: 是否入队成功（队列已满或已关闭时返回 False）
+        """
+        if self._stop.is_set():
+            with self._cond:
+                self._metrics["dropped"] += 1
+            return False
+        self._ensure_worker()
+        with self._cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._cond:
+                self._pending -= 1
+                self._metrics["dropped"] += 1
+                self._cond.notify_all()
+            return False
+        with self._cond:
+            self._metrics["enqueued"] += 1
+        return True
+
+    def _ensure_worker(self) -> None:
+        """首次提交时启动后台线程"""
+        if self._thread is None or not self._thread.is_alive():
+            with self._cond:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="memory-write-behind", daemon=True
+                    )
+                    self._thread.start()
+
+    def _next_batch(self) -> List[tuple]:
+        """取下一批待写入的 (已重试次数, 记录)，等待不超过 flush_interval"""
+        batch: List[tuple] = []
+        now = monotonic()
+        with self._cond:
+            while self._retry and self._retry[0][0] <= now and len(batch) < self.batch_size:
+                _, _, attempt, record = heapq.heappop(self._retry)
+                batch.append((attempt, record))
+            next_due = self._retry[0][0] - now if self._retry else None
+
+        if not batch:
+            timeout = self.flush_interval if next_due is None else min(self.flush_interval, next_due)
+            try:
+                batch.append((0, self._queue.get(timeout=max(timeout, 0.001))))
+            except queue.Empty:
+                return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append((0, self._queue.get_nowait()))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """后台线程：攒批写入，失败重试"""
+        while not (self._stop.is_set() and self._idle()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _idle(self) -> bool:
+        with self._cond:
+            return self._pending == 0
+
+    def _write(self, batch: List[tuple]) -> None:
+        """写入一批记录并处理失败"""
+        started = perf_counter()
+        try:
+            report = save_records_to_memory([record for _, record in batch], batch_size=len(batch))
+            failed = report.failed
+            relation_errors = len(report.relation_errors)
+        except Exception as e:
+            failed = {record.record_id: str(e) for _, record in batch}
+            relation_errors = 0
+        elapsed_ms = (perf_counter() - started) * 1000
+
+        with self._cond:
+            m = self._metrics
+            m["batches"] += 1
+            m["last_flush_ms"] = elapsed_ms
+            m["flush_ms_total"] += elapsed_ms
+            m["flush_ms_max"] = max(m["flush_ms_max"], elapsed_ms)
+            m["relation_errors"] += relation_errors
+            for attempt, record in batch:
+                if record.record_id not in failed:
+                    m["written"] += 1
+                    self._pending -= 1
+                elif attempt < self.max_retries and not self._stop.is_set():
+                    delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+                    self._retry_seq += 1
+                    heapq.heappush(
+                        self._retry, (monotonic() + delay, self._retry_seq, attempt + 1, record)
+                    )
+                    m["retries"] += 1
+                else:
+                    m["failed"] += 1
+                    self._pending -= 1
+                    print(f"[自动采集] 写入知识图谱失败: {record.record_id} ({failed[record.record_id]})")
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待已提交的记录全部处理完成（写入成功或放弃重试）
+
+        Returns:
+            bool: 超时前是否处理完成
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        """
+        停止接收新记录，刷新队列后停止后台线程
+
+        关闭后失败的记录不再退避重试，直接计为失败。
+
+        Returns:
+            bool: 是否在超时前刷新完成
+        """
+        self._stop.set()
+        with self._cond:
+            # 待重试的记录立即再试一次
+            self._retry = [(0.0,) + item[1:] for item in self._retry]
+            heapq.heapify(self._retry)
+        if self._thread is None or not self._thread.is_alive():
+            return self._idle()
+        flushed = self.flush(timeout)
+        self._thread.join(timeout=max(self.flush_interval * 2, 0.1))
+        return flushed
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        获取队列指标
+
+        Returns:
+            Dict: 队列深度、待处理数、写入/失败/丢弃/重试计数和刷新耗时
+        """
+        with self._cond:
+            m = dict(self._metrics)
+            m["depth"] = self._queue.qsize()
+            m["retry_waiting"] = len(self._retry)
+            m["pending"] = self._pending
+            m["capacity"] = self.capacity
+            m["flush_ms_avg"] = m["flush_ms_total"] / m["batches"] if m["batches"] else 0.0
+            return m
+
+
+# 全局后台写入队列（首次使用时创建，进程退出时刷新）
+_memory_write_queue: Optional[MemoryWriteQueue] = None
+_memory_write_queue_lock = threading.Lock()
+
+
+def get_memory_write_queue() -> MemoryWriteQueue:
+    """获取全局 MCP Memory 后台写入队列"""
+    global _memory_write_queue
+    if _memory_write_queue is None:
+        with _memory_write_queue_lock:
+            if _memory_write_queue is None:
+                _memory_write_queue = MemoryWriteQueue()
+                atexit.register(_memory_write_queue.shutdown)
+    return _memory_write_queue
+
+
+def set_memory_write_queue(write_queue: MemoryWriteQueue) -> None:
+    """替换全局后台写入队列（旧队列会先刷新并关闭）"""
+    global _memory_write_queue
+    with _memory_write_queue_lock:
+        previous, _memory_write_queue = _memory_write_queue, write_queue
+        atexit.register(write_queue.shutdown)
+    if previous is not None:
+        previous.shutdown()
+        atexit.unregister(previous.shutdown)
+
+
+def enqueue_memory_write(record: PublishRecord) -> bool:
+    """将记录交给后台队列写入 MCP Memory（不阻塞调用方）"""
+    return get_memory_write_queue().submit(record)
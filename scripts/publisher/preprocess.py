@@ -0,0 +1,117 @@
+"""
+统一发布框架 - 内容预处理流水线
+
+适配器以声明方式给出预处理步骤，流水线按顺序执行，不复制 Content：
+
+- FieldStage: 变换单个字段（标题、标签等），值来自上一步的结果
+- BodyReplace: 正文字面量替换；相邻的替换步骤合并为一次正则扫描
+
+各步骤只记录改动的字段，最后用 dataclasses.replace 生成新的 Content，
+未改动的字段（尤其是正文字符串）与原对象共享；没有任何改动时直接返回原对象。
+合并后的替换是"同时"进行的：一个步骤的替换结果不会再被同组的其他步骤匹配。
+"""
+
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+from .base import Content
+
+
+@dataclass(frozen=True)
+class FieldStage:
+    """字段变换步骤"""
+    field: str                     # Content 字段名
+    func: Callable[[Any], Any]     # 旧值 -> 新值（不应修改旧值）
+
+
+@dataclass(frozen=True)
+class BodyReplace:
+    """正文字面量替换步骤"""
+    old: str
+    new: str
+
+
+Stage = Union[FieldStage, BodyReplace]
+
+
+def _fuse_replacements(steps: List[BodyReplace]) -> Callable[[str], str]:
+    """将多个字面量替换合并为一次扫描（较长的字面量优先匹配）"""
+    table: Dict[str, str] = {}
+    for step in steps:
+        table.setdefault(step.old, step.new)
+    if len(table) == 1:
+        (old, new), = table.items()
+        return lambda text: text.replace(old, new)
+    pattern = re.compile("|".join(
+        re.escape(old) for old in sorted(table, key=len, reverse=True)
+    ))
+    lookup = table.__getitem__
+    return lambda text: pattern.sub(lambda m: lookup(m.group()), text)
+
+
+class PreprocessPipeline:
+    """
+    内容预处理流水线
+
+    构建时完成步骤合并和正则编译，可在适配器类上声明后被所有实例共享。
+    """
+
+    def __init__(self, stages: Sequence[Stage] = ()):
+        """
+        Args:
+            stages: 按执行顺序排列的预处理步骤
+
+        Raises:
+            ValueError: 字段名不属于 Content 或步骤类型不支持时
+        """
+        self.stages = tuple(stages)
+        fields = Content.__dataclass_fields__
+        # 编译后的步骤：(字段名, 变换函数)
+        self._steps: List[tuple] = []
+        pending: List[BodyReplace] = []
+        for stage in self.stages:
+            if isinstance(stage, BodyReplace):
+                if stage.old:
+                    pending.append(stage)
+                continue
+            if not isinstance(stage, FieldStage):
+                raise ValueError(f"不支持的预处理步骤: {stage!r}")
+            if stage.field not in fields:
+                raise ValueError(f"Content 没有字段: {stage.field}")
+            if pending:
+                self._steps.append(("body", _fuse_replacements(pending)))
+                pending = []
+            self._steps.append((stage.field, stage.func))
+        if pending:
+            self._steps.append(("body", _fuse_replacements(pending)))
+
+    def then(self, *stages: Stage) -> "PreprocessPipeline":
+        """返回追加了步骤的新流水线（用于子类扩展父类的流水线）"""
+        return PreprocessPipeline(self.stages + stages)
+
+    def apply(self, content: Content) -> Content:
+        """
+        执行预处理
+
+        Args:
+            content: 原始内容（不会被修改）
+
+        Returns:
+            Content: 预处理后的内容；没有字段变化时为原对象
+        """
+        changes: Dict[str, Any] = {}
+        for name, func in self._steps:
+            original = getattr(content, name)
+            new = func(changes.get(name, original))
+            # 与原值相同的字段不计入改动，继续共享原对象
+            if new == original:
+                changes.pop(name, None)
+            else:
+                changes[name] = new
+        if not changes:
+            return content
+        return replace(content, **changes)
+
+    def __len__(self) -> int:
+        return len(self.stages)
@@ -32,9 +32,12 @@
     print(result)
 """
 
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .base import (
     Platform,
@@ -42,13 +45,23 @@ from .base import (
     Content,
     PublishResult as BasePublishResult,
     PostStatus,
+    PostStatusResult,
+)
+from .adapter import BaseAdapter
+from .retry import (
+    CircuitBreaker,
+    circuit_breaker_stats,
+    circuit_open_result,
+    get_circuit_breaker,
+    retry_stats,
 )
 from .tracker import (
     create_publish_record,
-    save_to_memory,
+    save_record,
+    enqueue_memory_write,
     PostStatus as TrackerPostStatus,
 )
-from scripts.ai_detector import detect_ai_score, AIDetector
+from scripts.ai_detector import detect_ai_score, get_detector, get_detection_cache
 
 
 # ============================================================
@@ -73,6 +86,8 @@ class PublisherConfig:
 
     # 发布配置
     enable_auto_login: bool = True         # 是否自动登录
+    publish_timeout: Optional[float] = None  # 单平台发布超时（秒），默认取 PublishSettings.timeout
+    max_concurrency: int = 5               # 多平台并发发布的最大线程数
 
     def is_ai_detection_enabled(self) -> bool:
         """检查是否启用AI检测"""
@@ -86,6 +101,13 @@ class PublisherConfig:
         """检查是否启用自动采集"""
         return self.enable_auto_track
 
+    def get_publish_timeout(self) -> float:
+        """获取单平台发布超时（秒）"""
+        if self.publish_timeout is not None:
+            return self.publish_timeout
+        from config.publisher import get_publisher_config
+        return get_publisher_config().get_timeout()
+
 
 # ============================================================
 # 统一发布器
@@ -111,7 +133,8 @@ class UnifiedPublisher:
         """
         self.config = config
         self._publishers: Dict[str, PlatformPublisher] = {}
-        self._ai_detector = AIDetector()
+        # 共享的已编译检测器（按配置缓存，多个发布器实例复用）
+        self._ai_detector = get_detector()
 
     def register_publisher(self, publisher: PlatformPublisher) -> None:
         """
@@ -134,12 +157,16 @@ class UnifiedPublisher:
         """
         publisher = self._publishers.get(platform)
         if publisher is None:
-            # 尝试按枚举值查找
+            # 尝试按枚举值查找（发布器按显示名称注册，如 "zhihu" → 知乎适配器）
             try:
                 platform_enum = Platform(platform)
-                publisher = self._publishers.get(platform_enum.value)
             except ValueError:
-                pass
+                return None
+            publisher = self._publishers.get(platform_enum.value)
+            if publisher is None and platform_enum is not Platform.CUSTOM:
+                publisher = next(
+                    (p for p in self._publishers.values() if p.platform is platform_enum), None
+                )
         return publisher
 
     def publish(
@@ -161,22 +188,100 @@ class UnifiedPublisher:
             platform: 目标平台（如 "zhihu", "jianshu"）
             account: 发布账号（可选，默认使用配置中的账号）
 
+        Returns:
+            PublishResult: 发布结果
+        """
+        # ========== 1. AI检测 ==========
+        ai_score, rejection = self._check_ai(content)
+        if rejection:
+            return BasePublishResult.failed_result(
+                rejection, platform=self._get_platform_enum(platform)
+            )
+
+        return self._publish_to(content, platform, account, ai_score)
+
+    def _check_ai(self, content: Content) -> Tuple[float, Optional[str]]:
+        """
+        AI检测
+
+        Args:
+            content: 要发布的内容
+
+        Returns:
+            Tuple[float, Optional[str]]: (AI味分数, 未通过时的错误信息)
+        """
+        if not self.config.is_ai_detection_enabled():
+            return 0.0, None
+        # 按正文哈希缓存，同一正文只检测一次
+        ai_score = get_detection_cache().detect(self._ai_detector, content.body).total_score
+        if ai_score > self.config.get_ai_threshold():
+            return ai_score, f"AI味检测未通过 ({ai_score:.1f}分 > {self.config.get_ai_threshold()}分)"
+        return ai_score, None
+
+    def _circuit_breaker(self, platform: str) -> CircuitBreaker:
+        """平台的熔断器（与适配器共享，按发布器的平台名称）"""
+        publisher = self.get_publisher(platform)
+        return get_circuit_breaker(publisher.platform_name if publisher else platform)
+
+    def _short_circuit(self, platform: str) -> Optional[BasePublishResult]:
+        """平台熔断中时直接返回失败结果，不占用发布线程"""
+        breaker = self._circuit_breaker(platform)
+        if not breaker.rejects():
+            return None
+        breaker.reject()
+        return circuit_open_result(breaker, self._get_platform_enum(platform))
+
+    def _record_outcome(self, publisher: PlatformPublisher, result: BasePublishResult) -> None:
+        """
+        记录非适配器发布器的结果到熔断器
+
+        BaseAdapter 在重试时已逐次记录；其他发布器由统一发布器记录最终结果。
+        """
+        if not isinstance(publisher, BaseAdapter):
+            breaker = get_circuit_breaker(publisher.platform_name)
+            breaker.record(result)
+            result.circuit_state = breaker.state.value
+
+    def _timeout_result(self, platform: str, timeout: float) -> BasePublishResult:
+        """
+        发布超时：计入平台熔断器的失败次数
+
+        超时的发布线程无法强制终止，仍可能在后台发布成功，
+        结果未知，因此不可重试，需核实平台上的发布状态后再处理。
+        """
+        breaker = self._circuit_breaker(platform)
+        breaker.record_failure()
+        result = BasePublishResult.failed_result(
+            f"发布超时 ({timeout}秒)，发布结果未知，请核实后再重试",
+            platform=self._get_platform_enum(platform),
+            retryable=False,
+            transient=True,
+        )
+        result.circuit_state = breaker.state.value
+        return result
+
+    def _publish_to(
+        self,
+        content: Content,
+        platform: str,
+        account: Optional[str],
+        ai_score: float,
+    ) -> BasePublishResult:
+        """
+        发布到单个平台（已完成AI检测）
+
+        Args:
+            content: 要发布的内容
+            platform: 目标平台
+            account: 发布账号（可选）
+            ai_score: AI味分数（用于自动采集）
+
         Returns:
             PublishResult: 发布结果
         """
         # 使用指定账号或默认账号
         publish_account = account or self.config.default_account
 
-        # ========== 1. AI检测 ==========
-        ai_score = 0.0
-        if self.config.is_ai_detection_enabled():
-            ai_score = detect_ai_score(content.body)
-            if ai_score > self.config.get_ai_threshold():
-                return BasePublishResult.failed_result(
-                    f"AI味检测未通过 ({ai_score:.1f}分 > {self.config.get_ai_threshold()}分)",
-                    platform=self._get_platform_enum(platform)
-                )
-
         # ========== 2. 获取发布器 ==========
         publisher = self.get_publisher(platform)
         if publisher is None:
@@ -185,6 +290,11 @@ class UnifiedPublisher:
                 platform=self._get_platform_enum(platform)
             )
 
+        # 平台熔断中时直接失败
+        rejected = self._short_circuit(platform)
+        if rejected is not None:
+            return rejected
+
         # 检查登录状态
         if not publisher.is_logged_in():
             if self.config.enable_auto_login:
@@ -197,6 +307,7 @@ class UnifiedPublisher:
 
         # ========== 3. 执行发布 ==========
         result = publisher.publish(content)
+        self._record_outcome(publisher, result)
 
         # ========== 4. 自动采集 ==========
         if result.success and self.config.should_auto_track():
@@ -214,22 +325,276 @@ class UnifiedPublisher:
         self,
         content: Content,
         platforms: List[str],
+        account: Optional[str] = None,
+        concurrent: bool = True,
     ) -> Dict[str, BasePublishResult]:
         """
         发布内容到多个平台
 
+        AI检测在分发前只执行一次；并发模式下各平台在线程池中同时发布，
+        单平台超过超时时间（PublishSettings.timeout）记为失败，不阻塞其他平台；
+        超时从该平台任务实际开始时计算，结果未知（后台线程可能仍在发布），标记为不可重试；
+        平台数超过 max_concurrency 时，因线程被超时任务占用而一直未开始的平台被取消，
+        记为未发布、可以重试。
+        这里不限制发布频率；批量发布需遵守发布间隔时使用 scheduler.PublishScheduler。
+
         Args:
             content: 要发布的内容
             platforms: 目标平台列表
+            account: 发布账号（可选）
+            concurrent: 是否并发发布，False 时按顺序逐个发布
 
         Returns:
-            Dict[str, PublishResult]: 各平台的发布结果
+            Dict[str, PublishResult]: 各平台的发布结果（elapsed_ms 为该平台耗时）
         """
+        ai_score, rejection = self._check_ai(content)
+        if rejection:
+            return {
+                platform: BasePublishResult.failed_result(
+                    rejection, platform=self._get_platform_enum(platform)
+                )
+                for platform in platforms
+            }
+
+        if not concurrent or len(platforms) <= 1:
+            results = {}
+            for platform in platforms:
+                started = time.perf_counter()
+                result = self._publish_to(content, platform, account, ai_score)
+                result.elapsed_ms = (time.perf_counter() - started) * 1000
+                results[platform] = result
+            return results
+
+        # 熔断中的平台不提交到线程池
         results = {}
         for platform in platforms:
-            result = self.publish(content, platform)
-            results[platform] = result
-        return results
+            rejected = self._short_circuit(platform)
+            if rejected is not None:
+                results[platform] = rejected
+        pending = [platform for platform in platforms if platform not in results]
+        if not pending:
+            return results
+
+        timeout = self.config.get_publish_timeout()
+        workers = min(len(pending), self.config.max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="publish")
+        started = time.perf_counter()
+        # 各平台的超时从任务实际开始执行时计算，排队等待线程的时间不计入
+        began: Dict[str, float] = {}
+
+        def run(platform: str) -> BasePublishResult:
+            began[platform] = time.perf_counter()
+            return self._timed_publish(content, platform, account, ai_score)
+
+        futures = {platform: executor.submit(run, platform) for platform in pending}
+        # 排队的平台最迟在所有批次各自超时后开始；仍未开始的取消，不算发布失败
+        queue_deadline = started + timeout * -(-len(pending) // workers)
+        waiting = dict(futures)
+        try:
+            while waiting:
+                now = time.perf_counter()
+                for platform, future in list(waiting.items()):
+                    if future.done():
+                        results[platform] = self._future_result(platform, future, began, now)
+                    elif platform in began and now >= began[platform] + timeout:
+                        result = self._timeout_result(platform, timeout)
+                        result.elapsed_ms = (now - began[platform]) * 1000
+                        results[platform] = result
+                    elif platform not in began and now >= queue_deadline and future.cancel():
+                        result = self._not_started_result(platform, timeout)
+                        result.elapsed_ms = (now - started) * 1000
+                        results[platform] = result
+                    else:
+                        continue
+                    del waiting[platform]
+                if not waiting:
+                    break
+                deadlines = [
+                    began[platform] + timeout if platform in began else queue_deadline
+                    for platform in waiting
+                ]
+                wait(waiting.values(), timeout=max(0.0, min(deadlines) - now), return_when=FIRST_COMPLETED)
+        finally:
+            # 超时的平台线程无法强制终止，不等待其结束
+            executor.shutdown(wait=False, cancel_futures=True)
+        return {platform: results[platform] for platform in platforms}
+
+    def _future_result(
+        self, platform: str, future: Future, began: Dict[str, float], now: float
+    ) -> BasePublishResult:
+        """取出已完成的发布任务结果，任务抛出异常时记为失败"""
+        try:
+            return future.result()
+        except Exception as e:
+            result = BasePublishResult.failed_result(
+                f"发布异常: {e}",
+                platform=self._get_platform_enum(platform)
+            )
+            result.elapsed_ms = (now - began.get(platform, now)) * 1000
+            return result
+
+    def _not_started_result(self, platform: str, timeout: float) -> BasePublishResult:
+        """排队等待发布线程超时、已取消的平台：未发布，可以重试，不计入熔断"""
+        return BasePublishResult.failed_result(
+            f"未发布：等待发布线程超时 ({timeout}秒)，可以重试",
+            platform=self._get_platform_enum(platform),
+            retryable=True,
+        )
+
+    def _timed_publish(
+        self,
+        content: Content,
+        platform: str,
+        account: Optional[str],
+        ai_score: float,
+    ) -> BasePublishResult:
+        """发布到单个平台并记录耗时"""
+        started = time.perf_counter()
+        result = self._publish_to(content, platform, account, ai_score)
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    # ========== 异步接口 ==========
+
+    async def apublish(
+        self,
+        content: Content,
+        platform: str,
+        account: Optional[str] = None,
+    ) -> BasePublishResult:
+        """
+        异步发布内容到指定平台（流程同 publish）
+
+        AI检测在线程池中执行，平台发布调用发布器的 apublish，不阻塞事件循环。
+        """
+        loop = asyncio.get_running_loop()
+        ai_score, rejection = await loop.run_in_executor(None, self._check_ai, content)
+        if rejection:
+            return BasePublishResult.failed_result(
+                rejection, platform=self._get_platform_enum(platform)
+            )
+        return await self._apublish_to(content, platform, account, ai_score)
+
+    async def apublish_multi(
+        self,
+        content: Content,
+        platforms: List[str],
+        account: Optional[str] = None,
+    ) -> Dict[str, BasePublishResult]:
+        """
+        异步发布内容到多个平台（语义同 publish_multi 的并发模式）
+
+        Returns:
+            Dict[str, PublishResult]: 各平台的发布结果（elapsed_ms 为该平台耗时）
+        """
+        loop = asyncio.get_running_loop()
+        ai_score, rejection = await loop.run_in_executor(None, self._check_ai, content)
+        if rejection:
+            return {
+                platform: BasePublishResult.failed_result(
+                    rejection, platform=self._get_platform_enum(platform)
+                )
+                for platform in platforms
+            }
+
+        timeout = self.config.get_publish_timeout()
+
+        async def publish_one(platform: str) -> BasePublishResult:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    self._apublish_to(content, platform, account, ai_score), timeout
+                )
+            except asyncio.TimeoutError:
+                result = self._timeout_result(platform, timeout)
+            except Exception as e:
+                result = BasePublishResult.failed_result(
+                    f"发布异常: {e}",
+                    platform=self._get_platform_enum(platform)
+                )
+            result.elapsed_ms = (time.perf_counter() - started) * 1000
+            return result
+
+        results = await asyncio.gather(*(publish_one(p) for p in platforms))
+        return dict(zip(platforms, results))
+
+    async def _apublish_to(
+        self,
+        content: Content,
+        platform: str,
+        account: Optional[str],
+        ai_score: float,
+    ) -> BasePublishResult:
+        """异步发布到单个平台（已完成AI检测，流程同 _publish_to）"""
+        publish_account = account or self.config.default_account
+
+        publisher = self.get_publisher(platform)
+        if publisher is None:
+            return BasePublishResult.failed_result(
+                f"未找到平台发布器: {platform}",
+                platform=self._get_platform_enum(platform)
+            )
+
+        rejected = self._short_circuit(platform)
+        if rejected is not None:
+            return rejected
+
+        if not publisher.is_logged_in():
+            if self.config.enable_auto_login:
+                await publisher.alogin()
+            else:
+                return BasePublishResult.failed_result(
+                    f"未登录: {platform}",
+                    platform=self._get_platform_enum(platform)
+                )
+
+        result = await publisher.apublish(content)
+        self._record_outcome(publisher, result)
+
+        if result.success and self.config.should_auto_track():
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: self._auto_track(
+                    content=content,
+                    platform=platform,
+                    account=publish_account,
+                    ai_score=ai_score,
+                    post_url=result.post_url,
+                ),
+            )
+
+        return result
+
+    async def alogin(self, platform: str) -> bool:
+        """
+        异步登录指定平台
+
+        Args:
+            platform: 平台名称
+
+        Returns:
+            bool: 登录是否成功（未找到发布器时返回 False）
+        """
+        publisher = self.get_publisher(platform)
+        if publisher is None:
+            return False
+        return await publisher.alogin()
+
+    async def aget_status(self, platform: str, post_id: str) -> Optional[PostStatusResult]:
+        """
+        异步查询指定平台的帖子状态
+
+        Args:
+            platform: 平台名称
+            post_id: 帖子ID
+
+        Returns:
+            PostStatusResult 或 None（未找到发布器）
+        """
+        publisher = self.get_publisher(platform)
+        if publisher is None:
+            return None
+        return await publisher.aget_status(post_id)
 
     def _auto_track(
         self,
@@ -263,8 +628,9 @@ class UnifiedPublisher:
                 status=TrackerPostStatus.PUBLISHED,
             )
 
-            # 保存到知识图谱
-            save_to_memory(record)
+            # 保存到记录存储（用于查询和统计），知识图谱由后台队列异步写入
+            save_record(record)
+            enqueue_memory_write(record)
 
             print(f"[自动采集] 已记录发布: {content.title} -> {platform}")
 
@@ -288,6 +654,18 @@ class UnifiedPublisher:
         from .tracker import get_statistics_summary
         return get_statistics_summary()
 
+    def get_reliability_metrics(self) -> Dict:
+        """
+        获取重试与熔断统计
+
+        Returns:
+            Dict: {"retries": 全局重试统计, "circuit_breakers": {平台: 熔断器统计}}
+        """
+        return {
+            "retries": retry_stats(),
+            "circuit_breakers": circuit_breaker_stats(),
+        }
+
 
 # ============================================================
 # 便捷函数
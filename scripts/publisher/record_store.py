@@ -0,0 +1,1534 @@
+# -*- coding: utf-8 -*-
+"""
+发布追踪器 - 发布记录与记录存储
+
+发布记录数据模型（PublishRecord）和可插拔的记录存储：
+- MemoryRecordStore：内存存储（带二级索引，适用于测试和演示）
+- ColumnarRecordStore：列式内存存储（适合长期保存大量历史记录）
+- SQLiteRecordStore：SQLite 存储（默认）
+- JournaledRecordStore：带预写日志的内存存储
+
+这些名称也从 tracker 模块导出。
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Iterator
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+
+class PostStatus(Enum):
+    """发布状态枚举"""
+    DRAFT = "draft"
+    PUBLISHED = "published"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class PublishRecord:
+    """发布记录数据模型（使用 __slots__，无实例 __dict__）"""
+    # 内容信息
+    title: str
+    topic_id: str  # 选题ID
+    publish_time: datetime
+    
+    # 平台信息
+    platform: str
+    account: str
+    post_url: Optional[str]
+    
+    # 质量信息
+    ai_score: float  # AI味评分
+    word_count: int
+    case_count: int
+    
+    # 追踪信息
+    record_id: str  # 记录ID，格式：PUB-YYYY-MM-DD-NNN
+    status: PostStatus
+    error_message: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """转换为字典格式（字段均为不可变值，直接构建，不经过 asdict 的深拷贝）"""
+        return {
+            'title': self.title,
+            'topic_id': self.topic_id,
+            'publish_time': self.publish_time.isoformat(),
+            'platform': self.platform,
+            'account': self.account,
+            'post_url': self.post_url,
+            'ai_score': self.ai_score,
+            'word_count': self.word_count,
+            'case_count': self.case_count,
+            'record_id': self.record_id,
+            'status': self.status.value,
+            'error_message': self.error_message,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PublishRecord":
+        """从 to_dict 的结果还原记录"""
+        data = dict(data)
+        data['status'] = PostStatus(data['status'])
+        data['publish_time'] = datetime.fromisoformat(data['publish_time'])
+        return cls(**data)
+    
+    def to_entity(self) -> dict:
+        """转换为 MCP Memory 实体格式"""
+        return {
+            "entityType": "PublishRecord",
+            "name": self.record_id,
+            "observations": [
+                f"标题: {self.title}",
+                f"选题ID: {self.topic_id}",
+                f"发布时间: {self.publish_time.isoformat(' ', 'seconds')}",
+                f"平台: {self.platform}",
+                f"账号: {self.account}",
+                f"文章链接: {self.post_url or '未生成'}",
+                f"AI味评分: {self.ai_score}",
+                f"字数: {self.word_count}",
+                f"案例数: {self.case_count}",
+                f"状态: {self.status.value}",
+                f"错误信息: {self.error_message or '无'}",
+            ]
+        }
+
+
+class AggregateTotals:
+    """一组记录的累计值：条数、字数、案例数、AI评分之和"""
+
+    __slots__ = ("count", "total_words", "total_cases", "ai_score_sum")
+
+    def __init__(self):
+        self.count = 0
+        self.total_words = 0
+        self.total_cases = 0
+        self.ai_score_sum = 0.0
+
+    def add(self, record: PublishRecord, sign: int = 1) -> None:
+        """计入（sign=1）或扣除（sign=-1）一条记录"""
+        self.count += sign
+        self.total_words += sign * record.word_count
+        self.total_cases += sign * record.case_count
+        self.ai_score_sum += sign * record.ai_score
+
+    def merge(self, totals: Dict[str, Any]) -> None:
+        """合并另一组累计值（to_dict 格式）"""
+        self.count += totals["count"]
+        self.total_words += totals["total_words"]
+        self.total_cases += totals["total_cases"]
+        self.ai_score_sum += totals["ai_score_sum"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_words": self.total_words,
+            "total_cases": self.total_cases,
+            "ai_score_sum": self.ai_score_sum,
+        }
+
+
+class RecordAggregates:
+    """
+    增量维护的统计聚合
+
+    按状态、(状态, 平台)、(状态, 日期, 平台) 三个维度累计，写入和状态变更时更新，
+    统计查询无需遍历记录。
+    """
+
+    def __init__(self):
+        self.by_status: Dict[PostStatus, AggregateTotals] = {}
+        self.by_platform: Dict[tuple, AggregateTotals] = {}
+        self.by_day: Dict[tuple, AggregateTotals] = {}
+
+    def apply(self, record: PublishRecord, sign: int = 1) -> None:
+        """计入（sign=1）或扣除（sign=-1）一条记录"""
+        status = record.status
+        for index, key in (
+            (self.by_status, status),
+            (self.by_platform, (status, record.platform)),
+            (self.by_day, (status, record.publish_time.date(), record.platform)),
+        ):
+            totals = index.get(key)
+            if totals is None:
+                totals = index[key] = AggregateTotals()
+            totals.add(record, sign)
+            if totals.count == 0:
+                del index[key]
+
+    def totals(self, status: PostStatus) -> Dict[str, Any]:
+        return self.by_status.get(status, AggregateTotals()).to_dict()
+
+    def totals_by_platform(self, status: PostStatus) -> Dict[str, Dict[str, Any]]:
+        return {
+            platform: totals.to_dict()
+            for (s, platform), totals in self.by_platform.items() if s == status
+        }
+
+    def totals_by_day_platform(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        cells = sorted(
+            (day, platform, totals) for (s, day, platform), totals in self.by_day.items()
+            if s == status
+            and (start is None or day >= start)
+            and (end is None or day < end)
+        )
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for day, platform, totals in cells:
+            result.setdefault(day.strftime('%Y-%m-%d'), {})[platform] = totals.to_dict()
+        return result
+
+    def clear(self) -> None:
+        self.by_status.clear()
+        self.by_platform.clear()
+        self.by_day.clear()
+
+
+class RecordStore(ABC):
+    """
+    发布记录存储接口
+
+    查询结果均按发布时间升序返回；统计按平台聚合
+    count / total_words / total_cases / ai_score_sum。
+    """
+
+    @abstractmethod
+    def add(self, record: PublishRecord) -> None:
+        """写入一条记录（记录ID已存在时覆盖）"""
+
+    def add_many(self, records: Iterable[PublishRecord]) -> None:
+        """批量写入记录"""
+        for record in records:
+            self.add(record)
+
+    @abstractmethod
+    def get(self, record_id: str) -> Optional[PublishRecord]:
+        """按记录ID获取记录"""
+
+    @abstractmethod
+    def update_status(
+        self,
+        record_id: str,
+        status: PostStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """更新记录状态，记录不存在时返回 False"""
+
+    @abstractmethod
+    def query(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[PublishRecord]:
+        """按条件查询记录，时间范围为 [start, end)"""
+
+    def record_ids(
+        self,
+        platform: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+    ) -> List[str]:
+        """按条件查询记录ID"""
+        return [r.record_id for r in self.query(platform=platform, status=status)]
+
+    def query_keys(
+        self,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[tuple]:
+        """按条件查询 (发布时间, 平台, 记录ID)，按时间升序（用于分桶统计）"""
+        return [
+            (r.publish_time, r.platform, r.record_id)
+            for r in self.query(status=status, start=start, end=end)
+        ]
+
+    def iter_rows(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """
+        按条件分块读取记录行（见 record_row），按发布时间升序
+
+        用于导出等全量读取场景，每次只持有一块数据。
+        """
+        records = self.query(platform, topic_id, status, start, end)
+        for i in range(0, len(records), chunk_size):
+            yield [record_row(r) for r in records[i:i + chunk_size]]
+
+    @abstractmethod
+    def count(self, status: Optional[PostStatus] = None) -> int:
+        """统计记录数"""
+
+    @abstractmethod
+    def totals_by_platform(self, status: PostStatus) -> Dict[str, Dict[str, Any]]:
+        """按平台聚合指定状态的记录"""
+
+    def totals(self, status: PostStatus) -> Dict[str, Any]:
+        """汇总指定状态的记录"""
+        result = AggregateTotals()
+        for totals in self.totals_by_platform(status).values():
+            result.merge(totals)
+        return result.to_dict()
+
+    def totals_by_day_platform(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """按日期（YYYY-MM-DD）和平台聚合指定状态的记录，日期范围为 [start, end)"""
+        days: Dict[str, Dict[str, AggregateTotals]] = {}
+        for record in self.query(
+            status=status,
+            start=datetime.combine(start, time.min) if start is not None else None,
+            end=datetime.combine(end, time.min) if end is not None else None,
+        ):
+            platforms = days.setdefault(record.publish_time.strftime('%Y-%m-%d'), {})
+            platforms.setdefault(record.platform, AggregateTotals()).add(record)
+        return {
+            day: {platform: totals.to_dict() for platform, totals in sorted(platforms.items())}
+            for day, platforms in sorted(days.items())
+        }
+
+    def totals_by_day(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """按日期（YYYY-MM-DD）聚合指定状态的记录，日期范围为 [start, end)"""
+        result = {}
+        for day, platforms in self.totals_by_day_platform(status, start, end).items():
+            totals = AggregateTotals()
+            for platform_totals in platforms.values():
+                totals.merge(platform_totals)
+            result[day] = totals.to_dict()
+        return result
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空所有记录"""
+
+    def max_sequence(self, day: Optional[str] = None) -> int:
+        """
+        已有记录ID（PUB-YYYY-MM-DD-NNN）中的最大序号
+
+        Args:
+            day: 只统计该日期（YYYY-MM-DD）的记录，None 表示全部
+        """
+        return max(
+            (seq for d, seq in map(_split_record_id, self.record_ids()) if day is None or d == day),
+            default=0,
+        )
+
+    def reserve_sequence(self, day: str, count: int = 1) -> int:
+        """
+        为某日预留连续的 count 个记录序号
+
+        默认实现只保证进程内唯一；多进程共享的存储应重写为原子操作。
+
+        Args:
+            day: 日期（YYYY-MM-DD）
+            count: 预留个数
+
+        Returns:
+            int: 预留区间的第一个序号
+        """
+        with _default_sequence_lock:
+            sequences = self.__dict__.setdefault("_reserved_sequences", {})
+            last = max(sequences.get(day, 0), self.max_sequence(day))
+            sequences[day] = last + count
+            return last + 1
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+class MemoryRecordStore(RecordStore):
+    """
+    内存记录存储（进程退出后丢失，适用于测试和演示）
+
+    写入时维护二级索引：平台、选题、状态到记录ID的映射，以及按
+    (发布时间, 记录ID) 排序的列表（bisect 做范围查找），查询耗时与结果数成正比；
+    同时增量维护统计聚合（RecordAggregates）。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: Dict[str, PublishRecord] = {}
+        # 二级索引：值为记录ID的有序集合（dict 保持插入顺序）
+        self._by_platform: Dict[str, Dict[str, None]] = {}
+        self._by_topic: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[PostStatus, Dict[str, None]] = {}
+        # 按 (发布时间, 记录ID) 升序排列
+        self._by_time: List[tuple] = []
+        # 增量统计聚合
+        self._aggregates = RecordAggregates()
+        # 每日已用的最大记录序号（含已预留未写入的）
+        self._sequences: Dict[str, int] = {}
+
+    def _index(self, record: PublishRecord) -> None:
+        """将记录加入各索引"""
+        rid = record.record_id
+        day, seq = _split_record_id(rid)
+        if seq > self._sequences.get(day, 0):
+            self._sequences[day] = seq
+        self._by_platform.setdefault(record.platform, {})[rid] = None
+        self._by_topic.setdefault(record.topic_id, {})[rid] = None
+        self._by_status.setdefault(record.status, {})[rid] = None
+        key = (record.publish_time, rid)
+        if not self._by_time or self._by_time[-1] < key:
+            self._by_time.append(key)  # 按时间顺序写入时直接追加
+        else:
+            insort(self._by_time, key)
+
+    def _unindex(self, record: PublishRecord) -> None:
+        """将记录移出各索引"""
+        rid = record.record_id
+        for index, value in (
+            (self._by_platform, record.platform),
+            (self._by_topic, record.topic_id),
+            (self._by_status, record.status),
+        ):
+            ids = index.get(value)
+            if ids is not None:
+                ids.pop(rid, None)
+                if not ids:
+                    del index[value]
+        key = (record.publish_time, rid)
+        pos = bisect_left(self._by_time, key)
+        if pos < len(self._by_time) and self._by_time[pos] == key:
+            del self._by_time[pos]
+
+    def add(self, record: PublishRecord) -> None:
+        with self._lock:
+            old = self._records.get(record.record_id)
+            if old is not None:
+                self._unindex(old)
+                self._aggregates.apply(old, -1)
+            self._records[record.record_id] = record
+            self._index(record)
+            self._aggregates.apply(record)
+
+    def get(self, record_id: str) -> Optional[PublishRecord]:
+        return self._records.get(record_id)
+
+    def update_status(
+        self,
+        record_id: str,
+        status: PostStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            record = self._records.get(record_id)
+            if record is None:
+                return False
+            ids = self._by_status.get(record.status)
+            if ids is not None:
+                ids.pop(record_id, None)
+                if not ids:
+                    del self._by_status[record.status]
+            self._aggregates.apply(record, -1)
+            record.status = status
+            record.error_message = error_message
+            self._by_status.setdefault(status, {})[record_id] = None
+            self._aggregates.apply(record)
+            return True
+
+    def _candidates(
+        self,
+        platform: Optional[str],
+        topic_id: Optional[str],
+        status: Optional[PostStatus],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> tuple:
+        """
+        选出最小的候选集合
+
+        Returns:
+            (候选记录ID序列, 是否已按时间排序)
+        """
+        candidates = []
+        if platform is not None:
+            candidates.append((self._by_platform.get(platform, {}), False))
+        if topic_id is not None:
+            candidates.append((self._by_topic.get(topic_id, {}), False))
+        if status is not None:
+            candidates.append((self._by_status.get(status, {}), False))
+        if start is not None or end is not None:
+            lo = bisect_left(self._by_time, (start,)) if start is not None else 0
+            hi = bisect_left(self._by_time, (end,)) if end is not None else len(self._by_time)
+            candidates.append(([rid for _, rid in self._by_time[lo:hi]], True))
+        if not candidates:
+            return [rid for _, rid in self._by_time], True
+        return min(candidates, key=lambda c: len(c[0]))
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[PublishRecord]:
+        with self._lock:
+            ids, ordered = self._candidates(platform, topic_id, status, start, end)
+            records = [
+                r for r in map(self._records.__getitem__, ids)
+                if (platform is None or r.platform == platform)
+                and (topic_id is None or r.topic_id == topic_id)
+                and (status is None or r.status == status)
+                and (start is None or r.publish_time >= start)
+                and (end is None or r.publish_time < end)
+            ]
+        if not ordered:
+            records.sort(key=lambda r: (r.publish_time, r.record_id))
+        return records
+
+    def query_keys(
+        self,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[tuple]:
+        with self._lock:
+            lo = bisect_left(self._by_time, (start,)) if start is not None else 0
+            hi = bisect_left(self._by_time, (end,)) if end is not None else len(self._by_time)
+            records = self._records
+            return [
+                (publish_time, record.platform, rid)
+                for publish_time, rid in self._by_time[lo:hi]
+                for record in (records[rid],)
+                if status is None or record.status == status
+            ]
+
+    def iter_rows(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        # 只快照候选ID，记录按块在锁内转换为行
+        with self._lock:
+            ids, ordered = self._candidates(platform, topic_id, status, start, end)
+            ids = list(ids)
+            if not ordered:
+                records = self._records
+                ids.sort(key=lambda rid: (records[rid].publish_time, rid))
+        for i in range(0, len(ids), chunk_size):
+            with self._lock:
+                chunk = [
+                    record_row(r)
+                    for r in map(self._records.get, ids[i:i + chunk_size])
+                    if r is not None
+                    and (platform is None or r.platform == platform)
+                    and (topic_id is None or r.topic_id == topic_id)
+                    and (status is None or r.status == status)
+                    and (start is None or r.publish_time >= start)
+                    and (end is None or r.publish_time < end)
+                ]
+            if chunk:
+                yield chunk
+
+    def count(self, status: Optional[PostStatus] = None) -> int:
+        if status is None:
+            return len(self._records)
+        return len(self._by_status.get(status, ()))
+
+    def totals_by_platform(self, status: PostStatus) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return self._aggregates.totals_by_platform(status)
+
+    def totals(self, status: PostStatus) -> Dict[str, Any]:
+        with self._lock:
+            return self._aggregates.totals(status)
+
+    def totals_by_day_platform(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            return self._aggregates.totals_by_day_platform(status, start, end)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._by_platform.clear()
+            self._by_topic.clear()
+            self._by_status.clear()
+            self._by_time.clear()
+            self._aggregates.clear()
+            self._sequences.clear()
+
+    def max_sequence(self, day: Optional[str] = None) -> int:
+        if day is not None:
+            return self._sequences.get(day, 0)
+        return max(self._sequences.values(), default=0)
+
+    def reserve_sequence(self, day: str, count: int = 1) -> int:
+        with self._lock:
+            first = self._sequences.get(day, 0) + 1
+            self._sequences[day] = first + count - 1
+            return first
+
+
+# 发布时间的存储格式（定长，按字符串比较即按时间排序）
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+RECORD_COLUMNS = (
+    "record_id", "title", "topic_id", "publish_time", "platform", "account",
+    "post_url", "ai_score", "word_count", "case_count", "status", "error_message",
+)
+
+
+def record_row(record: PublishRecord) -> tuple:
+    """记录转换为按 RECORD_COLUMNS 排列的行（时间、状态为字符串，可直接序列化）"""
+    return (
+        record.record_id, record.title, record.topic_id,
+        record.publish_time.isoformat(" ", "microseconds"), record.platform, record.account,
+        record.post_url, record.ai_score, record.word_count, record.case_count,
+        record.status.value, record.error_message,
+    )
+
+
+_UPSERT_ASSIGNMENTS = ", ".join(f"{c} = excluded.{c}" for c in RECORD_COLUMNS[1:])
+
+
+# 列式存储的时间基准（发布时间为本地时间，不带时区）
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _StringPool:
+    """字符串字典：相同字符串只存一份，列中保存其编号"""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+
+class ColumnarRecordStore(RecordStore):
+    """
+    列式内存记录存储（适合在内存中长期保存大量历史记录）
+
+    每个字段一列：平台、账号、状态按字典编码为整数数组，选题ID驻留（intern），
+    发布时间存为微秒整数，AI评分、字数、案例数存为数值数组；不为每条记录保留
+    PublishRecord 对象，读取时按需构建。查询为列上的顺序扫描；统计聚合与
+    MemoryRecordStore 一样增量维护。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._positions: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._titles: List[str] = []
+        self._topics: List[str] = []
+        self._urls: List[Optional[str]] = []
+        self._errors: List[Optional[str]] = []
+        self._times = array("q")
+        self._ai_scores = array("d")
+        self._word_counts = array("q")
+        self._case_counts = array("q")
+        self._platforms = array("I")
+        self._accounts = array("I")
+        self._statuses = array("B")
+        self._platform_pool = _StringPool()
+        self._account_pool = _StringPool()
+        self._status_pool = _StringPool()
+        self._aggregates = RecordAggregates()
+        self._sequences: Dict[str, int] = {}
+
+    def _columns(self) -> tuple:
+        """全部列，顺序与 add 中的取值一致"""
+        return (
+            self._ids, self._titles, self._topics, self._urls, self._errors,
+            self._times, self._ai_scores, self._word_counts, self._case_counts,
+            self._platforms, self._accounts, self._statuses,
+        )
+
+    def _record_at(self, pos: int) -> PublishRecord:
+        return PublishRecord(
+            title=self._titles[pos],
+            topic_id=self._topics[pos],
+            publish_time=_EPOCH + timedelta(microseconds=self._times[pos]),
+            platform=self._platform_pool.values[self._platforms[pos]],
+            account=self._account_pool.values[self._accounts[pos]],
+            post_url=self._urls[pos],
+            ai_score=self._ai_scores[pos],
+            word_count=self._word_counts[pos],
+            case_count=self._case_counts[pos],
+            record_id=self._ids[pos],
+            status=PostStatus(self._status_pool.values[self._statuses[pos]]),
+            error_message=self._errors[pos],
+        )
+
+    def add(self, record: PublishRecord) -> None:
+        with self._lock:
+            # 先转换并校验全部取值（数值列按列类型转换，非法值在此抛出），再写入各列
+            values = (
+                record.record_id,
+                record.title,
+                sys.intern(record.topic_id),
+                record.post_url,
+                record.error_message,
+                (record.publish_time - _EPOCH) // _MICROSECOND,
+                float(record.ai_score),
+                int(record.word_count),
+                int(record.case_count),
+                self._platform_pool.encode(record.platform),
+                self._account_pool.encode(record.account),
+                self._status_pool.encode(record.status.value),
+            )
+            columns = self._columns()
+            pos = self._positions.get(record.record_id)
+            if pos is None:
+                size = len(self._ids)
+                try:
+                    for column, value in zip(columns, values):
+                        column.append(value)
+                except BaseException:
+                    # 追加到一半失败时回滚，保持各列等长
+                    for column in columns:
+                        del column[size:]
+                    raise
+                self._positions[record.record_id] = size
+            else:
+                self._aggregates.apply(self._record_at(pos), -1)
+                for column, value in zip(columns, values):
+                    column[pos] = value
+            self._aggregates.apply(record)
+            day, seq = _split_record_id(record.record_id)
+            if seq > self._sequences.get(day, 0):
+                self._sequences[day] = seq
+
+    def get(self, record_id: str) -> Optional[PublishRecord]:
+        with self._lock:
+            pos = self._positions.get(record_id)
+            return self._record_at(pos) if pos is not None else None
+
+    def update_status(
+        self,
+        record_id: str,
+        status: PostStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            pos = self._positions.get(record_id)
+            if pos is None:
+                return False
+            old = self._record_at(pos)
+            self._aggregates.apply(old, -1)
+            self._statuses[pos] = self._status_pool.encode(status.value)
+            self._errors[pos] = error_message
+            old.status = status
+            old.error_message = error_message
+            self._aggregates.apply(old)
+            return True
+
+    def _match(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[int]:
+        """扫描各列，返回满足条件的行号（按发布时间、记录ID升序）"""
+        positions: Iterable[int] = range(len(self._ids))
+        for pool, column, value in (
+            (self._platform_pool, self._platforms, platform),
+            (self._status_pool, self._statuses, status.value if status is not None else None),
+        ):
+            if value is not None:
+                code = pool.codes.get(value)
+                if code is None:
+                    return []
+                positions = [p for p in positions if column[p] == code]
+        if topic_id is not None:
+            topics = self._topics
+            positions = [p for p in positions if topics[p] == topic_id]
+        times = self._times
+        if start is not None:
+            lo = (start - _EPOCH) // _MICROSECOND
+            positions = [p for p in positions if times[p] >= lo]
+        if end is not None:
+            hi = (end - _EPOCH) // _MICROSECOND
+            positions = [p for p in positions if times[p] < hi]
+        ids = self._ids
+        return sorted(positions, key=lambda p: (times[p], ids[p]))
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[PublishRecord]:
+        with self._lock:
+            return [self._record_at(p) for p in self._match(platform, topic_id, status, start, end)]
+
+    def record_ids(
+        self,
+        platform: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+    ) -> List[str]:
+        with self._lock:
+            return [self._ids[p] for p in self._match(platform=platform, status=status)]
+
+    def query_keys(
+        self,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[tuple]:
+        with self._lock:
+            platforms = self._platform_pool.values
+            return [
+                (_EPOCH + timedelta(microseconds=self._times[p]),
+                 platforms[self._platforms[p]], self._ids[p])
+                for p in self._match(status=status, start=start, end=end)
+            ]
+
+    def iter_rows(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        # 直接由列拼出行，不构建 PublishRecord
+        with self._lock:
+            positions = self._match(platform, topic_id, status, start, end)
+        platforms = self._platform_pool.values
+        accounts = self._account_pool.values
+        statuses = self._status_pool.values
+        for i in range(0, len(positions), chunk_size):
+            with self._lock:
+                chunk = [
+                    (
+                        self._ids[p], self._titles[p], self._topics[p],
+                        (_EPOCH + timedelta(microseconds=self._times[p])).isoformat(" ", "microseconds"),
+                        platforms[self._platforms[p]], accounts[self._accounts[p]],
+                        self._urls[p], self._ai_scores[p], self._word_counts[p],
+                        self._case_counts[p], statuses[self._statuses[p]], self._errors[p],
+                    )
+                    for p in positions[i:i + chunk_size]
+                    if p < len(self._ids)
+                ]
+            yield chunk
+
+    def count(self, status: Optional[PostStatus] = None) -> int:
+        if status is None:
+            return len(self._ids)
+        return self._aggregates.totals(status)["count"]
+
+    def totals_by_platform(self, status: PostStatus) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return self._aggregates.totals_by_platform(status)
+
+    def totals(self, status: PostStatus) -> Dict[str, Any]:
+        with self._lock:
+            return self._aggregates.totals(status)
+
+    def totals_by_day_platform(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            return self._aggregates.totals_by_day_platform(status, start, end)
+
+    def max_sequence(self, day: Optional[str] = None) -> int:
+        if day is not None:
+            return self._sequences.get(day, 0)
+        return max(self._sequences.values(), default=0)
+
+    def reserve_sequence(self, day: str, count: int = 1) -> int:
+        with self._lock:
+            first = self._sequences.get(day, 0) + 1
+            self._sequences[day] = first + count - 1
+            return first
+
+    def clear(self) -> None:
+        with self._lock:
+            for column in self._columns():
+                del column[:]
+            self._positions.clear()
+            self._aggregates.clear()
+            self._sequences.clear()
+
+
+class SQLiteRecordStore(RecordStore):
+    """
+    SQLite 记录存储（默认）
+
+    在 platform、topic_id、status、publish_time 上建索引；统计聚合表
+    publish_stats 由触发器在写入和状态变更时增量维护，统计查询不扫描记录表。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS publish_records (
+            record_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            topic_id TEXT NOT NULL,
+            publish_time TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            account TEXT NOT NULL,
+            post_url TEXT,
+            ai_score REAL NOT NULL,
+            word_count INTEGER NOT NULL,
+            case_count INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            error_message TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_records_platform ON publish_records (platform, status, publish_time);
+        CREATE INDEX IF NOT EXISTS idx_records_topic ON publish_records (topic_id, publish_time);
+        CREATE INDEX IF NOT EXISTS idx_records_status ON publish_records (status, publish_time);
+        CREATE INDEX IF NOT EXISTS idx_records_time ON publish_records (publish_time);
+
+        -- 统计聚合表：按 (状态, 平台, 日期) 累计，由触发器增量维护
+        CREATE TABLE IF NOT EXISTS publish_stats (
+            status TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            day TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total_words INTEGER NOT NULL,
+            total_cases INTEGER NOT NULL,
+            ai_score_sum REAL NOT NULL,
+            PRIMARY KEY (status, platform, day)
+        );
+        CREATE INDEX IF NOT EXISTS idx_stats_day ON publish_stats (status, day);
+
+        -- 每日记录序号：预留时原子递增，写入带标准ID的记录时由触发器推进
+        CREATE TABLE IF NOT EXISTS record_sequences (
+            day TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_records_sequence AFTER INSERT ON publish_records
+        WHEN NEW.record_id GLOB 'PUB-[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]-[0-9]*'
+        BEGIN
+            INSERT INTO record_sequences VALUES (
+                substr(NEW.record_id, 5, 10), CAST(substr(NEW.record_id, 16) AS INTEGER)
+            )
+            ON CONFLICT (day) DO UPDATE SET value = max(value, excluded.value);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_records_insert AFTER INSERT ON publish_records
+        BEGIN
+            INSERT INTO publish_stats VALUES (
+                NEW.status, NEW.platform, substr(NEW.publish_time, 1, 10),
+                1, NEW.word_count, NEW.case_count, NEW.ai_score
+            )
+            ON CONFLICT (status, platform, day) DO UPDATE SET
+                count = count + 1,
+                total_words = total_words + excluded.total_words,
+                total_cases = total_cases + excluded.total_cases,
+                ai_score_sum = ai_score_sum + excluded.ai_score_sum;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_records_delete AFTER DELETE ON publish_records
+        BEGIN
+            UPDATE publish_stats SET
+                count = count - 1,
+                total_words = total_words - OLD.word_count,
+                total_cases = total_cases - OLD.case_count,
+                ai_score_sum = ai_score_sum - OLD.ai_score
+            WHERE status = OLD.status AND platform = OLD.platform
+                AND day = substr(OLD.publish_time, 1, 10);
+            DELETE FROM publish_stats
+            WHERE status = OLD.status AND platform = OLD.platform
+                AND day = substr(OLD.publish_time, 1, 10) AND count = 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_records_update AFTER UPDATE ON publish_records
+        BEGIN
+            UPDATE publish_stats SET
+                count = count - 1,
+                total_words = total_words - OLD.word_count,
+                total_cases = total_cases - OLD.case_count,
+                ai_score_sum = ai_score_sum - OLD.ai_score
+            WHERE status = OLD.status AND platform = OLD.platform
+                AND day = substr(OLD.publish_time, 1, 10);
+            INSERT INTO publish_stats VALUES (
+                NEW.status, NEW.platform, substr(NEW.publish_time, 1, 10),
+                1, NEW.word_count, NEW.case_count, NEW.ai_score
+            )
+            ON CONFLICT (status, platform, day) DO UPDATE SET
+                count = count + 1,
+                total_words = total_words + excluded.total_words,
+                total_cases = total_cases + excluded.total_cases,
+                ai_score_sum = ai_score_sum + excluded.ai_score_sum;
+            DELETE FROM publish_stats
+            WHERE status = OLD.status AND platform = OLD.platform
+                AND day = substr(OLD.publish_time, 1, 10) AND count = 0;
+        END;
+    """
+
+    # 从记录表重建统计聚合（升级旧数据库时使用）
+    REBUILD_STATS = """
+        DELETE FROM publish_stats;
+        INSERT INTO publish_stats
+            SELECT status, platform, substr(publish_time, 1, 10),
+                   COUNT(*), SUM(word_count), SUM(case_count), SUM(ai_score)
+            FROM publish_records GROUP BY status, platform, substr(publish_time, 1, 10);
+    """
+
+    REBUILD_SEQUENCES = """
+        INSERT INTO record_sequences
+            SELECT substr(record_id, 5, 10), MAX(CAST(substr(record_id, 16) AS INTEGER))
+            FROM publish_records
+            WHERE record_id GLOB 'PUB-[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]-[0-9]*'
+            GROUP BY substr(record_id, 5, 10)
+        ON CONFLICT (day) DO UPDATE SET value = max(value, excluded.value);
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        """
+        Args:
+            db_path: 数据库文件路径，":memory:" 表示内存数据库
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        has_records = self._conn.execute("SELECT 1 FROM publish_records LIMIT 1").fetchone()
+        has_stats = self._conn.execute("SELECT 1 FROM publish_stats LIMIT 1").fetchone()
+        has_sequences = self._conn.execute("SELECT 1 FROM record_sequences LIMIT 1").fetchone()
+        if has_records and not has_stats:
+            self._conn.executescript(self.REBUILD_STATS)
+        if has_records and not has_sequences:
+            self._conn.executescript(self.REBUILD_SEQUENCES)
+        self._conn.commit()
+
+    @staticmethod
+    def _from_row(row: tuple) -> PublishRecord:
+        (record_id, title, topic_id, publish_time, platform, account,
+         post_url, ai_score, word_count, case_count, status, error_message) = row
+        return PublishRecord(
+            title=title,
+            topic_id=topic_id,
+            publish_time=datetime.fromisoformat(publish_time),
+            platform=platform,
+            account=account,
+            post_url=post_url,
+            ai_score=ai_score,
+            word_count=word_count,
+            case_count=case_count,
+            record_id=record_id,
+            status=PostStatus(status),
+            error_message=error_message,
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def add(self, record: PublishRecord) -> None:
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[PublishRecord]) -> None:
+        rows = [record_row(r) for r in records]
+        placeholders = ", ".join("?" * len(RECORD_COLUMNS))
+        with self._lock:
+            # 使用 UPSERT 而非 REPLACE，覆盖时触发 UPDATE 触发器维护统计聚合
+            self._conn.executemany(
+                f"INSERT INTO publish_records ({', '.join(RECORD_COLUMNS)}) "
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT (record_id) DO UPDATE SET {_UPSERT_ASSIGNMENTS}",
+                rows,
+            )
+            self._conn.commit()
+
+    def get(self, record_id: str) -> Optional[PublishRecord]:
+        rows = self._execute(
+            f"SELECT {', '.join(RECORD_COLUMNS)} FROM publish_records WHERE record_id = ?",
+            (record_id,),
+        )
+        return self._from_row(rows[0]) if rows else None
+
+    def update_status(
+        self,
+        record_id: str,
+        status: PostStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE publish_records SET status = ?, error_message = ? WHERE record_id = ?",
+                (status.value, error_message, record_id),
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _where(
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> tuple:
+        """构建 WHERE 子句和参数"""
+        clauses, params = [], []
+        if platform is not None:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if topic_id is not None:
+            clauses.append("topic_id = ?")
+            params.append(topic_id)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if start is not None:
+            clauses.append("publish_time >= ?")
+            params.append(start.strftime(_TIME_FORMAT))
+        if end is not None:
+            clauses.append("publish_time < ?")
+            params.append(end.strftime(_TIME_FORMAT))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[PublishRecord]:
+        where, params = self._where(platform, topic_id, status, start, end)
+        rows = self._execute(
+            f"SELECT {', '.join(RECORD_COLUMNS)} FROM publish_records{where} "
+            "ORDER BY publish_time, record_id",
+            params,
+        )
+        return [self._from_row(row) for row in rows]
+
+    def record_ids(
+        self,
+        platform: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+    ) -> List[str]:
+        where, params = self._where(platform=platform, status=status)
+        rows = self._execute(
+            f"SELECT record_id FROM publish_records{where} ORDER BY publish_time, record_id",
+            params,
+        )
+        return [row[0] for row in rows]
+
+    def query_keys(
+        self,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[tuple]:
+        where, params = self._where(status=status, start=start, end=end)
+        rows = self._execute(
+            f"SELECT publish_time, platform, record_id FROM publish_records{where} "
+            "ORDER BY publish_time, record_id",
+            params,
+        )
+        parse = datetime.fromisoformat
+        return [(parse(t), platform, rid) for t, platform, rid in rows]
+
+    def iter_rows(
+        self,
+        platform: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        status: Optional[PostStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        # 按 (发布时间, 记录ID) 分页，每块单独查询，导出期间不长时间占用连接
+        where, params = self._where(platform, topic_id, status, start, end)
+        sql = f"SELECT {', '.join(RECORD_COLUMNS)} FROM publish_records{where}"
+        after = " AND " if where else " WHERE "
+        rows = self._execute(f"{sql} ORDER BY publish_time, record_id LIMIT ?", params + (chunk_size,))
+        while rows:
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            rows = self._execute(
+                f"{sql}{after}(publish_time, record_id) > (?, ?) "
+                "ORDER BY publish_time, record_id LIMIT ?",
+                params + (rows[-1][3], rows[-1][0], chunk_size),
+            )
+
+    def count(self, status: Optional[PostStatus] = None) -> int:
+        if status is None:
+            return self._execute("SELECT COUNT(*) FROM publish_records")[0][0]
+        return self.totals(status)["count"]
+
+    @staticmethod
+    def _totals_row(count, words, cases, ai_sum) -> Dict[str, Any]:
+        return {
+            "count": count or 0,
+            "total_words": words or 0,
+            "total_cases": cases or 0,
+            "ai_score_sum": ai_sum or 0.0,
+        }
+
+    @staticmethod
+    def _day_where(
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> tuple:
+        """构建统计聚合表按日期过滤的 WHERE 条件和参数"""
+        clauses, params = ["status = ?"], [status.value]
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(start.strftime('%Y-%m-%d'))
+        if end is not None:
+            clauses.append("day < ?")
+            params.append(end.strftime('%Y-%m-%d'))
+        return " AND ".join(clauses), tuple(params)
+
+    def totals(self, status: PostStatus) -> Dict[str, Any]:
+        rows = self._execute(
+            "SELECT SUM(count), SUM(total_words), SUM(total_cases), SUM(ai_score_sum) "
+            "FROM publish_stats WHERE status = ?",
+            (status.value,),
+        )
+        return self._totals_row(*rows[0])
+
+    def totals_by_platform(self, status: PostStatus) -> Dict[str, Dict[str, Any]]:
+        rows = self._execute(
+            "SELECT platform, SUM(count), SUM(total_words), SUM(total_cases), SUM(ai_score_sum) "
+            "FROM publish_stats WHERE status = ? GROUP BY platform ORDER BY platform",
+            (status.value,),
+        )
+        return {platform: self._totals_row(*totals) for platform, *totals in rows}
+
+    def totals_by_day(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        clauses, params = self._day_where(status, start, end)
+        rows = self._execute(
+            "SELECT day, SUM(count), SUM(total_words), SUM(total_cases), SUM(ai_score_sum) "
+            f"FROM publish_stats WHERE {clauses} GROUP BY day ORDER BY day",
+            params,
+        )
+        return {day: self._totals_row(*totals) for day, *totals in rows}
+
+    def totals_by_day_platform(
+        self,
+        status: PostStatus,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        clauses, params = self._day_where(status, start, end)
+        rows = self._execute(
+            "SELECT day, platform, count, total_words, total_cases, ai_score_sum "
+            f"FROM publish_stats WHERE {clauses} ORDER BY day, platform",
+            params,
+        )
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for day, platform, *totals in rows:
+            result.setdefault(day, {})[platform] = self._totals_row(*totals)
+        return result
+
+    def max_sequence(self, day: Optional[str] = None) -> int:
+        if day is None:
+            rows = self._execute("SELECT MAX(value) FROM record_sequences")
+        else:
+            rows = self._execute("SELECT value FROM record_sequences WHERE day = ?", (day,))
+        return (rows[0][0] or 0) if rows else 0
+
+    def reserve_sequence(self, day: str, count: int = 1) -> int:
+        # 单条 UPSERT ... RETURNING 在数据库写锁内完成，多进程共享同一数据库时也不会重复
+        with self._lock:
+            last = self._conn.execute(
+                "INSERT INTO record_sequences VALUES (?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET value = value + excluded.value "
+                "RETURNING value",
+                (day, count),
+            ).fetchone()[0]
+            self._conn.commit()
+        return last - count + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM publish_records")
+            self._conn.execute("DELETE FROM publish_stats")
+            self._conn.execute("DELETE FROM record_sequences")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class JournaledRecordStore(MemoryRecordStore):
+    """
+    带预写日志（write-ahead journal）的内存记录存储
+
+    每次写入先以 JSON Lines 追加到日志文件，fsync 落盘后才返回；启动时回放日志
+    重建内存索引和统计（记录ID计数器由 set_record_store 续接）。
+
+    落盘采用组提交（group commit）：写入方在锁内追加日志行，随后等待落盘；
+    第一个等待者负责 fsync，期间其他线程追加的行由下一次 fsync 一并提交，
+    高并发时多条记录共享一次 fsync。
+
+    日志中的无效操作（被覆盖的记录、状态变更）累计超过阈值时自动压缩：
+    写出当前全部记录的快照并原子替换日志文件。
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        sync: bool = True,
+        compact_min_ops: int = 10000,
+        compact_ratio: float = 2.0,
+    ):
+        """
+        Args:
+            journal_path: 日志文件路径
+            sync: 是否 fsync（关闭后只写入操作系统缓冲，进程崩溃不丢，断电可能丢）
+            compact_min_ops: 日志条数少于该值时不压缩
+            compact_ratio: 日志条数超过记录数的该倍数时压缩
+        """
+        super().__init__()
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync = sync
+        self.compact_min_ops = compact_min_ops
+        self.compact_ratio = compact_ratio
+
+        self._commit = threading.Condition()
+        self._written = 0    # 已追加到文件的日志序号
+        self._durable = 0    # 已落盘的日志序号
+        self._syncing = False
+        self._ops = 0        # 当前日志文件中的条数
+        self._fsyncs = 0
+
+        self._replay()
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        if self._needs_compaction():
+            self.compact()
+
+    # ---------- 日志读写 ----------
+
+    def _replay(self) -> None:
+        """
+        回放日志重建内存状态
+
+        只有末尾没有换行符的不完整行（写入中途崩溃）被截断丢弃；完整的行无法解析或
+        应用（损坏、来自更新版本的字段）时抛出 ValueError，不改动日志文件，
+        避免丢弃其后的有效记录。
+        """
+        if not self.journal_path.exists():
+            return
+        valid_bytes = 0
+        with open(self.journal_path, "rb") as f:
+            for line_no, raw in enumerate(f, 1):
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    self._apply(json.loads(raw))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(
+                        f"发布记录日志第 {line_no} 行无法回放（{e}）: {self.journal_path}，"
+                        f"请检查或修复该行后重试"
+                    ) from e
+                valid_bytes += len(raw)
+                self._ops += 1
+        if valid_bytes < self.journal_path.stat().st_size:
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def _apply(self, entry: dict) -> None:
+        """将一条日志应用到内存存储"""
+        op = entry["op"]
+        if op == "put":
+            super().add(PublishRecord.from_dict(entry["record"]))
+        elif op == "status":
+            super().update_status(
+                entry["record_id"], PostStatus(entry["status"]), entry.get("error_message")
+            )
+        elif op == "clear":
+            super().clear()
+        else:
+            raise ValueError(f"未知的日志操作: {op}")
+
+    def _append(self, entries: List[dict]) -> int:
+        """追加日志行并应用到内存（调用方持有 self._lock），返回本次的日志序号"""
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+        for entry in entries:
+            self._apply(entry)
+        self._ops += len(entries)
+        with self._commit:
+            self._written += 1
+            return self._written
+
+    def _wait_durable(self, seq: int) -> None:
+        """等待日志序号 seq 落盘；无人负责 fsync 时由当前线程执行（组提交）"""
+        with self._commit:
+            while self._durable < seq:
+                if self._syncing:
+                    self._commit.wait()
+                    continue
+                self._syncing = True
+                target = self._written
+                self._commit.release()
+                try:
+                    with self._lock:
+                        self._file.flush()
+                        # 复制描述符后在锁外 fsync，期间其他线程可继续追加
+                        fd = os.dup(self._file.fileno()) if self.sync else None
+                    if fd is not None:
+                        try:
+                            os.fsync(fd)
+                        finally:
+                            os.close(fd)
+                finally:
+                    self._commit.acquire()
+                    self._syncing = False
+                    self._fsyncs += 1
+                    self._durable = max(self._durable, target)
+                    self._commit.notify_all()
+
+    def _log(self, entries: List[dict]) -> None:
+        """写入日志、应用到内存并等待落盘"""
+        if not entries:
+            return
+        with self._lock:
+            seq = self._append(entries)
+            compact = self._needs_compaction()
+        self._wait_durable(seq)
+        if compact:
+            self.compact()
+
+    def _needs_compaction(self) -> bool:
+        return self._ops >= max(self.compact_min_ops, len(self._records) * self.compact_ratio)
+
+    def compact(self) -> None:
+        """将日志压缩为当前全部记录的快照（写临时文件后原子替换）"""
+        tmp_path = self.journal_path.with_name(self.journal_path.name + ".compact")
+        with self._lock:
+            if self._ops <= len(self._records):
+                return
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self._records.values():
+                    f.write(json.dumps({"op": "put", "record": record.to_dict()}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp_path, self.journal_path)
+            if os.name == "posix":
+                # 目录项也要落盘，否则断电后可能仍是旧文件
+                dir_fd = os.open(self.journal_path.parent, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+            self._ops = len(self._records)
+            with self._commit:
+                # 快照已落盘，此前追加的日志都已持久
+                self._durable = self._written
+
+    # ---------- RecordStore 写接口 ----------
+
+    def add(self, record: PublishRecord) -> None:
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[PublishRecord]) -> None:
+        self._log([{"op": "put", "record": r.to_dict()} for r in records])
+
+    def update_status(
+        self,
+        record_id: str,
+        status: PostStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            if record_id not in self._records:
+                return False
+            seq = self._append([{
+                "op": "status",
+                "record_id": record_id,
+                "status": status.value,
+                "error_message": error_message,
+            }])
+        self._wait_durable(seq)
+        return True
+
+    def clear(self) -> None:
+        self._log([{"op": "clear"}])
+
+    def journal_stats(self) -> Dict[str, int]:
+        """日志统计：日志条数、记录数、fsync 次数"""
+        with self._lock:
+            return {"ops": self._ops, "records": len(self._records), "fsyncs": self._fsyncs}
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                if self.sync:
+                    os.fsync(self._file.fileno())
+                self._file.close()
+
+
+def _split_record_id(record_id: str) -> tuple:
+    """解析记录ID（PUB-YYYY-MM-DD-NNN）为 (日期, 序号)，非标准格式返回 (None, 0)"""
+    prefix, _, seq = record_id.rpartition("-")
+    if len(prefix) == 14 and prefix.startswith("PUB-") and seq.isdigit():
+        return prefix[4:], int(seq)
+    return None, 0
+
+
+# RecordStore.reserve_sequence 默认实现使用的锁
+_default_sequence_lock = threading.Lock()
@@ -0,0 +1,426 @@
+"""
+统一发布框架 - 重试与熔断
+
+- RetryPolicy: 带随机抖动的指数退避重试（full jitter），
+  次数取 PublishSettings.max_retries，总耗时不超过 PublishSettings.timeout
+- 可重试错误分类：发布请求不是幂等的，只重试确定未被平台受理的失败——
+  建立连接失败（请求未发送）和 408/425/429/503 响应；请求发出后的超时、
+  连接中断和其他 5xx 结果未知，不自动重试，只计入熔断
+- CircuitBreaker: 按平台熔断。连续失败达到阈值后在冷却期内直接拒绝调用，
+  不再占用发布线程等待超时；冷却期结束后放行一次探测调用，成功则恢复
+
+重试次数记录在 PublishResult.attempts，熔断状态记录在 PublishResult.circuit_state，
+汇总数据见 retry_stats() 和 circuit_breaker_stats()。
+"""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional
+
+from .base import Platform, PublishResult
+from .transport import ConnectError, TransportError
+
+
+DEFAULT_FAILURE_THRESHOLD = 5     # 连续失败多少次后熔断
+DEFAULT_RESET_TIMEOUT = 60.0      # 熔断冷却时间（秒）
+
+# 可重试的 HTTP 状态码（平台明确表示未处理请求：请求超时、过早、限流、暂不可用）
+RETRYABLE_STATUS = frozenset({408, 425, 429, 503})
+
+# 说明平台暂时不可用的 HTTP 状态码（计入熔断）
+TRANSIENT_STATUS = RETRYABLE_STATUS | {500, 502, 504}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    判断异常是否可以安全重试
+
+    只有建立连接阶段的失败（DNS 解析、拒绝连接、TLS/代理握手）可以重试，
+    此时请求尚未发出；读超时、连接中断时平台可能已经发布，重试会重复发布。
+    权限、文件等其他 OSError 不是瞬时错误，也不重试。
+    """
+    return isinstance(error, (ConnectError, ConnectionRefusedError, socket.gaierror))
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """判断异常是否说明平台暂时不可用（传输层错误、连接失败、超时），用于熔断计数"""
+    return is_retryable_error(error) or isinstance(
+        error, (TransportError, ConnectionError, TimeoutError, asyncio.TimeoutError)
+    )
+
+
+def is_retryable_status(status: int) -> bool:
+    """判断 HTTP 状态码是否可重试（平台未处理请求）"""
+    return status in RETRYABLE_STATUS
+
+
+def is_transient_status(status: int) -> bool:
+    """判断 HTTP 状态码是否说明平台暂时不可用（超时、限流、服务端错误）"""
+    return status in TRANSIENT_STATUS
+
+
+# ============================================================
+# 熔断器
+# ============================================================
+
+
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"         # 正常放行
+    OPEN = "open"             # 熔断中，直接拒绝
+    HALF_OPEN = "half_open"   # 冷却结束，放行一次探测调用
+
+
+class CircuitBreaker:
+    """
+    单个平台的熔断器（线程安全）
+
+    只有平台不可用导致的失败（连接失败、超时、5xx，见 PublishResult.transient）计入失败次数；
+    平台正常返回的业务错误（如 403）说明平台可达，按成功处理。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: 平台名称
+            failure_threshold: 连续失败多少次后熔断
+            reset_timeout: 熔断后多久放行探测调用（秒）
+            clock: 时钟函数（测试时可替换）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._opens = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """当前状态（冷却期已过的熔断状态视为半开）"""
+        with self._lock:
+            if self._state is CircuitState.OPEN and self._cooled_down():
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def _cooled_down(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+    def allow(self) -> bool:
+        """
+        申请一次调用
+
+        Returns:
+            bool: 是否放行；半开状态下只放行一次探测调用
+        """
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.OPEN and self._cooled_down():
+                self._state = CircuitState.HALF_OPEN
+                self._probing = False
+            if self._state is CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._rejected += 1
+            return False
+
+    def rejects(self) -> bool:
+        """不占用探测名额地检查当前是否会拒绝调用（分发前的快速判断）"""
+        with self._lock:
+            if self._state is CircuitState.OPEN:
+                return not self._cooled_down()
+            return self._state is CircuitState.HALF_OPEN and self._probing
+
+    def reject(self) -> None:
+        """记录一次分发前被拒绝的调用"""
+        with self._lock:
+            self._rejected += 1
+
+    def record_success(self) -> None:
+        """记录成功：关闭熔断器并清零失败计数"""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """记录失败：达到阈值或探测失败时熔断"""
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state is not CircuitState.OPEN:
+                    self._opens += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def record(self, result: PublishResult) -> None:
+        """按发布结果记录：可重试或平台不可用的失败计为失败，其余计为成功"""
+        if not result.success and (result.retryable or result.transient):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict:
+        """
+        获取熔断器统计
+
+        Returns:
+            Dict: 状态、连续失败次数、熔断次数和被拒绝的调用数
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state.value,
+                "failures": self._failures,
+                "opens": self._opens,
+                "rejected": self._rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(platform: str) -> CircuitBreaker:
+    """获取平台的熔断器（按平台名称共享，首次使用时创建）"""
+    breaker = _breakers.get(platform)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(platform, CircuitBreaker(platform))
+    return breaker
+
+
+def circuit_breaker_stats() -> Dict[str, Dict]:
+    """各平台熔断器统计"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """清除全部熔断器（测试或配置变更后使用）"""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def circuit_open_result(breaker: CircuitBreaker, platform: Platform = Platform.CUSTOM) -> PublishResult:
+    """熔断时直接返回的失败结果"""
+    result = PublishResult.failed_result(
+        f"平台熔断中: {breaker.name}（连续失败，{breaker.reset_timeout:.0f}秒内暂停调用）",
+        platform=platform,
+    )
+    result.attempts = 0
+    result.circuit_state = CircuitState.OPEN.value
+    return result
+
+
+# ============================================================
+# 重试
+# ============================================================
+
+
+class _RetryCounters:
+    """重试统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.exhausted = 0        # 重试次数用尽仍失败
+        self.short_circuited = 0  # 被熔断器拒绝
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "short_circuited": self.short_circuited,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = self.attempts = self.retries = self.exhausted = self.short_circuited = 0
+
+
+_counters = _RetryCounters()
+
+
+def retry_stats() -> Dict:
+    """全局重试统计"""
+    return _counters.snapshot()
+
+
+def reset_retry_stats() -> None:
+    """清零全局重试统计"""
+    _counters.reset()
+
+
+@dataclass
+class RetryPolicy:
+    """重试策略"""
+    max_retries: int = 3                  # 首次之外的最大重试次数
+    base_delay: float = 1.0               # 第一次重试前的最大等待（秒）
+    max_delay: float = 30.0               # 单次等待上限（秒）
+    deadline: Optional[float] = None      # 总耗时上限（秒），下次等待会超出时不再重试
+    rng: random.Random = field(default_factory=random.Random, repr=False)  # 抖动随机源（测试时可固定种子）
+
+    @classmethod
+    def from_publisher_config(cls, config=None) -> "RetryPolicy":
+        """
+        从发布配置读取重试次数（max_retries）和总耗时上限（timeout）
+
+        Args:
+            config: config.publisher.PublisherConfig，默认使用全局配置
+        """
+        if config is None:
+            from config.publisher import get_publisher_config
+            config = get_publisher_config()
+        return cls(max_retries=config.get_max_retries(), deadline=float(config.get_timeout()))
+
+    def delay(self, retry: int) -> float:
+        """第 retry 次重试（从 0 开始）前的等待：[0, min(上限, 基数 * 2^retry)] 内均匀随机"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    def _next_delay(self, result: PublishResult, attempts: int, started: float) -> Optional[float]:
+        """失败后的等待时间，不再重试时返回 None"""
+        if result.success or not result.retryable:
+            return None
+        if attempts > self.max_retries:
+            _counters.add(exhausted=1)
+            return None
+        delay = self.delay(attempts - 1)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            _counters.add(exhausted=1)
+            return None
+        return delay
+
+    @staticmethod
+    def _finish(result: PublishResult, attempts: int, breaker: Optional[CircuitBreaker]) -> PublishResult:
+        result.attempts = attempts
+        if breaker is not None:
+            result.circuit_state = breaker.state.value
+        return result
+
+    def run(
+        self,
+        call: Callable[[], PublishResult],
+        breaker: Optional[CircuitBreaker] = None,
+        platform: Platform = Platform.CUSTOM,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> PublishResult:
+        """
+        按策略执行发布调用
+
+        Args:
+            call: 单次发布调用（异常按可重试分类转为失败结果）
+            breaker: 平台熔断器，每次尝试前申请，尝试后记录结果
+            platform: 熔断时失败结果的平台
+            sleep: 等待函数（测试时可替换）
+
+        Returns:
+            PublishResult: 最后一次尝试的结果（attempts 为尝试次数）
+        """
+        _counters.add(calls=1)
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                _counters.add(short_circuited=1)
+                if attempts == 0:
+                    return circuit_open_result(breaker, platform)
+                break
+            attempts += 1
+            _counters.add(attempts=1, retries=1 if attempts > 1 else 0)
+            try:
+                result = call()
+            except Exception as e:
+                result = PublishResult.failed_result(
+                    f"发布异常: {e}",
+                    platform=platform,
+                    retryable=is_retryable_error(e),
+                    transient=is_transient_error(e),
+                )
+            if breaker is not None:
+                breaker.record(result)
+            delay = self._next_delay(result, attempts, started)
+            if delay is None:
+                break
+            sleep(delay)
+        return self._finish(result, attempts, breaker)
+
+    async def arun(
+        self,
+        call: Callable[[], Awaitable[PublishResult]],
+        breaker: Optional[CircuitBreaker] = None,
+        platform: Platform = Platform.CUSTOM,
+    ) -> PublishResult:
+        """异步版本的 run，等待使用 asyncio.sleep"""
+        _counters.add(calls=1)
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                _counters.add(short_circuited=1)
+                if attempts == 0:
+                    return circuit_open_result(breaker, platform)
+                break
+            attempts += 1
+            _counters.add(attempts=1, retries=1 if attempts > 1 else 0)
+            try:
+                result = await call()
+            except Exception as e:
+                result = PublishResult.failed_result(
+                    f"发布异常: {e}",
+                    platform=platform,
+                    retryable=is_retryable_error(e),
+                    transient=is_transient_error(e),
+                )
+            if breaker is not None:
+                breaker.record(result)
+            delay = self._next_delay(result, attempts, started)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        return self._finish(result, attempts, breaker)
+
+
+_retry_policy: Optional[RetryPolicy] = None
+
+
+def get_retry_policy() -> RetryPolicy:
+    """获取全局重试策略（首次调用时按发布配置创建）"""
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy.from_publisher_config()
+    return _retry_policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]) -> None:
+    """替换全局重试策略（None 表示下次使用时按配置重新创建）"""
+    global _retry_policy
+    _retry_policy = policy
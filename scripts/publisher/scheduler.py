@@ -0,0 +1,410 @@
+"""
+统一发布框架 - 限流与发布调度
+
+- TokenBucket: 令牌桶，每 interval 秒补充一个令牌，最多积攒 burst 个
+- RateLimiter: 按 (平台, 账号) 限流，间隔取 PublishSettings.publish_interval；
+  可为单个平台额外设置跨账号的平台级间隔
+- PublishScheduler: 待发布内容的优先队列，按最早允许发布时间排序；
+  后台调度线程把到期的任务分发到线程池，各平台并行发布，互不等待
+
+    scheduler = PublishScheduler(unified_publisher)
+    for content in backlog:
+        scheduler.submit(content, ["zhihu", "jianshu"])
+    with scheduler:
+        scheduler.drain()
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base import Content, PublishResult
+from .publisher import UnifiedPublisher
+
+
+class TokenBucket:
+    """
+    令牌桶（非线程安全，由 RateLimiter 加锁调用）
+
+    不逐次累加令牌数，而是记录下一个令牌的理论到达时间（GCRA 形式），
+    行为与每 interval 秒补充一个令牌、最多积攒 burst 个的令牌桶相同，
+    且可用时间是确定的绝对时间，不受浮点累加误差影响。
+    """
+
+    def __init__(self, interval: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            interval: 补充一个令牌的间隔（秒），0 表示不限流
+            burst: 令牌上限（允许连续发布的次数）
+            clock: 时钟函数（测试时可替换）
+        """
+        self.interval = interval
+        self.burst = burst
+        self._clock = clock
+        self._arrival = float("-inf")  # 下一个令牌的理论到达时间（桶满时不晚于当前时间）
+
+    def ready_at(self) -> float:
+        """下一个令牌可用的时间（时钟读数）"""
+        return self._arrival - (self.burst - 1) * self.interval
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """距离下一个令牌可用的秒数（0 表示当前可用）"""
+        now = self._clock() if now is None else now
+        return max(0.0, self.ready_at() - now)
+
+    def acquire(self, now: Optional[float] = None) -> None:
+        """取走一个令牌（调用前应确认 wait_time 为 0）"""
+        now = self._clock() if now is None else now
+        self._arrival = max(self._arrival, now) + self.interval
+
+
+class RateLimiter:
+    """
+    按平台和账号的限流器（线程安全）
+
+    同一账号在同一平台上两次发布至少间隔 interval 秒；
+    platform_intervals 中列出的平台另有跨账号的平台级间隔。
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        burst: int = 1,
+        platform_intervals: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            interval: 同一账号同一平台的发布间隔（秒）
+            burst: 允许连续发布的次数
+            platform_intervals: 平台级间隔 {平台: 秒}
+            clock: 时钟函数（测试时可替换）
+        """
+        self.interval = interval
+        self.burst = burst
+        self.platform_intervals = dict(platform_intervals or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._account_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._platform_buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_publisher_config(cls, config=None, **kwargs) -> "RateLimiter":
+        """
+        按发布配置的发布间隔（publish_interval）创建
+
+        Args:
+            config: config.publisher.PublisherConfig，默认使用全局配置
+            **kwargs: 其他构造参数
+        """
+        if config is None:
+            from config.publisher import get_publisher_config
+            config = get_publisher_config()
+        return cls(float(config.get_publish_interval()), **kwargs)
+
+    @property
+    def clock(self) -> Callable[[], float]:
+        return self._clock
+
+    def _buckets(self, platform: str, account: str) -> List[TokenBucket]:
+        key = (platform, account)
+        bucket = self._account_buckets.get(key)
+        if bucket is None:
+            bucket = self._account_buckets[key] = TokenBucket(self.interval, self.burst, self._clock)
+        buckets = [bucket]
+        if platform in self.platform_intervals:
+            bucket = self._platform_buckets.get(platform)
+            if bucket is None:
+                bucket = self._platform_buckets[platform] = TokenBucket(
+                    self.platform_intervals[platform], self.burst, self._clock
+                )
+            buckets.append(bucket)
+        return buckets
+
+    def ready_at(self, platform: str, account: str) -> float:
+        """该账号可以在该平台发布的最早时间（时钟读数）"""
+        with self._lock:
+            return max(bucket.ready_at() for bucket in self._buckets(platform, account))
+
+    def wait_time(self, platform: str, account: str) -> float:
+        """距离该账号可以在该平台发布的秒数（0 表示当前可发布）"""
+        return max(0.0, self.ready_at(platform, account) - self._clock())
+
+    def try_acquire(self, platform: str, account: str) -> bool:
+        """
+        尝试占用一次发布名额（账号级和平台级同时满足才占用）
+
+        Returns:
+            bool: 是否已占用
+        """
+        now = self._clock()
+        with self._lock:
+            buckets = self._buckets(platform, account)
+            if any(bucket.ready_at() > now for bucket in buckets):
+                return False
+            for bucket in buckets:
+                bucket.acquire(now)
+            return True
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """获取全局限流器（首次调用时按发布配置创建，多个调度器共享）"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter.from_publisher_config()
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """替换全局限流器（None 表示下次使用时按配置重新创建）"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
+
+
+@dataclass(order=True)
+class ScheduledPublish:
+    """
+    调度中的发布任务
+
+    排序：最早允许发布时间 → 优先级（数字越小越优先）→ 提交顺序。
+    立即可发布的任务 ready_at 为 0，彼此之间按优先级排序。
+    """
+    ready_at: float
+    priority: int
+    sequence: int
+    content: Content = field(compare=False)
+    platform: str = field(compare=False)
+    account: str = field(compare=False)
+    result: Optional[PublishResult] = field(default=None, compare=False)
+    _done: threading.Event = field(default_factory=threading.Event, compare=False, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[PublishResult]:
+        """
+        等待任务完成
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            PublishResult 或 None（超时未完成）
+        """
+        self._done.wait(timeout)
+        return self.result
+
+
+class PublishScheduler:
+    """
+    发布调度器
+
+    任务按最早允许发布时间进入优先队列。调度线程取出到期任务时向限流器申请名额：
+    名额不足则按限流器给出的等待时间重新入队，其他平台的任务不受影响；
+    申请成功则交给线程池调用 UnifiedPublisher.publish（含AI检测、重试和自动采集）。
+    """
+
+    def __init__(
+        self,
+        publisher: UnifiedPublisher,
+        limiter: Optional[RateLimiter] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            publisher: 统一发布器
+            limiter: 限流器，默认使用全局限流器
+            max_workers: 并发发布的最大线程数，默认取发布器的 max_concurrency
+        """
+        self.publisher = publisher
+        self.limiter = limiter or get_rate_limiter()
+        self.max_workers = max_workers or publisher.config.max_concurrency
+        self._clock = self.limiter.clock
+        self._heap: List[ScheduledPublish] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._metrics = {
+            "submitted": 0,
+            "dispatched": 0,
+            "throttled": 0,
+            "succeeded": 0,
+            "failed": 0,
+        }
+
+    def submit(
+        self,
+        content: Content,
+        platforms: List[str],
+        account: Optional[str] = None,
+        priority: int = 0,
+        not_before: Optional[datetime] = None,
+    ) -> List[ScheduledPublish]:
+        """
+        提交内容到多个平台的发布任务
+
+        Args:
+            content: 要发布的内容
+            platforms: 目标平台列表
+            account: 发布账号（可选，默认使用发布器配置中的账号）
+            priority: 优先级，数字越小越优先
+            not_before: 最早发布时间（可选）
+
+        Returns:
+            List[ScheduledPublish]: 每个平台一个任务
+        """
+        account = account or self.publisher.config.default_account
+        ready_at = 0.0
+        if not_before is not None:
+            delay = (not_before - datetime.now()).total_seconds()
+            if delay > 0:
+                ready_at = self._clock() + delay
+        jobs = []
+        with self._cond:
+            for platform in platforms:
+                job = ScheduledPublish(
+                    ready_at=ready_at,
+                    priority=priority,
+                    sequence=next(self._sequence),
+                    content=content,
+                    platform=platform,
+                    account=account,
+                )
+                heapq.heappush(self._heap, job)
+                jobs.append(job)
+            self._metrics["submitted"] += len(jobs)
+            self._cond.notify_all()
+        return jobs
+
+    def start(self) -> "PublishScheduler":
+        """启动调度线程（已启动时无操作）"""
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduled-publish")
+            self._thread = threading.Thread(target=self._run, name="publish-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        停止调度线程，未到期的任务留在队列中
+
+        Args:
+            wait: 是否等待已分发的任务完成
+        """
+        with self._cond:
+            thread, executor = self._thread, self._executor
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        with self._cond:
+            self._thread = self._executor = None
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待队列清空且所有已分发任务完成
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否已全部完成
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._heap and not self._in_flight, timeout)
+
+    def pending(self) -> List[ScheduledPublish]:
+        """队列中尚未分发的任务（按调度顺序）"""
+        with self._cond:
+            return sorted(self._heap)
+
+    def stats(self) -> Dict:
+        """
+        获取调度统计
+
+        Returns:
+            Dict: 提交、分发、限流推迟、成功、失败的次数，以及队列长度和进行中的任务数
+        """
+        with self._cond:
+            stats = dict(self._metrics)
+            stats["queued"] = len(self._heap)
+            stats["in_flight"] = self._in_flight
+            return stats
+
+    def _next_job(self) -> Optional[ScheduledPublish]:
+        """
+        取出下一个可发布的任务（停止时返回 None）
+
+        只在有空闲线程时取号：限流名额在任务即将开始时占用，任务不会在线程池队列里
+        积压，否则同一账号平台的多个任务可能在线程空出后紧挨着发布，突破发布间隔。
+        """
+        with self._cond:
+            while not self._stopping:
+                if self._in_flight >= self.max_workers:
+                    self._cond.wait()
+                    continue
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait = self._heap[0].ready_at - self._clock()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                job = heapq.heappop(self._heap)
+                if not self.limiter.try_acquire(job.platform, job.account):
+                    # 名额不足：推迟到限流器允许的时间；同一账号平台的任务推迟到同一时间，
+                    # 因此仍按优先级和提交顺序发布
+                    job.ready_at = self.limiter.ready_at(job.platform, job.account)
+                    heapq.heappush(self._heap, job)
+                    self._metrics["throttled"] += 1
+                    continue
+                self._in_flight += 1
+                self._metrics["dispatched"] += 1
+                return job
+            return None
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._executor.submit(self._publish, job)
+
+    def _publish(self, job: ScheduledPublish) -> None:
+        try:
+            result = self.publisher.publish(job.content, job.platform, job.account)
+        except Exception as e:
+            result = PublishResult.failed_result(f"发布异常: {e}")
+        job.result = result
+        with self._cond:
+            self._in_flight -= 1
+            self._metrics["succeeded" if result.success else "failed"] += 1
+            self._cond.notify_all()
+        job._done.set()
+
+    def __enter__(self) -> "PublishScheduler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -8,26 +8,56 @@
 1. 发布后自动采集装饰器
 2. 查询已发布内容（按平台、时间、选题ID）
 3. 统计功能（各平台发布数量、每日发布趋势）
+4. 可插拔的记录存储（默认 SQLite，带索引；也可使用内存存储或带预写日志的内存存储），
+   存储后端见 record_store 模块，MCP Memory 写入见 memory_sync 模块
 """
 
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from enum import Enum
-from functools import wraps
-from typing import Optional, List, Dict, Any
-import json
-
-
-class PostStatus(Enum):
-    """发布状态枚举"""
-    DRAFT = "draft"
-    PUBLISHED = "published"
-    FAILED = "failed"
+from __future__ import annotations
 
-
-# 存储在内存中的发布记录（用于查询和统计）
-# 在实际生产环境中，可替换为数据库或持久化存储
-_publish_records: Dict[str, PublishRecord] = {}
+from datetime import date, datetime, timedelta
+from functools import wraps
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable
+from time import monotonic
+import os
+import sys
+import threading
+
+# 记录存储和 MCP Memory 同步分别在 record_store、memory_sync 模块中，这里重新导出
+from .record_store import (
+    AggregateTotals,
+    ColumnarRecordStore,
+    JournaledRecordStore,
+    MemoryRecordStore,
+    PostStatus,
+    PublishRecord,
+    RECORD_COLUMNS,
+    RecordAggregates,
+    RecordStore,
+    SQLiteRecordStore,
+    record_row,
+)
+from .memory_sync import (
+    DEFAULT_MEMORY_BATCH_SIZE,
+    BatchSaveReport,
+    LocalMemoryServer,
+    MCPMemoryClient,
+    MemoryClient,
+    MemoryWriteQueue,
+    batch_save_records,
+    enqueue_memory_write,
+    get_memory_client,
+    get_memory_write_queue,
+    save_records_to_memory,
+    save_to_memory,
+    set_memory_client,
+    set_memory_write_queue,
+)
+
+
+# 项目根目录与默认的记录数据库位置（可通过环境变量 PUBLISH_TRACKER_DB 覆盖）
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "publish_records.db"
 
 
 # ============================================================
@@ -104,9 +134,9 @@ def auto_track_publish(platform_name: str):
                         error_message=None
                     )
 
-                    # 保存到内存和 MCP Memory
-                    _publish_records[record.record_id] = record
-                    save_to_memory(record)
+                    # 保存到记录存储，MCP Memory 由后台队列异步写入
+                    save_record(record)
+                    enqueue_memory_write(record)
 
                     print(f"[自动采集] 已记录发布: {record.title} -> {platform_name}")
                 except Exception as e:
@@ -126,7 +156,7 @@ def auto_track_publish(platform_name: str):
                         status=PostStatus.FAILED,
                         error_message=error_msg
                     )
-                    _publish_records[record.record_id] = record
+                    save_record(record)
                 except Exception as e:
                     print(f"[自动采集] 记录失败状态失败: {e}")
 
@@ -148,10 +178,7 @@ def query_by_platform(platform: str) -> List[PublishRecord]:
     Returns:
         List of publish records for the platform
     """
-    return [
-        record for record in _publish_records.values()
-        if record.platform == platform and record.status == PostStatus.PUBLISHED
-    ]
+    return get_record_store().query(platform=platform, status=PostStatus.PUBLISHED)
 
 
 def query_by_topic_id(topic_id: str) -> List[PublishRecord]:
@@ -163,10 +190,7 @@ def query_by_topic_id(topic_id: str) -> List[PublishRecord]:
     Returns:
         List of publish records for the topic
     """
-    return [
-        record for record in _publish_records.values()
-        if record.topic_id == topic_id
-    ]
+    return get_record_store().query(topic_id=topic_id)
 
 
 def query_by_date_range(
@@ -176,7 +200,7 @@ def query_by_date_range(
     """Query published content by date range.
 
     Args:
-        start_date: Start date (exclusive), defaults to today start
+        start_date: Start date (inclusive), defaults to today start
         end_date: End date (exclusive), defaults to now
 
     Returns:
@@ -187,11 +211,9 @@ def query_by_date_range(
     if end_date is None:
         end_date = datetime.now()
 
-    return [
-        record for record in _publish_records.values()
-        if start_date <= record.publish_time < end_date
-        and record.status == PostStatus.PUBLISHED
-    ]
+    return get_record_store().query(
+        status=PostStatus.PUBLISHED, start=start_date, end=end_date
+    )
 
 
 def query_by_date(date: datetime) -> List[PublishRecord]:
@@ -214,10 +236,7 @@ def query_all_published() -> List[PublishRecord]:
     Returns:
         List of all published records
     """
-    return [
-        record for record in _publish_records.values()
-        if record.status == PostStatus.PUBLISHED
-    ]
+    return get_record_store().query(status=PostStatus.PUBLISHED)
 
 
 def query_failed() -> List[PublishRecord]:
@@ -226,10 +245,7 @@ def query_failed() -> List[PublishRecord]:
     Returns:
         List of all failed records
     """
-    return [
-        record for record in _publish_records.values()
-        if record.status == PostStatus.FAILED
-    ]
+    return get_record_store().query(status=PostStatus.FAILED)
 
 
 # ============================================================
@@ -242,11 +258,10 @@ def count_by_platform() -> Dict[str, int]:
     Returns:
         Dict mapping platform name to publish count
     """
-    counts: Dict[str, int] = {}
-    for record in _publish_records.values():
-        if record.status == PostStatus.PUBLISHED:
-            counts[record.platform] = counts.get(record.platform, 0) + 1
-    return counts
+    return {
+        platform: totals["count"]
+        for platform, totals in get_record_store().totals_by_platform(PostStatus.PUBLISHED).items()
+    }
 
 
 def count_by_platform_detailed() -> Dict[str, Dict[str, Any]]:
@@ -255,38 +270,30 @@ def count_by_platform_detailed() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict mapping platform name to detailed stats
     """
+    store = get_record_store()
     stats: Dict[str, Dict[str, Any]] = {}
 
-    for record in _publish_records.values():
-        if record.status == PostStatus.PUBLISHED:
-            platform = record.platform
-            if platform not in stats:
-                stats[platform] = {
-                    "count": 0,
-                    "total_words": 0,
-                    "total_cases": 0,
-                    "avg_ai_score": 0.0,
-                    "records": []
-                }
-
-            stats[platform]["count"] += 1
-            stats[platform]["total_words"] += record.word_count
-            stats[platform]["total_cases"] += record.case_count
-            stats[platform]["records"].append(record.record_id)
-
-    # 计算平均AI评分
-    for platform, data in stats.items():
-        if data["count"] > 0:
-            records = [
-                r for r in _publish_records.values()
-                if r.platform == platform and r.status == PostStatus.PUBLISHED
-            ]
-            avg_score = sum(r.ai_score for r in records) / len(records)
-            data["avg_ai_score"] = round(avg_score, 2)
+    for platform, totals in store.totals_by_platform(PostStatus.PUBLISHED).items():
+        stats[platform] = {
+            "count": totals["count"],
+            "total_words": totals["total_words"],
+            "total_cases": totals["total_cases"],
+            "avg_ai_score": round(totals["ai_score_sum"] / totals["count"], 2),
+            "records": store.record_ids(platform=platform, status=PostStatus.PUBLISHED),
+        }
 
     return stats
 
 
+def _trend_window(days: int) -> tuple:
+    """趋势统计窗口：(首日零点, 明日零点)"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = end_date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return first_day, tomorrow
+
+
 def daily_trend(days: int = 7) -> Dict[str, int]:
     """Get daily publish trend.
 
@@ -296,24 +303,20 @@ def daily_trend(days: int = 7) -> Dict[str, int]:
     Returns:
         Dict mapping date string to publish count
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-
-    trend: Dict[str, int] = {}
+    first_day, tomorrow = _trend_window(days)
 
     # 初始化所有日期
-    current = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    while current <= end_date:
-        date_key = current.strftime('%Y-%m-%d')
-        trend[date_key] = 0
+    trend: Dict[str, int] = {}
+    current = first_day
+    while current < tomorrow:
+        trend[current.strftime('%Y-%m-%d')] = 0
         current += timedelta(days=1)
 
-    # 统计每日数量
-    for record in _publish_records.values():
-        if record.status == PostStatus.PUBLISHED:
-            date_key = record.publish_time.strftime('%Y-%m-%d')
-            if date_key in trend:
-                trend[date_key] += 1
+    # 每日数量取自按日聚合
+    for date_key, totals in get_record_store().totals_by_day(
+        PostStatus.PUBLISHED, first_day.date(), tomorrow.date()
+    ).items():
+        trend[date_key] = totals["count"]
 
     return trend
 
@@ -327,38 +330,111 @@ def daily_trend_detailed(days: int = 7) -> List[Dict[str, Any]]:
     Returns:
         List of daily detailed stats
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
+    return [
+        {
+            "date": bucket["start"],
+            "total": bucket["total"],
+            "by_platform": bucket["by_platform"],
+            "records": bucket["records"],
+        }
+        for bucket in publish_time_series(days, granularity="day", include_records=True)
+    ]
+
+
+# 时间序列支持的分桶粒度
+GRANULARITIES = ("hour", "day", "week")
 
-    result = []
+_BUCKET_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
 
-    # 遍历每一天
-    current = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    while current <= end_date:
-        next_day = current + timedelta(days=1)
 
-        # 筛选当天的记录
-        day_records = [
-            r for r in _publish_records.values()
-            if current <= r.publish_time < next_day
-            and r.status == PostStatus.PUBLISHED
-        ]
+def bucket_start(moment: datetime, granularity: str = "day") -> datetime:
+    """Get the start of the bucket containing a moment.
 
-        # 按平台统计
-        platform_counts: Dict[str, int] = {}
-        for record in day_records:
-            platform_counts[record.platform] = platform_counts.get(record.platform, 0) + 1
+    Args:
+        moment: Point in time
+        granularity: "hour", "day" or "week" (weeks start on Monday)
+
+    Returns:
+        Bucket start time
+    """
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"不支持的时间粒度: {granularity}（可选 {', '.join(GRANULARITIES)}）")
+
+
+def publish_time_series(
+    days: int = 7,
+    granularity: str = "day",
+    status: PostStatus = PostStatus.PUBLISHED,
+    include_records: bool = False,
+) -> List[Dict[str, Any]]:
+    """Get a bucketed publish time series with per-platform breakdown.
+
+    Without record IDs (and for day/week buckets) the series is built from the
+    store's per-day aggregates, so its cost depends on days x platforms rather
+    than on the number of records. Otherwise the records in the window are
+    assigned to buckets in a single pass.
 
-        result.append({
-            "date": current.strftime('%Y-%m-%d'),
-            "total": len(day_records),
-            "by_platform": platform_counts,
-            "records": [r.record_id for r in day_records]
-        })
+    Args:
+        days: Number of days to include, defaults to 7
+        granularity: "hour", "day" or "week"
+        status: Record status to count, defaults to published
+        include_records: Whether to list record IDs per bucket
+
+    Returns:
+        List of buckets in time order, each with start, total and by_platform
+        (plus records when include_records is set)
+    """
+    step = _BUCKET_STEPS.get(granularity)
+    if step is None:
+        raise ValueError(f"不支持的时间粒度: {granularity}（可选 {', '.join(GRANULARITIES)}）")
+    label_format = '%Y-%m-%d %H:00' if granularity == "hour" else '%Y-%m-%d'
 
-        current = next_day
+    now = datetime.now()
+    first = bucket_start(now - timedelta(days=days), granularity)
+    end = bucket_start(now, granularity) + step
+
+    # 初始化窗口内所有分桶
+    buckets: Dict[datetime, Dict[str, Any]] = {}
+    current = first
+    while current < end:
+        bucket = {"start": current.strftime(label_format), "total": 0, "by_platform": {}}
+        if include_records:
+            bucket["records"] = []
+        buckets[current] = bucket
+        current += step
+
+    store = get_record_store()
+    if include_records or granularity == "hour":
+        # 记录一次性分桶；按时间升序返回，相邻记录通常落在同一桶
+        bucket_end = first
+        bucket = None
+        for publish_time, platform, record_id in store.query_keys(status=status, start=first, end=end):
+            if publish_time >= bucket_end:
+                key = bucket_start(publish_time, granularity)
+                bucket, bucket_end = buckets[key], key + step
+            bucket["total"] += 1
+            bucket["by_platform"][platform] = bucket["by_platform"].get(platform, 0) + 1
+            if include_records:
+                bucket["records"].append(record_id)
+    else:
+        # 由按日聚合汇总到日/周分桶
+        for day, platforms in store.totals_by_day_platform(status, first.date(), end.date()).items():
+            bucket = buckets[bucket_start(datetime.strptime(day, '%Y-%m-%d'), granularity)]
+            for platform, totals in platforms.items():
+                bucket["total"] += totals["count"]
+                bucket["by_platform"][platform] = bucket["by_platform"].get(platform, 0) + totals["count"]
 
-    return result
+    return list(buckets.values())
 
 
 def get_statistics_summary() -> Dict[str, Any]:
@@ -367,18 +443,18 @@ def get_statistics_summary() -> Dict[str, Any]:
     Returns:
         Dict containing statistics summary
     """
-    published = query_all_published()
-    failed = query_failed()
+    store = get_record_store()
+    published = store.totals(PostStatus.PUBLISHED)
+    failed = store.totals(PostStatus.FAILED)
 
-    total_words = sum(r.word_count for r in published)
-    total_cases = sum(r.case_count for r in published)
-    avg_ai_score = sum(r.ai_score for r in published) / len(published) if published else 0
+    total_published = published["count"]
+    avg_ai_score = published["ai_score_sum"] / total_published if total_published else 0
 
     return {
-        "total_published": len(published),
-        "total_failed": len(failed),
-        "total_words": total_words,
-        "total_cases": total_cases,
+        "total_published": total_published,
+        "total_failed": failed["count"],
+        "total_words": published["total_words"],
+        "total_cases": published["total_cases"],
         "avg_ai_score": round(avg_ai_score, 2),
         "by_platform": count_by_platform(),
         "daily_trend": daily_trend(7)
@@ -386,144 +462,151 @@ def get_statistics_summary() -> Dict[str, Any]:
 
 
 # ============================================================
-# 数据模型和基础函数
+# 记录存储和记录ID
 # ============================================================
 
+# 全局记录存储（首次使用时创建默认的 SQLite 存储）
+_record_store: Optional[RecordStore] = None
 
-@dataclass
-class PublishRecord:
-    """发布记录数据模型"""
-    # 内容信息
-    title: str
-    topic_id: str  # 选题ID
-    publish_time: datetime
-    
-    # 平台信息
-    platform: str
-    account: str
-    post_url: Optional[str]
-    
-    # 质量信息
-    ai_score: float  # AI味评分
-    word_count: int
-    case_count: int
-    
-    # 追踪信息
-    record_id: str  # 记录ID，格式：PUB-YYYY-MM-DD-NNN
-    status: PostStatus
-    error_message: Optional[str] = None
-    
-    def to_dict(self) -> dict:
-        """转换为字典格式"""
-        data = asdict(self)
-        data['status'] = self.status.value
-        data['publish_time'] = self.publish_time.isoformat()
-        return data
-    
-    def to_entity(self) -> dict:
-        """转换为 MCP Memory 实体格式"""
-        return {
-            "entityType": "PublishRecord",
-            "name": self.record_id,
-            "observations": [
-                f"标题: {self.title}",
-                f"选题ID: {self.topic_id}",
-                f"发布时间: {self.publish_time.strftime('%Y-%m-%d %H:%M:%S')}",
-                f"平台: {self.platform}",
-                f"账号: {self.account}",
-                f"文章链接: {self.post_url or '未生成'}",
-                f"AI味评分: {self.ai_score}",
-                f"字数: {self.word_count}",
-                f"案例数: {self.case_count}",
-                f"状态: {self.status.value}",
-                f"错误信息: {self.error_message or '无'}",
-            ]
-        }
 
+def get_record_store() -> RecordStore:
+    """
+    获取全局记录存储
 
-# 记录ID计数器
-_record_id_counter = 0
+    默认使用 SQLite，数据库路径取环境变量 PUBLISH_TRACKER_DB，
+    未设置时为 data/publish_records.db；设置了环境变量 PUBLISH_TRACKER_JOURNAL 时
+    改用以该文件为预写日志的内存存储（JournaledRecordStore）。
 
+    Returns:
+        RecordStore 实例
+    """
+    if _record_store is None:
+        journal_path = os.environ.get("PUBLISH_TRACKER_JOURNAL")
+        if journal_path:
+            set_record_store(JournaledRecordStore(journal_path))
+        else:
+            set_record_store(
+                SQLiteRecordStore(os.environ.get("PUBLISH_TRACKER_DB", str(DEFAULT_DB_PATH)))
+            )
+    return _record_store
 
-def generate_record_id() -> str:
-    """Generate record ID.
 
-    Format: PUB-YYYY-MM-DD-NNN
+def set_record_store(store: RecordStore) -> None:
+    """
+    替换全局记录存储（如切换为内存存储）
 
-    Returns:
-        Record ID string
+    记录序号由存储维护（续接已有记录），切换后丢弃从旧存储预留的序号。
     """
-    global _record_id_counter
-    now = datetime.now()
-    date_str = now.strftime('%Y-%m-%d')
-    # 使用自增计数器确保唯一性
-    _record_id_counter += 1
-    seq = str(_record_id_counter).zfill(3)
-    return f"PUB-{date_str}-{seq}"
+    global _record_store
+    _record_store = store
+    get_id_allocator().reset()
 
 
-def save_to_memory(record: PublishRecord) -> dict:
-    """Save publish record to MCP Memory.
+def save_record(record: PublishRecord) -> None:
+    """写入一条发布记录到全局记录存储"""
+    save_records([record])
 
-    Args:
-        record: PublishRecord object
 
-    Returns:
-        MCP Memory API response
-    """
-    from mcp__memory__create_entities import mcp__memory__create_entities
-    
-    entity = record.to_entity()
-    result = mcp__memory__create_entities(entities=[entity])
-    
-    # 同时创建关系：内容 -> 已发布到 -> 平台
-    _create_publish_relation(record)
-    
-    return result
+def save_records(records: Iterable[PublishRecord]) -> int:
+    """批量写入发布记录，返回写入条数"""
+    records = list(records)
+    get_record_store().add_many(records)
+    return len(records)
 
 
-def _create_publish_relation(record: PublishRecord) -> None:
-    """Create publish relation: topic -> published to -> platform.
+class RecordIdAllocator:
+    """
+    记录ID分配器
 
-    Args:
-        record: PublishRecord object
+    按日分配序号（PUB-YYYY-MM-DD-NNN，每日从 1 开始），序号由记录存储原子预留，
+    多线程、多进程（共享 SQLite 数据库）下都不会重复。
+
+    每次从存储预留一段序号在本地发放：取号走迭代器（next 在 GIL 下是原子操作，
+    不加锁），只有一段用完时才加锁向存储补充。连续补充间隔很短时段长翻倍（上限
+    max_block），空闲后回到 1，因此短命进程不会浪费序号，高频发布时也很少访问存储。
+    进程退出时未用完的序号会被跳过，ID 可能不连续。
     """
-    from mcp__memory__create_relations import mcp__memory__create_relations
-    
-    relations = [
-        {
-            "from": record.topic_id,
-            "relationType": "已发布到",
-            "to": record.platform
-        },
-        {
-            "from": record.record_id,
-            "relationType": "关联选题",
-            "to": record.topic_id
-        }
-    ]
-    
-    try:
-        mcp__memory__create_relations(relations=relations)
-    except Exception as e:
-        # 关系创建失败不影响主流程，只记录日志
-        print(f"创建关系失败: {e}")
 
+    def __init__(self, max_block: int = 512, burst_window: float = 1.0):
+        """
+        Args:
+            max_block: 单次预留的最大序号个数
+            burst_window: 两次补充间隔小于该秒数时加倍预留
+        """
+        self.max_block = max_block
+        self.burst_window = burst_window
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, Any] = {}
+        self._block_size = 1
+        self._last_refill = 0.0
+
+    def allocate(self, day: Optional[date] = None) -> str:
+        """
+        分配一个记录ID
+
+        Args:
+            day: 记录日期，默认今天
+
+        Returns:
+            记录ID字符串
+        """
+        day_str = (day or datetime.now()).strftime('%Y-%m-%d')
+        block = self._blocks.get(day_str)
+        seq = next(block, None) if block is not None else None
+        if seq is None:
+            seq = self._refill(day_str)
+        return f"PUB-{day_str}-{seq:03d}"
+
+    def _refill(self, day_str: str) -> int:
+        """从存储预留新的一段序号，返回其中第一个"""
+        # 在加锁前取存储：首次使用时 get_record_store 会创建默认存储并调用 reset，
+        # 而 reset 也要获取同一把（不可重入的）锁
+        store = get_record_store()
+        with self._lock:
+            # 等锁期间可能已有其他线程补充
+            block = self._blocks.get(day_str)
+            seq = next(block, None) if block is not None else None
+            if seq is not None:
+                return seq
+            now = monotonic()
+            if now - self._last_refill < self.burst_window:
+                self._block_size = min(self._block_size * 2, self.max_block)
+            else:
+                self._block_size = 1
+            self._last_refill = now
+            first = store.reserve_sequence(day_str, self._block_size)
+            # 只保留当天的序号段，旧日期的段随之丢弃
+            self._blocks = {day_str: iter(range(first + 1, first + self._block_size))}
+            return first
 
-def batch_save_records(records: List[PublishRecord]) -> List[dict]:
-    """Batch save publish records to MCP Memory.
+    def reset(self) -> None:
+        """丢弃本地预留的序号（切换存储时调用）"""
+        with self._lock:
+            self._blocks = {}
+            self._block_size = 1
+            self._last_refill = 0.0
+
+
+# 全局记录ID分配器
+_id_allocator = RecordIdAllocator()
+
+
+def get_id_allocator() -> RecordIdAllocator:
+    """获取全局记录ID分配器"""
+    return _id_allocator
 
-    Args:
-        records: List of PublishRecord objects
+
+def generate_record_id() -> str:
+    """Generate record ID.
+
+    Format: PUB-YYYY-MM-DD-NNN (sequence restarts every day)
 
     Returns:
-        List of save results for each record
+        Record ID string
     """
-    results = []
-    for record in records:
-        result = save_to_memory(record)
-        results.append(result)
-    return results
+    return _id_allocator.allocate()
+
+
 
 
 def create_publish_record(
@@ -575,8 +658,20 @@ def create_publish_record(
 # 初始化测试数据（仅用于演示）
 # ============================================================
 
-def init_demo_data():
-    """初始化演示数据"""
+def init_demo_data(store: Optional[RecordStore] = None) -> int:
+    """
+    初始化演示数据
+
+    演示数据写入单独的存储并设为全局存储，不会混入持久化的发布历史
+    （data/publish_records.db）；之后本进程的查询和看板都基于演示数据。
+
+    Args:
+        store: 演示用的记录存储，默认新建内存存储
+
+    Returns:
+        int: 写入的演示记录数
+    """
+    set_record_store(store if store is not None else MemoryRecordStore())
     # 添加一些测试记录
     demo_records = [
         {
@@ -631,43 +726,47 @@ def init_demo_data():
         }
     ]
 
-    for data in demo_records:
-        record = create_publish_record(**data)
-        _publish_records[record.record_id] = record
+    save_records(create_publish_record(**data) for data in demo_records)
 
     return len(demo_records)
 
 
-def generate_dashboard(days: int = 7) -> str:
+# 看板趋势表标题
+_TREND_TITLES = {"hour": "每小时趋势", "day": "每日趋势", "week": "每周趋势"}
+
+
+def generate_dashboard(days: int = 7, granularity: str = "day") -> str:
     """生成发布数据看板
 
     Args:
         days: 统计天数，默认7天
+        granularity: 趋势分桶粒度（hour / day / week），默认按天
 
     Returns:
         格式化的看板文本
     """
-    # 1. 获取统计数据
-    platform_stats = count_by_platform_detailed()
-    trend = daily_trend_detailed(days)
+    # 1. 获取统计数据（均来自增量聚合，不遍历记录）
+    platform_stats = get_record_store().totals_by_platform(PostStatus.PUBLISHED)
+    trend = publish_time_series(days, granularity=granularity)
     summary = get_statistics_summary()
 
     # 2. 构建平台分布表格
     platform_rows = []
     for platform, stats in sorted(platform_stats.items()):
+        avg_ai_score = round(stats['ai_score_sum'] / stats['count'], 2)
         platform_rows.append(
-            f"| {platform} | {stats['count']} | {stats['total_words']} | {stats['avg_ai_score']} |"
+            f"| {platform} | {stats['count']} | {stats['total_words']} | {avg_ai_score} |"
         )
     platform_table = "\n".join(platform_rows) if platform_rows else "| - | - | - | - |"
 
-    # 3. 构建每日趋势表格
+    # 3. 构建趋势表格
     trend_rows = []
-    for day in trend:
-        platforms_str = ", ".join([f"{p}:{c}" for p, c in day['by_platform'].items()])
+    for bucket in trend:
+        platforms_str = ", ".join([f"{p}:{c}" for p, c in bucket['by_platform'].items()])
         if not platforms_str:
             platforms_str = "-"
         trend_rows.append(
-            f"| {day['date']} | {day['total']} | {platforms_str} |"
+            f"| {bucket['start']} | {bucket['total']} | {platforms_str} |"
         )
     trend_table = "\n".join(trend_rows) if trend_rows else "| - | - | - |"
 
@@ -691,7 +790,7 @@ def generate_dashboard(days: int = 7) -> str:
 |------|--------|--------|------------|
 {platform_table}
 
-## 每日趋势
+## {_TREND_TITLES[granularity]}
 | 日期 | 发布数 | 平台分布 |
 |------|--------|----------|
 {trend_table}
@@ -732,10 +831,16 @@ def main():
         default=7,
         help="统计天数，默认7天"
     )
+    parser.add_argument(
+        "--granularity",
+        choices=GRANULARITIES,
+        default="day",
+        help="趋势分桶粒度，默认按天"
+    )
     parser.add_argument(
         "--init-demo",
         action="store_true",
-        help="初始化演示数据"
+        help="使用演示数据（内存存储，不写入发布历史）"
     )
 
     args = parser.parse_args()
@@ -743,11 +848,11 @@ def main():
     # 初始化演示数据
     if args.init_demo:
         count = init_demo_data()
-        print(f"已初始化 {count} 条演示数据")
+        print(f"已初始化 {count} 条演示数据（内存存储，不写入发布历史）")
 
     # 生成看板
     if args.dashboard:
-        dashboard = generate_dashboard(days=args.days)
+        dashboard = generate_dashboard(days=args.days, granularity=args.granularity)
         print(dashboard)
         return
 
@@ -0,0 +1,672 @@
+"""
+统一发布框架 - HTTP 传输层
+
+所有平台适配器共用的 HTTP 连接池，按主机保持长连接（keep-alive），
+避免每次请求重新建立 TCP 连接和 TLS 握手：
+
+- ConnectionPool: 同步连接池（http.client），线程安全
+- AsyncConnectionPool: 异步连接池（asyncio 流），供原生异步适配器使用
+
+超时和代理取自发布配置（PublishSettings.timeout、ProxyConfig），
+也可以传入 TransportConfig 单独指定。HTTPS 经代理时使用 CONNECT 隧道。
+
+全局实例通过 get_transport / get_async_transport 获取，测试中可用
+set_transport 替换为指向本地假服务器（见 fake_server）的连接池。
+"""
+
+import asyncio
+import atexit
+import http.client
+import json as jsonlib
+import ssl
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+USER_AGENT = "opc-ceo-publisher/1.0"
+
+# 复用的空闲连接被服务器关闭时的异常（可在新连接上重试一次）
+_STALE_ERRORS = (ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+# 幂等方法：请求发出后连接中断也可以在新连接上重发
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+def _can_resend(req: "_Request", sent: bool) -> bool:
+    """
+    复用连接中断后能否自动重发
+
+    发送请求时就失败说明服务器没有收到完整请求；请求已发出后中断时服务器可能
+    已经处理（如发布文章），只有幂等方法可以重发。
+    """
+    return not sent or req.method in _IDEMPOTENT_METHODS
+
+
+class TransportError(Exception):
+    """传输层错误（连接失败、超时、协议错误）"""
+
+
+class ConnectError(TransportError):
+    """建立连接失败（DNS、拒绝连接、TLS、代理隧道），请求尚未发送，重发不会重复提交"""
+
+
+@dataclass
+class TransportConfig:
+    """传输层配置"""
+    timeout: float = 30.0                 # 单次请求超时（秒）
+    proxies: Dict[str, str] = field(default_factory=dict)  # 协议 -> 代理地址，如 {"https": "http://127.0.0.1:7890"}
+    max_idle_per_host: int = 4            # 每个主机保留的空闲连接数
+    idle_timeout: float = 60.0            # 空闲连接的最长保留时间（秒）
+
+    @classmethod
+    def from_publisher_config(cls, config=None) -> "TransportConfig":
+        """
+        从发布配置读取超时和代理
+
+        Args:
+            config: config.publisher.PublisherConfig，默认使用全局配置
+        """
+        if config is None:
+            from config.publisher import get_publisher_config
+            config = get_publisher_config()
+        proxies = {}
+        if config.is_proxy_enabled():
+            proxies = {scheme: url for scheme, url in config.get_proxy().items() if url}
+        return cls(timeout=float(config.get_timeout()), proxies=proxies)
+
+
+@dataclass
+class HttpResponse:
+    """HTTP 响应"""
+    status: int
+    headers: Dict[str, str]               # 小写的头部名 -> 值
+    body: bytes = b""
+    url: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.body or b"null")
+
+
+@dataclass
+class _Request:
+    """规范化后的请求"""
+    method: str
+    url: str
+    scheme: str
+    host: str
+    port: int
+    target: str                           # 请求行中的路径（直连）
+    headers: Dict[str, str]
+    body: Optional[bytes]
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.scheme, self.host, self.port
+
+    @property
+    def authority(self) -> str:
+        default = 443 if self.scheme == "https" else 80
+        return self.host if self.port == default else f"{self.host}:{self.port}"
+
+
+def _prepare(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    json: Any,
+    data: Optional[bytes],
+    headers: Optional[Dict[str, str]],
+) -> _Request:
+    """解析 URL、编码查询参数和请求体、补全默认头部"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise TransportError(f"不支持的 URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    query = parts.query
+    if params:
+        query = f"{query}&{urlencode(params)}" if query else urlencode(params)
+    if query:
+        target = f"{target}?{query}"
+
+    merged = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+    if headers:
+        merged.update(headers)
+    body = data
+    if json is not None:
+        body = jsonlib.dumps(json, ensure_ascii=False).encode("utf-8")
+        merged.setdefault("Content-Type", "application/json; charset=utf-8")
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return _Request(method.upper(), url, scheme, parts.hostname, port, target, merged, body)
+
+
+class Transport(ABC):
+    """同步 HTTP 传输接口"""
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        """
+        发送请求并读取完整响应
+
+        Args:
+            method: HTTP 方法
+            url: 完整 URL
+            params: 查询参数
+            json: JSON 请求体（与 data 二选一）
+            data: 原始请求体
+            headers: 额外的请求头
+            timeout: 本次请求超时（秒），默认取配置
+
+        Returns:
+            HttpResponse: 响应（非 2xx 不抛异常）
+
+        Raises:
+            ConnectError: 建立连接失败时（请求未发送，可以安全重发）
+            TransportError: 请求发送后连接中断、超时或协议错误时（服务端可能已处理）
+        """
+        pass
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """关闭全部连接"""
+
+    def stats(self) -> Dict:
+        return {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncTransport(ABC):
+    """异步 HTTP 传输接口（参数同 Transport.request）"""
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        pass
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """关闭全部连接"""
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class _PoolStats:
+    """连接池计数"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0              # 新建的连接数
+        self.reused = 0                   # 复用空闲连接的请求数
+        self.retries = 0                  # 复用连接失效后的重试次数
+
+    def snapshot(self, idle: int) -> Dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "retries": self.retries,
+            "idle": idle,
+        }
+
+
+def _split_proxy(proxy: str) -> Tuple[str, int]:
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    return parts.hostname or "", parts.port or 80
+
+
+# ============================================================
+# 同步连接池
+# ============================================================
+
+
+class ConnectionPool(Transport):
+    """
+    同步 keep-alive 连接池
+
+    每个 (协议, 主机, 端口) 维护一组空闲连接；请求时优先取用未过期的空闲连接，
+    响应读取完毕且服务器未要求关闭时放回。复用的连接若已被服务器关闭，
+    在新连接上重试一次。
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """
+        Args:
+            config: 传输配置，默认从发布配置读取
+        """
+        self.config = config or TransportConfig.from_publisher_config()
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], Deque[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._stats = _PoolStats()
+
+    def _context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _connect(self, req: _Request, timeout: float) -> http.client.HTTPConnection:
+        """新建连接（经代理时连接代理，HTTPS 建立 CONNECT 隧道）"""
+        proxy = self.config.proxies.get(req.scheme)
+        host, port = _split_proxy(proxy) if proxy else (req.host, req.port)
+        if req.scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._context())
+            if proxy:
+                conn.set_tunnel(req.host, req.port)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        with self._lock:
+            self._stats.connections += 1
+        return conn
+
+    def _acquire(self, req: _Request) -> Optional[http.client.HTTPConnection]:
+        """取出一个未过期的空闲连接"""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(req.key)
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self.config.idle_timeout:
+                    return conn
+                conn.close()
+        return None
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.config.max_idle_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        req = _prepare(method, url, params, json, data, headers)
+        timeout = self.config.timeout if timeout is None else timeout
+        # http 经代理时请求行使用完整 URL
+        proxied = req.scheme == "http" and req.scheme in self.config.proxies
+        target = f"http://{req.authority}{req.target}" if proxied else req.target
+        with self._lock:
+            self._stats.requests += 1
+
+        conn = self._acquire(req)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._connect(req, timeout)
+                try:
+                    conn.connect()
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    raise ConnectError(f"连接失败: {req.method} {url}: {e}") from e
+            elif conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            sent = False
+            try:
+                conn.request(req.method, target, body=req.body, headers=req.headers)
+                sent = True
+                response = conn.getresponse()
+                body = response.read()
+            except _STALE_ERRORS as e:
+                conn.close()
+                if reused and _can_resend(req, sent):
+                    # 空闲连接已被服务器关闭，换新连接重试一次
+                    with self._lock:
+                        self._stats.retries += 1
+                    conn, reused = None, False
+                    continue
+                raise TransportError(f"连接中断: {req.method} {url}: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise TransportError(f"请求失败: {req.method} {url}: {e}") from e
+            break
+
+        if reused:
+            with self._lock:
+                self._stats.reused += 1
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(req.key, conn)
+        return HttpResponse(
+            status=response.status,
+            headers={k.lower(): v for k, v in response.getheaders()},
+            body=body,
+            url=url,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def stats(self) -> Dict:
+        """
+        获取连接池统计
+
+        Returns:
+            Dict: 请求数、新建连接数、复用次数、重试次数和当前空闲连接数
+        """
+        with self._lock:
+            return self._stats.snapshot(sum(len(v) for v in self._idle.values()))
+
+
+# ============================================================
+# 异步连接池
+# ============================================================
+
+
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def _encode_request(req: _Request, target: str) -> bytes:
+    headers = {"Host": req.authority, **req.headers}
+    if req.body is not None or req.method in ("POST", "PUT", "PATCH"):
+        headers["Content-Length"] = str(len(req.body or b""))
+    lines = [f"{req.method} {target} HTTP/1.1"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + (req.body or b"")
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, int, Dict[str, str]]:
+    """读取状态行和头部，返回 (协议版本, 状态码, 头部)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionResetError("服务器关闭了连接")
+    try:
+        version, status = line.decode("latin-1").split(None, 2)[:2]
+        code = int(status)
+    except ValueError:
+        raise TransportError(f"无效的状态行: {line!r}") from None
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return version, code, headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(reader: asyncio.StreamReader, method: str, status: int, headers: Dict[str, str]) -> Tuple[bytes, bool]:
+    """读取响应体，返回 (响应体, 是否读到连接关闭)"""
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return b"", False
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # 跳过 trailer
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks), False
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"])), False
+    return await reader.read(), True
+
+
+class AsyncConnectionPool(AsyncTransport):
+    """
+    异步 keep-alive 连接池（HTTP/1.1）
+
+    语义同 ConnectionPool。空闲连接属于创建它们的事件循环，
+    在另一个事件循环中使用时丢弃旧连接。
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """
+        Args:
+            config: 传输配置，默认从发布配置读取
+        """
+        self.config = config or TransportConfig.from_publisher_config()
+        self._idle: Dict[Tuple[str, str, int], Deque[Tuple[_Stream, float]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._stats = _PoolStats()
+
+    def _context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    async def _connect(self, req: _Request) -> _Stream:
+        """新建连接（经代理时连接代理，HTTPS 建立 CONNECT 隧道）"""
+        proxy = self.config.proxies.get(req.scheme)
+        self._stats.connections += 1
+        if not proxy:
+            ssl_context = self._context() if req.scheme == "https" else None
+            return await asyncio.open_connection(req.host, req.port, ssl=ssl_context)
+        reader, writer = await asyncio.open_connection(*_split_proxy(proxy))
+        if req.scheme == "https":
+            authority = f"{req.host}:{req.port}"
+            writer.write(f"CONNECT {authority} HTTP/1.1\r\nHost: {authority}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            _, status, _ = await _read_head(reader)
+            if status != 200:
+                writer.close()
+                raise TransportError(f"代理隧道建立失败: {status}")
+            await writer.start_tls(self._context(), server_hostname=req.host)
+        return reader, writer
+
+    def _acquire(self, req: _Request) -> Optional[_Stream]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 旧事件循环的连接不可用
+            self._idle.clear()
+            self._loop = loop
+        now = time.monotonic()
+        idle = self._idle.get(req.key)
+        while idle:
+            stream, last_used = idle.pop()
+            if now - last_used <= self.config.idle_timeout and not stream[0].at_eof():
+                return stream
+            stream[1].close()
+        return None
+
+    def _release(self, key: Tuple[str, str, int], stream: _Stream) -> None:
+        idle = self._idle.setdefault(key, deque())
+        if len(idle) < self.config.max_idle_per_host:
+            idle.append((stream, time.monotonic()))
+        else:
+            stream[1].close()
+
+    @staticmethod
+    async def _send(stream: _Stream, req: _Request, target: str) -> None:
+        writer = stream[1]
+        writer.write(_encode_request(req, target))
+        await writer.drain()
+
+    @staticmethod
+    async def _receive(stream: _Stream, req: _Request):
+        reader = stream[0]
+        version, status, headers = await _read_head(reader)
+        body, closed = await _read_body(reader, req.method, status, headers)
+        connection = headers.get("connection", "").lower()
+        keep_alive = not closed and (
+            connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        )
+        return status, headers, body, keep_alive
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> HttpResponse:
+        req = _prepare(method, url, params, json, data, headers)
+        timeout = self.config.timeout if timeout is None else timeout
+        proxied = req.scheme == "http" and req.scheme in self.config.proxies
+        target = f"http://{req.authority}{req.target}" if proxied else req.target
+        self._stats.requests += 1
+
+        stream = self._acquire(req)
+        reused = stream is not None
+        while True:
+            if stream is None:
+                try:
+                    stream = await asyncio.wait_for(self._connect(req), timeout)
+                except asyncio.TimeoutError as e:
+                    raise ConnectError(f"连接超时: {req.method} {url}") from e
+                except (OSError, ValueError, TransportError) as e:
+                    raise ConnectError(f"连接失败: {req.method} {url}: {e}") from e
+            sent = False
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._send(stream, req, target), timeout)
+                sent = True
+                status, resp_headers, body, keep_alive = await asyncio.wait_for(
+                    self._receive(stream, req), max(0.0, started + timeout - time.monotonic())
+                )
+            except (*_STALE_ERRORS, asyncio.IncompleteReadError) as e:
+                stream[1].close()
+                if reused and _can_resend(req, sent):
+                    self._stats.retries += 1
+                    stream, reused = None, False
+                    continue
+                raise TransportError(f"连接中断: {req.method} {url}: {e}") from e
+            except asyncio.TimeoutError as e:
+                stream[1].close()
+                raise TransportError(f"请求超时: {req.method} {url}") from e
+            except (OSError, ValueError) as e:
+                stream[1].close()
+                raise TransportError(f"请求失败: {req.method} {url}: {e}") from e
+            break
+
+        if reused:
+            self._stats.reused += 1
+        if keep_alive:
+            self._release(req.key, stream)
+        else:
+            stream[1].close()
+        return HttpResponse(status=status, headers=resp_headers, body=body, url=url)
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, {}
+        for streams in idle.values():
+            for (_, writer), _ in streams:
+                writer.close()
+
+    def stats(self) -> Dict:
+        """获取连接池统计（字段同 ConnectionPool.stats）"""
+        return self._stats.snapshot(sum(len(v) for v in self._idle.values()))
+
+
+# ============================================================
+# 全局共享实例
+# ============================================================
+
+_transport: Optional[Transport] = None
+_async_transport: Optional[AsyncTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """获取全局同步连接池（首次调用时按发布配置创建）"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = ConnectionPool()
+    return _transport
+
+
+def set_transport(transport: Optional[Transport]) -> None:
+    """替换全局同步连接池（None 表示下次使用时重新创建），旧连接池会被关闭"""
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    if previous is not None and previous is not transport:
+        previous.close()
+
+
+def get_async_transport() -> AsyncTransport:
+    """获取全局异步连接池（首次调用时按发布配置创建）"""
+    global _async_transport
+    if _async_transport is None:
+        with _transport_lock:
+            if _async_transport is None:
+                _async_transport = AsyncConnectionPool()
+    return _async_transport
+
+
+def set_async_transport(transport: Optional[AsyncTransport]) -> None:
+    """替换全局异步连接池（None 表示下次使用时重新创建）"""
+    global _async_transport
+    with _transport_lock:
+        _async_transport = transport
+
+
+def _close_transport() -> None:
+    if _transport is not None:
+        _transport.close()
+
+
+atexit.register(_close_transport)
@@ -5,7 +5,6 @@
 """
 
 import logging
-import re
 from datetime import datetime
 from typing import Optional
 
@@ -17,6 +16,10 @@ from .base import (
     PostStatus,
 )
 from .adapter import BaseAdapter
+from .markdown_renderer import markdown_to_html, render_blocks
+from .preprocess import BodyReplace, FieldStage, PreprocessPipeline
+from .retry import is_retryable_error, is_retryable_status, is_transient_error, is_transient_status
+from .transport import HttpResponse
 
 
 logger = logging.getLogger(__name__)
@@ -29,15 +32,28 @@ class ZhihuAdapter(BaseAdapter):
     实现知乎平台的发布接口
     """
     
-    def __init__(self, cookies: Optional[dict] = None):
+    # 知乎特定的预处理：
+    # - 标题移除末尾的标点符号（知乎风格）
+    # - 标签转为知乎话题标签（最多5个）
+    # - 正文合并多余的空行，确保适当的段落分隔
+    preprocess_pipeline = PreprocessPipeline([
+        FieldStage("title", lambda title: title.rstrip('。！？')),
+        FieldStage("tags", lambda tags: [f"#{tag}#" for tag in tags[:5]]),
+        BodyReplace('\n\n\n', '\n\n'),
+    ])
+    
+    def __init__(self, cookies: Optional[dict] = None, api_base: Optional[str] = None):
         """
         初始化知乎适配器
         
         Args:
             cookies: 可选的 cookies 用于登录
+            api_base: 知乎 API 地址（如 https://www.zhihu.com，测试时为本地假服务器），
+                      为 None 时使用本地模拟，不发送网络请求
         """
         super().__init__()
         self._cookies = cookies or {}
+        self._api_base = api_base.rstrip("/") if api_base else None
         self._headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Referer": "https://www.zhihu.com/",
@@ -95,12 +111,14 @@ class ZhihuAdapter(BaseAdapter):
             # 构建发布数据
             publish_data = self._build_publish_data(content)
             
-            # 调用发布 API（示例，实际需要使用 Playwright 或 API）
-            # response = self._session.post(
-            #     "https://www.zhihu.com/api/v4/articles",
-            #     json=publish_data,
-            #     headers=self._headers
-            # )
+            # 调用发布 API（经共享连接池）
+            if self._api_base:
+                response = self.transport.post(
+                    f"{self._api_base}/api/v4/articles",
+                    json=publish_data,
+                    headers=self._request_headers(),
+                )
+                return self._publish_result(response)
             
             # 示例：模拟成功返回
             post_id = self._generate_post_id()
@@ -117,8 +135,56 @@ class ZhihuAdapter(BaseAdapter):
             logger.exception(f"[{self.platform_name}] 发布失败: {str(e)}")
             return PublishResult.failed_result(
                 f"发布失败: {str(e)}",
-                platform=self.platform
+                platform=self.platform,
+                retryable=is_retryable_error(e),
+                transient=is_transient_error(e),
+            )
+    
+    def _request_headers(self) -> dict:
+        """API 请求头（含登录 cookies）"""
+        headers = dict(self._headers)
+        if self._cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self._cookies.items())
+        return headers
+    
+    def _publish_result(self, response: HttpResponse) -> PublishResult:
+        """解析发布 API 响应"""
+        if not response.ok:
+            logger.error(f"[{self.platform_name}] 发布失败: HTTP {response.status}")
+            return PublishResult.failed_result(
+                f"发布失败: HTTP {response.status} {response.text[:200]}",
+                platform=self.platform,
+                retryable=is_retryable_status(response.status),
+                transient=is_transient_status(response.status),
             )
+        data = response.json() or {}
+        post_id = str(data.get("id", ""))
+        post_url = data.get("url") or f"https://zhuanlan.zhihu.com/p/{post_id}"
+        logger.info(f"[{self.platform_name}] 发布成功: {post_url}")
+        return PublishResult.success_result(
+            post_id=post_id,
+            post_url=post_url,
+            platform=self.platform
+        )
+    
+    def _status_result(self, post_id: str, response: HttpResponse) -> PostStatusResult:
+        """解析文章查询 API 响应"""
+        if not response.ok:
+            return PostStatusResult(
+                status=PostStatus.DELETED if response.status == 404 else PostStatus.FAILED,
+                post_id=post_id,
+            )
+        data = response.json() or {}
+        return PostStatusResult(
+            status=PostStatus.PUBLISHED,
+            post_id=post_id,
+            post_url=data.get("url") or f"https://zhuanlan.zhihu.com/p/{post_id}",
+            view_count=int(data.get("view_count", 0)),
+            like_count=int(data.get("voteup_count", 0)),
+            comment_count=int(data.get("comment_count", 0)),
+            share_count=int(data.get("share_count", 0)),
+            last_update=datetime.now()
+        )
     
     def _build_publish_data(self, content: Content) -> dict:
         """
@@ -131,8 +197,8 @@ class ZhihuAdapter(BaseAdapter):
         - content: 正文（HTML 格式）
         - source_url: 原文链接（转载）
         """
-        # 转换正文为知乎支持的 HTML 格式
-        html_content = self._convert_to_html(content.body)
+        # 转换正文为知乎支持的 HTML 格式（复用 AI 检测时的解析文档）
+        html_content = render_blocks(content.document.blocks)
         
         # 构建发布时间戳
         timestamp = int(datetime.now().timestamp())
@@ -165,58 +231,11 @@ class ZhihuAdapter(BaseAdapter):
         - a
         - blockquote
         - code, pre
-        """
-        # 简单的转换，实际可以使用 markdown 库
-        html = text
         
-        # 转换代码块
-        html = re.sub(
-            r'```(\w+)?\n(.*?)```',
-            r'<pre><code>\2</code></pre>',
-            html,
-            flags=re.DOTALL
-        )
-        
-        # 转换行内代码
-        html = re.sub(
-            r'`([^`]+)`',
-            r'<code>\1</code>',
-            html
-        )
-        
-        # 转换粗体
-        html = re.sub(
-            r'\*\*([^*]+)\*\*',
-            r'<strong>\1</strong>',
-            html
-        )
-        
-        # 转换斜体
-        html = re.sub(
-            r'\*([^*]+)\*',
-            r'<em>\1</em>',
-            html
-        )
-        
-        # 转换链接
-        html = re.sub(
-            r'\[([^\]]+)\]\(([^)]+)\)',
-            r'<a href="\2">\1</a>',
-            html
-        )
-        
-        # 转换图片
-        html = re.sub(
-            r'!\[([^\]]*)\]\(([^)]+)\)',
-            r'<img src="\2" alt="\1"/>',
-            html
-        )
-        
-        # 转换段落
-        paragraphs = html.split('\n\n')
-        html = ''.join(f'<p>{p}</p>' for p in paragraphs if p.strip())
-        
-        return html
+        由单遍扫描的 Markdown 渲染器完成（见 markdown_renderer），
+        代码段内的内容原样保留，不会被当作强调或链接处理。
+        """
+        return markdown_to_html(text)
     
     def _do_get_status(self, post_id: str) -> PostStatusResult:
         """
@@ -225,11 +244,13 @@ class ZhihuAdapter(BaseAdapter):
         可以通过知乎 API 查询文章状态和统计数据
         """
         try:
-            # 示例：调用知乎 API
-            # response = self._session.get(
-            #     f"https://www.zhihu.com/api/v4/articles/{post_id}",
-            #     headers=self._headers
-            # )
+            # 调用知乎 API（经共享连接池）
+            if self._api_base:
+                response = self.transport.get(
+                    f"{self._api_base}/api/v4/articles/{post_id}",
+                    headers=self._request_headers(),
+                )
+                return self._status_result(post_id, response)
             
             # 示例：返回模拟数据
             return PostStatusResult(
@@ -250,38 +271,56 @@ class ZhihuAdapter(BaseAdapter):
                 post_id=post_id,
             )
     
+    # ========== 原生异步实现 ==========
+    # 登录和本地模拟不涉及阻塞 I/O，直接在事件循环中执行，不占用线程池；
+    # 配置了 api_base 时经共享的异步连接池请求 API。
+    
+    async def _ado_login(self) -> bool:
+        """执行知乎登录（异步）"""
+        return self._do_login()
+    
+    async def _ado_publish(self, content: Content) -> PublishResult:
+        """执行知乎发布（异步）"""
+        if not self._api_base:
+            return self._do_publish(content)
+        try:
+            response = await self.async_transport.post(
+                f"{self._api_base}/api/v4/articles",
+                json=self._build_publish_data(content),
+                headers=self._request_headers(),
+            )
+            return self._publish_result(response)
+        except Exception as e:
+            logger.exception(f"[{self.platform_name}] 发布失败: {str(e)}")
+            return PublishResult.failed_result(
+                f"发布失败: {str(e)}",
+                platform=self.platform,
+                retryable=is_retryable_error(e),
+                transient=is_transient_error(e),
+            )
+    
+    async def _ado_get_status(self, post_id: str) -> PostStatusResult:
+        """获取知乎文章状态（异步）"""
+        if not self._api_base:
+            return self._do_get_status(post_id)
+        try:
+            response = await self.async_transport.get(
+                f"{self._api_base}/api/v4/articles/{post_id}",
+                headers=self._request_headers(),
+            )
+            return self._status_result(post_id, response)
+        except Exception as e:
+            logger.exception(f"[{self.platform_name}] 查询状态失败: {str(e)}")
+            return PostStatusResult(
+                status=PostStatus.FAILED,
+                post_id=post_id,
+            )
+    
     def _generate_post_id(self) -> str:
         """生成帖子 ID"""
         import random
         import string
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=12))
-    
-    def preprocess_content(self, content: Content) -> Content:
-        """
-        知乎特定的预处理
-        
-        - 移除可能触发 AI 检测的内容
-        - 添加知乎风格的开头
-        - 处理话题标签
-        """
-        from copy import deepcopy
-        
-        processed = deepcopy(content)
-        
-        # 处理标题：移除过于规整的格式
-        if processed.title:
-            # 移除末尾的标点符号（知乎风格）
-            processed.title = processed.title.rstrip('。！？')
-        
-        # 处理标签：知乎使用话题标签
-        processed.tags = [f"#{tag}#" for tag in processed.tags[:5]]
-        
-        # 处理正文：添加合适的段落分隔
-        if processed.body:
-            # 确保有适当的段落分隔
-            processed.body = processed.body.replace('\n\n\n', '\n\n')
-        
-        return processed
 
 
 class ZhihuCookieManager:
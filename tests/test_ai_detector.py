@@ -11,7 +11,20 @@ import os
 # 添加父目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.ai_detector import AIDetector, DetectionResult, AIDetectionReport
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from scripts import ai_detector
+from scripts.ai_detector import (
+    AIDetector, DetectionResult, AIDetectionReport, KeywordMatcher, MarkerChain,
+    collect_corpus_files, detect_corpus, DetectorRegistry, detect_ai_score, get_detector,
+    DetectionCache,
+)
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content")
 
 
 class TestVocabularyAIDetection(unittest.TestCase):
@@ -51,6 +64,37 @@ class TestVocabularyAIDetection(unittest.TestCase):
         self.assertGreater(len(result.items), 0)
 
 
+class TestKeywordMatcher(unittest.TestCase):
+    """多关键词单遍匹配器测试"""
+    
+    def test_counts_match_findall(self):
+        """计数结果应与逐词 re.findall 一致（含嵌套关键词）"""
+        words = AIDetector.TRANSITION_WORDS
+        matcher = KeywordMatcher.for_words(words)
+        text = "总之可见，另一方面综上所述。一方面，总之，综上。首先首先"
+        counts = matcher.count(text)
+        for word in words:
+            self.assertEqual(counts[word], len(re.findall(word, text)), word)
+    
+    def test_overlapping_positions(self):
+        """可跨越命中边界的关键词也应全部找出"""
+        matcher = KeywordMatcher(["ab", "bc", "abc"])
+        positions = matcher.find_all("abcbc")
+        self.assertEqual(positions, {"ab": [0], "bc": [1, 3], "abc": [0]})
+    
+    def test_matcher_is_cached(self):
+        """同一词表只构建一次"""
+        first = KeywordMatcher.for_words(AIDetector.TRANSITION_WORDS)
+        second = KeywordMatcher.for_words(AIDetector.TRANSITION_WORDS)
+        self.assertIs(first, second)
+    
+    def test_items_keep_word_order(self):
+        """items 按过渡词表顺序输出"""
+        detector = AIDetector()
+        result = detector.detect_vocabulary_ai("同时，首先，同时。另外")
+        self.assertEqual(result.items, ["首先x1", "另外x1", "同时x2"])
+
+
 class TestStructureAIDetection(unittest.TestCase):
     """句式AI化检测测试"""
     
@@ -270,6 +314,249 @@ class TestAIDetectorIntegration(unittest.TestCase):
         self.assertAlmostEqual(report.total_score, expected, places=5)
 
 
+class TestMarkerChain(unittest.TestCase):
+    """有序标记链测试"""
+    
+    SAMPLES = [
+        "首先，做准备。然后，实施。最后，总结。首先，再来。然后，继续。最后",
+        "首先做准备然后实施最后总结",
+        "一方面，快。另一方面，省。另一方面",
+        "第一，甲。第二，乙。第三，丙。第四，丁。第一，戊。第二，己。第三",
+        "首先其次总之首先，其次，最后。首先首先其次",
+    ]
+    
+    def test_counts_match_regex(self):
+        """匹配次数应与回溯正则 findall 一致"""
+        patterns = AIDetector.MECHANICAL_CONNECTORS + [AIDetector.CONTINUOUS_TRANSITION_PATTERN]
+        for pattern in patterns:
+            chain = MarkerChain.from_pattern(pattern)
+            if chain is None:
+                continue
+            regex = re.compile(pattern, re.MULTILINE | re.DOTALL)
+            for text in self.SAMPLES:
+                self.assertEqual(chain.count(text), len(regex.findall(text)), (pattern, text))
+    
+    def test_unsupported_pattern(self):
+        """非标记链模式返回 None"""
+        self.assertIsNone(MarkerChain.from_pattern(AIDetector.MECHANICAL_CONNECTORS[5]))
+        self.assertIsNone(MarkerChain.from_pattern(r"(?:甲|乙乙).*?丙"))
+    
+    def test_pathological_input_is_linear(self):
+        """大量起始标记、缺少收尾标记的长文不应出现回溯卡顿"""
+        detector = AIDetector()
+        text = ("首先，然后，第一，第二，第三，其次，一是，二是，" * 2500)[:50000]
+        start = time.perf_counter()
+        detector.detect(text)
+        detector.detect_expression_ai(text)
+        self.assertLess(time.perf_counter() - start, 5)
+
+
+class TestFusedScanner(unittest.TestCase):
+    """融合扫描引擎测试"""
+    
+    SAMPLES = [
+        "",
+        "首先，我们要做好准备。然后，开始实施。最后，进行总结。",
+        "第一，明确目标。第二，制定计划。第三，执行任务。第四，复盘。",
+        "一是，效率。二是，成本。三是，质量。一方面，快。另一方面，省。",
+        "人工智能的优势在于效率高的优势在于。为了实现目标，我们需要努力。",
+        "通过持续改进，可以实现增长。为了为了，我们需要。数据的重要性可以能够",
+        "# 第一节\n\n# 第二节\n内容\n# 第三节\n\n标题、\n正文一行\n正文二行",
+        "首先收集数据，其次整理，总之可见。首先首先其次最后",
+    ]
+    
+    def setUp(self):
+        self.detector = AIDetector()
+    
+    def test_same_report_as_per_dimension(self):
+        """融合扫描的报告应与逐维度扫描完全一致"""
+        for text in self.SAMPLES:
+            fused = self.detector.detect(text).to_dict()
+            per_dimension = self.detector.detect(text, fused=False).to_dict()
+            self.assertEqual(fused, per_dimension, text)
+    
+    def test_same_report_on_content_corpus(self):
+        """content/ 语料上结果一致"""
+        for dirpath, _, filenames in os.walk(CONTENT_DIR):
+            for name in filenames:
+                if not name.endswith(".md"):
+                    continue
+                with open(os.path.join(dirpath, name), encoding="utf-8") as f:
+                    text = f.read()
+                self.assertEqual(
+                    self.detector.detect(text).to_dict(),
+                    self.detector.detect(text, fused=False).to_dict(),
+                    name,
+                )
+    
+    def test_long_han_run_is_linear(self):
+        """同一长汉字串中大量锚点命中时计数为线性"""
+        start = time.perf_counter()
+        self.detector.detect("可以" * 50000)
+        self.assertLess(time.perf_counter() - start, 2)
+        # 逐维度的正则扫描在长汉字串上本身较慢，用短文本核对结果一致
+        text = "可以" * 200 + "。数据可以，能够可以"
+        self.assertEqual(
+            self.detector.detect(text).to_dict(),
+            self.detector.detect(text, fused=False).to_dict(),
+        )
+    
+    def test_unrecognized_pattern_falls_back(self):
+        """无法由锚点判定的模式回退为正则扫描"""
+        class CustomDetector(AIDetector):
+            PATTERN_SENTENCES = AIDetector.PATTERN_SENTENCES + [
+                (r"(?:非常|特别)[\u4e00-\u9fa5]{1,4}", "非常/特别xxx"),
+            ]
+            MECHANICAL_CONNECTORS = AIDetector.MECHANICAL_CONNECTORS + [
+                r"(?:其一|其二).*?其三",
+            ]
+        
+        detector = CustomDetector()
+        text = "这非常重要，特别关键。其一如此，其二亦然，其三更甚。"
+        self.assertEqual(
+            detector.detect(text).to_dict(),
+            detector.detect(text, fused=False).to_dict(),
+        )
+
+
+class TestCorpusDetection(unittest.TestCase):
+    """批量检测测试"""
+    
+    def test_collect_directory_and_glob(self):
+        """目录与 glob 模式展开后去重"""
+        by_dir = collect_corpus_files([CONTENT_DIR])
+        by_glob = collect_corpus_files([os.path.join(CONTENT_DIR, "**", "*.md"), CONTENT_DIR])
+        self.assertGreater(len(by_dir), 0)
+        self.assertTrue(all(p.endswith(".md") for p in by_dir))
+        self.assertEqual(sorted(map(os.path.normpath, by_dir)), sorted(map(os.path.normpath, by_glob)))
+    
+    def test_parallel_matches_sequential(self):
+        """进程池结果与顺序执行一致"""
+        paths = collect_corpus_files([CONTENT_DIR])
+        sequential = {r["file"]: r for r in detect_corpus(paths, workers=1)}
+        parallel = {r["file"]: r for r in detect_corpus(paths, workers=2)}
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(set(sequential), set(paths))
+    
+    def test_missing_file_reports_error(self):
+        """读取失败的文件输出 error 字段而不中断批量检测"""
+        results = list(detect_corpus(["not-exists.md"], workers=1))
+        self.assertEqual(results[0]["file"], "not-exists.md")
+        self.assertIn("error", results[0])
+
+
+class TestDetectorRegistry(unittest.TestCase):
+    """检测器注册表测试"""
+    
+    def test_reuse_same_config(self):
+        """相同配置复用同一检测器"""
+        registry = DetectorRegistry()
+        first = registry.get()
+        second = registry.get()
+        self.assertIs(first, second)
+        stats = registry.stats()
+        self.assertEqual(stats["builds"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertGreater(stats["build_ms_total"], 0)
+    
+    def test_distinct_configs(self):
+        """阈值或规则集不同时构建不同检测器"""
+        class CustomDetector(AIDetector):
+            TRANSITION_WORDS = AIDetector.TRANSITION_WORDS + ["换句话说"]
+        
+        registry = DetectorRegistry()
+        default = registry.get()
+        self.assertIsNot(default, registry.get(threshold=3))
+        self.assertIsInstance(registry.get(detector_class=CustomDetector), CustomDetector)
+        self.assertEqual(registry.stats()["detectors"], 3)
+    
+    def test_concurrent_get_builds_once(self):
+        """并发获取只构建一次"""
+        registry = DetectorRegistry()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            detectors = list(executor.map(lambda _: registry.get(), range(32)))
+        self.assertTrue(all(d is detectors[0] for d in detectors))
+        self.assertEqual(registry.stats()["builds"], 1)
+    
+    def test_detect_ai_score_uses_shared_detector(self):
+        """便捷函数与共享检测器结果一致"""
+        text = "首先，我们要做好准备。然后，开始实施。最后，进行总结。"
+        self.assertEqual(detect_ai_score(text), get_detector().detect(text).total_score)
+
+
+class TestDetectionCache(unittest.TestCase):
+    """检测结果缓存测试"""
+    
+    TEXT = "首先，我们要做好准备。然后，开始实施。最后，进行总结。"
+    
+    def test_memory_hit(self):
+        """同一文本第二次检测命中内存层"""
+        cache = DetectionCache()
+        detector = get_detector()
+        first = cache.detect(detector, self.TEXT)
+        second = cache.detect(detector, self.TEXT)
+        self.assertIs(first, second)
+        self.assertEqual(first.to_dict(), detector.detect(self.TEXT).to_dict())
+        stats = cache.stats()
+        self.assertEqual((stats["memory_hits"], stats["misses"]), (1, 1))
+    
+    def test_lru_eviction(self):
+        """超过容量时淘汰最久未使用的条目"""
+        cache = DetectionCache(max_entries=2)
+        detector = get_detector()
+        for text in ("甲", "乙", "甲", "丙"):
+            cache.detect(detector, text)
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+        cache.detect(detector, "甲")
+        cache.detect(detector, "乙")
+        stats = cache.stats()
+        self.assertEqual(stats["memory_hits"], 2)
+        self.assertEqual(stats["misses"], 4)
+    
+    def test_rules_version_in_key(self):
+        """规则集或阈值不同则缓存键不同"""
+        class CustomDetector(AIDetector):
+            TRANSITION_WORDS = AIDetector.TRANSITION_WORDS + ["换句话说"]
+        
+        default = get_detector()
+        keys = {
+            DetectionCache.make_key(default, self.TEXT),
+            DetectionCache.make_key(get_detector(threshold=3), self.TEXT),
+            DetectionCache.make_key(get_detector(detector_class=CustomDetector), self.TEXT),
+        }
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(DetectionCache.make_key(default, self.TEXT),
+                         DetectionCache.make_key(AIDetector(), self.TEXT))
+    
+    def test_detector_class_and_jieba_in_key(self):
+        """检测器类、是否使用 jieba 分词不同则缓存键不同"""
+        class OverrideDetector(AIDetector):
+            def detect_originality(self, text):
+                return self._detect_originality_simple(text)
+        
+        default_key = DetectionCache.make_key(AIDetector(), self.TEXT)
+        self.assertNotEqual(DetectionCache.make_key(OverrideDetector(), self.TEXT), default_key)
+        with mock.patch.object(ai_detector, "JIEBA_AVAILABLE", not ai_detector.JIEBA_AVAILABLE):
+            self.assertNotEqual(DetectionCache.make_key(AIDetector(), self.TEXT), default_key)
+    
+    def test_disk_tier_persists(self):
+        """磁盘层跨实例复用，报告无损还原"""
+        detector = get_detector()
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "cache.sqlite3")
+            writer = DetectionCache(db_path=db_path)
+            expected = writer.detect(detector, self.TEXT)
+            writer.close()
+            
+            reader = DetectionCache(db_path=db_path)
+            report = reader.detect(detector, self.TEXT)
+            reader.detect(detector, self.TEXT)
+            reader.close()
+        self.assertEqual(report, expected)
+        stats = reader.stats()
+        self.assertEqual((stats["disk_hits"], stats["memory_hits"], stats["misses"]), (1, 1, 0))
+
+
 class TestAIDetectorEdgeCases(unittest.TestCase):
     """边界情况测试"""
     
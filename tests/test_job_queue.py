@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+持久化发布任务队列测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from scripts.publisher.base import Content, Platform, PlatformPublisher, PublishResult
+from scripts.publisher.job_queue import (
+    JobQueue, JobRunner, JobState, enqueue_content_tree, load_content_tree,
+)
+from scripts.publisher.publisher import UnifiedPublisher, PublisherConfig as UnifiedPublisherConfig
+from scripts.publisher.retry import reset_circuit_breakers
+from scripts.publisher.scheduler import RateLimiter
+from scripts.publisher.zhihu import ZhihuAdapter
+from scripts.publisher.tracker import (
+    MemoryRecordStore, PostStatus as TrackerPostStatus, create_publish_record,
+    get_record_store, set_record_store,
+)
+
+
+def make_content(topic_id, title="测试文章"):
+    return Content(title=title, body="今天去公园散步，看到很多人在放风筝。", topic_id=topic_id, tags=["散步"])
+
+
+class CountingPublisher(PlatformPublisher):
+    """按预设结果发布的测试发布器"""
+
+    def __init__(self, name, outcomes=None):
+        self._name = name
+        self.outcomes = list(outcomes or [])
+        self.published = []
+        self._lock = threading.Lock()
+
+    @property
+    def platform(self):
+        return Platform.CUSTOM
+
+    @property
+    def platform_name(self):
+        return self._name
+
+    def publish(self, content):
+        with self._lock:
+            self.published.append(content.topic_id)
+            if self.outcomes:
+                return self.outcomes.pop(0)
+        return PublishResult.success_result(content.topic_id, f"http://{self._name}.test/{content.topic_id}")
+
+    def get_status(self, post_id):
+        return None
+
+    def login(self):
+        return True
+
+    def is_logged_in(self):
+        return True
+
+
+class TestJobQueue(unittest.TestCase):
+    """任务队列测试"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "jobs.db")
+        self.queue = JobQueue(self.db_path, retry_delay=0)
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def test_enqueue_idempotent(self):
+        """重复入队不新增任务；pending 任务更新内容，已成功的任务不变"""
+        self.assertEqual(self.queue.enqueue(make_content("001"), ["zhihu", "csdn"]), 2)
+        self.assertEqual(self.queue.enqueue(make_content("001", "新标题"), ["zhihu", "csdn"]), 0)
+        self.assertEqual(self.queue.get("001", "zhihu").content.title, "新标题")
+        self.assertEqual(self.queue.get("001", "zhihu").content.tags, ["散步"])
+
+        (job,) = self.queue.lease("w")
+        self.queue.complete(job, "w", PublishResult.success_result("1", "http://x/1"))
+        self.queue.enqueue(make_content("001", "再次修改"), ["zhihu"])
+        job = self.queue.get("001", "zhihu")
+        self.assertEqual((job.state, job.content.title), (JobState.SUCCEEDED, "新标题"))
+        with self.assertRaises(ValueError):
+            self.queue.enqueue(make_content(""), ["zhihu"])
+
+    def test_lease_exclusive_and_persistent(self):
+        self.queue.enqueue(make_content("001"), ["zhihu", "csdn"])
+        self.queue.enqueue(make_content("002"), ["zhihu"])
+        first = self.queue.lease("a", limit=5)
+        self.assertEqual([(j.topic_id, j.platform) for j in first], [("001", "zhihu"), ("001", "csdn")])
+        # 同一平台账号已有任务在发布
+        self.assertEqual(self.queue.lease("b"), [])
+        self.assertTrue(all(j.state is JobState.RUNNING and j.attempts == 1 for j in first))
+
+        reopened = JobQueue(self.db_path)
+        self.assertEqual(reopened.counts(), {"pending": 1, "running": 2, "succeeded": 0, "failed": 0})
+        reopened.close()
+
+    def test_expired_lease_taken_over(self):
+        """领取者崩溃后租约过期，任务被重新领取；原领取者的结果不再记录"""
+        queue = JobQueue(self.db_path, lease_timeout=0.05)
+        queue.enqueue(make_content("001"), ["zhihu"])
+        (stale,) = queue.lease("crashed")
+        time.sleep(0.1)
+        (job,) = queue.lease("survivor")
+        self.assertEqual(job.attempts, 2)
+        self.assertFalse(queue.complete(stale, "crashed", PublishResult.success_result("1", "u")))
+        self.assertTrue(queue.complete(job, "survivor", PublishResult.success_result("2", "u")))
+        self.assertEqual(queue.get("001", "zhihu").post_id, "2")
+        queue.close()
+
+    def test_retryable_failures(self):
+        """可重试的失败重新排队，达到最大尝试次数后记为失败"""
+        self.queue.enqueue(make_content("001"), ["zhihu"])
+        for attempt in range(1, 4):
+            (job,) = self.queue.lease("w")
+            self.assertEqual(job.attempts, attempt)
+            self.queue.complete(job, "w", PublishResult.failed_result("503", retryable=True))
+        job = self.queue.get("001", "zhihu")
+        self.assertEqual((job.state, job.error), (JobState.FAILED, "503"))
+
+        self.assertEqual(self.queue.retry_failed(), 1)
+        self.assertEqual(self.queue.lease("w")[0].attempts, 1)
+
+    def test_release_delays(self):
+        self.queue.enqueue(make_content("001"), ["zhihu"])
+        (job,) = self.queue.lease("w")
+        self.queue.release(job, "w", not_before=time.time() + 60)
+        self.assertEqual(self.queue.lease("w"), [])
+        self.assertEqual(self.queue.get("001", "zhihu").attempts, 0)
+        self.assertGreater(self.queue.next_ready_at(), time.time())
+
+    def test_next_ready_at_includes_running_leases(self):
+        """running 任务的租约到期时间也计入下次可领取时间"""
+        self.assertIsNone(self.queue.next_ready_at())
+        self.queue.enqueue(make_content("001"), ["zhihu"])
+        (job,) = self.queue.lease("w")
+        self.assertAlmostEqual(self.queue.next_ready_at(), job.lease_expires, places=3)
+        self.assertIsNone(self.queue.next_ready_at(["csdn"]))
+        self.queue.complete(job, "w", PublishResult.success_result("1", "u"))
+        self.assertIsNone(self.queue.next_ready_at())
+
+    def test_publish_started_cleared_on_complete(self):
+        self.queue.enqueue(make_content("001"), ["zhihu"])
+        (job,) = self.queue.lease("w")
+        self.assertFalse(self.queue.mark_publishing(job, "other"))
+        self.assertTrue(self.queue.mark_publishing(job, "w"))
+        self.assertGreater(self.queue.get("001", "zhihu").publish_started, 0)
+        self.queue.complete(job, "w", PublishResult.failed_result("403"))
+        self.assertEqual(self.queue.get("001", "zhihu").publish_started, 0)
+
+    def test_old_database_upgraded(self):
+        """旧版本创建的数据库（没有 publish_started 列）打开时补齐"""
+        self.queue.close()
+        path = os.path.join(self.tmp.name, "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(JobQueue.SCHEMA.replace("publish_started REAL NOT NULL DEFAULT 0,", ""))
+        conn.close()
+        self.queue = JobQueue(path)
+        self.queue.enqueue(make_content("001"), ["zhihu"])
+        self.assertEqual(self.queue.lease("w")[0].publish_started, 0)
+
+
+class TestJobRunner(unittest.TestCase):
+    """任务执行器测试"""
+
+    def setUp(self):
+        reset_circuit_breakers()
+        self.previous_store = get_record_store()
+        set_record_store(MemoryRecordStore())
+        self.queue = JobQueue(retry_delay=0)
+        self.publisher = UnifiedPublisher(UnifiedPublisherConfig(
+            enable_ai_detection=False, enable_auto_track=False
+        ))
+
+    def tearDown(self):
+        self.queue.close()
+        set_record_store(self.previous_store)
+
+    def register(self, name, outcomes=None):
+        publisher = CountingPublisher(name, outcomes)
+        self.publisher.register_publisher(publisher)
+        return publisher
+
+    def test_drain_with_interval(self):
+        """各平台按间隔发布，全部完成后退出"""
+        platforms = [self.register("a"), self.register("b")]
+        for i in range(3):
+            self.queue.enqueue(make_content(f"00{i}"), ["a", "b"])
+        runner = JobRunner(self.queue, self.publisher, workers=3, limiter=RateLimiter(0.1), poll_interval=0.05)
+        stats = runner.run()
+        self.assertEqual(stats["succeeded"], 6)
+        self.assertGreater(stats["throttled"], 0)
+        self.assertEqual(self.queue.counts()["succeeded"], 6)
+        for publisher in platforms:
+            self.assertEqual(publisher.published, ["000", "001", "002"])
+
+        # 再次运行不会重复发布
+        self.assertEqual(JobRunner(self.queue, self.publisher, limiter=RateLimiter(0)).run()["succeeded"], 0)
+        self.assertEqual(len(platforms[0].published), 3)
+
+    def test_failures(self):
+        self.register("a", [PublishResult.failed_result("503", retryable=True)])
+        self.register("b", [PublishResult.failed_result("403")])
+        self.queue.enqueue(make_content("001"), ["a", "b", "missing"])
+        runner = JobRunner(self.queue, self.publisher, workers=1, limiter=RateLimiter(0))
+        stats = runner.run()
+        self.assertEqual((stats["succeeded"], stats["failed"], stats["requeued"]), (1, 1, 1))
+        self.assertEqual(self.queue.get("001", "a").attempts, 2)
+        # 未注册发布器的平台不领取，保持 pending
+        missing = self.queue.get("001", "missing")
+        self.assertEqual((missing.state, missing.attempts), (JobState.PENDING, 0))
+        self.assertEqual(runner.unsupported_platforms(), ["missing"])
+
+    def test_crash_recovery_does_not_republish(self):
+        """崩溃前已发布（发布记录已存在）的任务重新领取时直接补记成功"""
+        publisher = self.register("a")
+        queue = JobQueue(lease_timeout=0.01)
+        queue.enqueue(make_content("001"), ["a"])
+        queue.enqueue(make_content("002"), ["a"])
+        queue.lease("crashed", limit=2)
+        get_record_store().add(create_publish_record(
+            title="测试文章", topic_id="001", platform="a", account="CEO思考者", ai_score=0, word_count=18, case_count=0,
+            post_url="http://a.test/001", status=TrackerPostStatus.PUBLISHED,
+        ))
+        time.sleep(0.05)
+        stats = JobRunner(queue, self.publisher, workers=1, limiter=RateLimiter(0)).run()
+        self.assertEqual((stats["reconciled"], stats["succeeded"]), (1, 1))
+        self.assertEqual(publisher.published, ["002"])
+        reconciled = queue.get("001", "a")
+        self.assertEqual((reconciled.post_id, reconciled.post_url), ("", "http://a.test/001"))
+        queue.close()
+
+    def test_drain_waits_for_crashed_lease(self):
+        """其他领取者崩溃遗留的 running 任务在租约过期后接手发布，之后才退出"""
+        publisher = self.register("a")
+        queue = JobQueue(lease_timeout=0.2)
+        queue.enqueue(make_content("001"), ["a"])
+        queue.lease("crashed")
+        stats = JobRunner(queue, self.publisher, workers=1, limiter=RateLimiter(0), poll_interval=0.05).run()
+        self.assertEqual(stats["succeeded"], 1)
+        self.assertEqual(publisher.published, ["001"])
+        self.assertEqual(queue.get("001", "a").state, JobState.SUCCEEDED)
+        queue.close()
+
+    def test_interrupted_publish_not_repeated(self):
+        """发布过程中崩溃且没有发布记录（未开启自动追踪）的任务不自动重发，记为失败待核实"""
+        publisher = self.register("a")
+        queue = JobQueue(lease_timeout=0.01)
+        queue.enqueue(make_content("001"), ["a"])
+        (job,) = queue.lease("crashed")
+        queue.mark_publishing(job, "crashed")
+        time.sleep(0.05)
+        stats = JobRunner(queue, self.publisher, workers=1, limiter=RateLimiter(0)).run()
+        self.assertEqual((stats["interrupted"], stats["succeeded"]), (1, 0))
+        self.assertEqual(publisher.published, [])
+        job = queue.get("001", "a")
+        self.assertEqual(job.state, JobState.FAILED)
+        self.assertIn("核实", job.error)
+
+        # 人工核实后重新发布
+        self.assertEqual(queue.retry_failed(), 1)
+        JobRunner(queue, self.publisher, workers=1, limiter=RateLimiter(0)).run()
+        self.assertEqual(publisher.published, ["001"])
+        queue.close()
+
+    def test_platform_key_resolves_adapter(self):
+        """按平台枚举值（内容目录名）入队的任务由按显示名称注册的适配器发布"""
+        publisher = UnifiedPublisher(UnifiedPublisherConfig())
+        publisher.register_publisher(ZhihuAdapter())
+        self.assertIsInstance(publisher.get_publisher("zhihu"), ZhihuAdapter)
+        self.assertIsNone(publisher.get_publisher("custom"))
+        self.assertIsNone(publisher.get_publisher("csdn"))
+
+
+class TestEndToEnd(unittest.TestCase):
+    """新进程中端到端运行（不预先设置记录存储，启用自动采集）"""
+
+    SCRIPT = """
+import sys
+from scripts.publisher.base import Content
+from scripts.publisher.fake_server import FakeServer
+from scripts.publisher.job_queue import JobQueue, JobRunner
+from scripts.publisher.publisher import UnifiedPublisher, PublisherConfig
+from scripts.publisher.scheduler import RateLimiter
+from scripts.publisher.tracker import query_by_topic_id
+from scripts.publisher.zhihu import ZhihuAdapter
+
+with FakeServer() as server:
+    server.route("POST", "/api/v4/articles", lambda r: (200, {"id": 42}))
+    publisher = UnifiedPublisher(PublisherConfig(enable_ai_detection=False))
+    publisher.register_publisher(ZhihuAdapter(cookies={"z_c0": "token"}, api_base=server.url))
+    queue = JobQueue(sys.argv[1])
+    queue.enqueue(Content(title="测试文章", body="今天去公园散步。" * 20, topic_id="011"), ["zhihu", "csdn"])
+    stats = JobRunner(queue, publisher, workers=2, limiter=RateLimiter(0), poll_interval=0.05).run()
+    print(stats["succeeded"], queue.counts()["pending"], len(query_by_topic_id("011")))
+"""
+
+    def test_drain_with_auto_track(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, PUBLISH_TRACKER_DB=os.path.join(tmp, "records.db"))
+            env.pop("PUBLISH_TRACKER_JOURNAL", None)
+            output = subprocess.run(
+                [sys.executable, "-c", self.SCRIPT, os.path.join(tmp, "jobs.db")],
+                cwd=root, env=env, capture_output=True, text=True, timeout=60,
+            )
+        self.assertEqual(output.returncode, 0, output.stderr)
+        # 后台知识图谱写入也会输出日志，只检查结果行
+        self.assertIn("1 1 1", output.stdout.splitlines(), output.stdout)
+
+
+class TestContentTree(unittest.TestCase):
+    """内容仓库入队测试"""
+
+    def test_enqueue_content_tree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for topic, platform, text in [
+                ("011-MCP是什么", "csdn", "# 一文讲清 MCP\n\n> 导语\n\n正文"),
+                ("011-MCP是什么", "xiaohongshu", "没有标题的正文"),
+                ("草稿", "csdn", "# 草稿标题\n正文"),
+            ]:
+                (root / topic / platform).mkdir(parents=True)
+                (root / topic / platform / "文章.md").write_text(text, encoding="utf-8")
+            (root / "README.md").write_text("# 内容仓库", encoding="utf-8")
+
+            articles = load_content_tree(root)
+            self.assertEqual(
+                [(p, c.topic_id, c.title) for p, c, _ in articles],
+                [("csdn", "011", "一文讲清 MCP"), ("xiaohongshu", "011", "011-MCP是什么"), ("csdn", "草稿", "草稿标题")],
+            )
+            self.assertEqual(articles[0][1].body, "> 导语\n\n正文")
+
+            queue = JobQueue()
+            self.assertEqual(enqueue_content_tree(queue, root, platforms=["csdn"]), 2)
+            self.assertEqual(enqueue_content_tree(queue, root), 1)
+            self.assertEqual(enqueue_content_tree(queue, root), 0)
+            self.assertTrue(queue.get("011", "csdn").source.endswith("文章.md"))
+            queue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享 Markdown 文档测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest import mock
+
+from scripts import markdown_document
+from scripts.markdown_document import DocumentCache, get_document_cache, set_document_cache, parse_document
+from scripts.ai_detector import AIDetector, DetectionCache
+from scripts.publisher.base import Content
+from scripts.publisher.zhihu import ZhihuAdapter
+
+
+BODY = """# 时间管理
+
+作为一人公司的CEO，时间是最稀缺的资源。时间是最稀缺的资源！
+
+> ## 引用标题
+> 引用段落
+
+- 优先级排序
+- 批量处理
+"""
+
+
+class TestParsedDocument(unittest.TestCase):
+    """文档字段测试"""
+
+    def test_fields(self):
+        document = DocumentCache().get(BODY)
+        self.assertEqual(document.lines, BODY.split("\n"))
+        self.assertEqual(document.headings, [(1, "时间管理"), (2, "引用标题")])
+        self.assertEqual(document.paragraphs, [
+            "作为一人公司的CEO，时间是最稀缺的资源。时间是最稀缺的资源！",
+            "引用段落",
+        ])
+        self.assertEqual(document.sentences[1], "时间是最稀缺的资源")
+        self.assertNotIn(" ", document.compact)
+
+    def test_memo(self):
+        document = DocumentCache().get(BODY)
+        compute = mock.Mock(return_value=[1])
+        self.assertEqual(document.memo("key", compute), [1])
+        self.assertEqual(document.memo("key", compute), [1])
+        compute.assert_called_once()
+
+
+class TestDocumentCache(unittest.TestCase):
+    """文档缓存测试"""
+
+    def test_shared_by_content_hash(self):
+        cache = DocumentCache(max_entries=2)
+        first = cache.get("正文")
+        self.assertIs(cache.get("".join(["正", "文"])), first)
+        cache.get("b")
+        cache.get("c")
+        self.assertIsNot(cache.get("正文"), first)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["documents"], 2)
+
+
+class TestSharedParse(unittest.TestCase):
+    """检测与发布共用一次解析"""
+
+    def setUp(self):
+        self._previous = get_document_cache()
+        set_document_cache(DocumentCache())
+
+    def tearDown(self):
+        set_document_cache(self._previous)
+
+    def test_detect_then_publish(self):
+        """检测时完成的解析在发布转换时复用，块级解析只执行一次"""
+        content = Content(title="时间管理", body=BODY)
+        with mock.patch.object(
+            markdown_document, "parse_blocks", wraps=markdown_document.parse_blocks
+        ) as parse_blocks:
+            DetectionCache().detect(AIDetector(), content.body)
+            self.assertIs(content.document, parse_document(BODY))
+
+            adapter = ZhihuAdapter(cookies={"z_c0": "token"})
+            data = adapter._build_publish_data(adapter.preprocess_content(content))
+            self.assertEqual(data["content"], adapter._convert_to_html(BODY))
+            # 引用块内部的递归解析除外，正文只解析一次
+            self.assertEqual([c.args[0] for c in parse_blocks.call_args_list].count(BODY), 1)
+        self.assertEqual(get_document_cache().stats()["misses"], 1)
+
+    def test_detection_unchanged(self):
+        """融合与逐维度检测使用同一文档，结果一致"""
+        detector = AIDetector()
+        self.assertEqual(
+            detector.detect(BODY).to_dict(),
+            detector.detect(BODY, fused=False).to_dict(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
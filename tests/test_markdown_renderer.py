@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown 渲染器测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from scripts.publisher.markdown_renderer import (
+    MAX_INLINE_NESTING, markdown_to_html, parse_blocks, render_inline,
+)
+from scripts.publisher.zhihu import ZhihuAdapter
+
+
+class TestBlocks(unittest.TestCase):
+    """块级元素测试"""
+
+    def test_headings_and_paragraphs(self):
+        html = markdown_to_html("# 标题\n\n第一段\n续行\n\n## 小节 ##\n第二段")
+        self.assertEqual(
+            html,
+            "<h1>标题</h1><p>第一段\n续行</p><h2>小节</h2><p>第二段</p>",
+        )
+
+    def test_empty_input(self):
+        self.assertEqual(markdown_to_html(""), "")
+        self.assertEqual(markdown_to_html("  \n\n \t "), "")
+
+    def test_hard_break(self):
+        self.assertEqual(markdown_to_html("第一行  \n第二行"), "<p>第一行<br/>\n第二行</p>")
+        self.assertEqual(markdown_to_html("第一行\\\n第二行"), "<p>第一行<br/>\n第二行</p>")
+
+    def test_fenced_code(self):
+        """代码块内容原样转义，不解析强调；未闭合时延续到文末"""
+        html = markdown_to_html("```python\nx = a * b * c\nif a < b: **y**\n```\n后文")
+        self.assertEqual(
+            html,
+            "<pre><code>x = a * b * c\nif a &lt; b: **y**</code></pre><p>后文</p>",
+        )
+        self.assertEqual(parse_blocks("```js\nlet a")[0].lang, "js")
+        self.assertEqual(markdown_to_html("~~~\n# 不是标题"), "<pre><code># 不是标题</code></pre>")
+
+    def test_lists(self):
+        html = markdown_to_html("- 一\n- 二\n  续行\n1. 甲\n2. 乙\n\n* 丙")
+        self.assertEqual(
+            html,
+            "<ul><li>一</li><li>二\n续行</li></ul><ol><li>甲</li><li>乙</li></ol><ul><li>丙</li></ul>",
+        )
+
+    def test_ordered_number_in_paragraph(self):
+        """段落中以非 1 数字开头的行不打断段落"""
+        self.assertEqual(markdown_to_html("今年\n2024. 年"), "<p>今年\n2024. 年</p>")
+        self.assertEqual(markdown_to_html("段落\n1. 列表"), "<p>段落</p><ol><li>列表</li></ol>")
+
+    def test_blockquote(self):
+        html = markdown_to_html("> 引用 **重点**\n> - 条目\n\n正文")
+        self.assertEqual(
+            html,
+            "<blockquote><p>引用 <strong>重点</strong></p><ul><li>条目</li></ul></blockquote><p>正文</p>",
+        )
+
+
+class TestInline(unittest.TestCase):
+    """行内元素测试"""
+
+    def test_code_span(self):
+        """代码段中的星号和尖括号不被解析"""
+        self.assertEqual(render_inline("用 `a*b*c <x>` 计算"), "用 <code>a*b*c &lt;x&gt;</code> 计算")
+        self.assertEqual(render_inline("``a ` b``"), "<code>a ` b</code>")
+        self.assertEqual(render_inline("未闭合 `code"), "未闭合 `code")
+
+    def test_emphasis(self):
+        self.assertEqual(render_inline("**加粗**和*斜体*"), "<strong>加粗</strong>和<em>斜体</em>")
+        self.assertEqual(render_inline("**外 *内* 外**"), "<strong>外 <em>内</em> 外</strong>")
+        self.assertEqual(render_inline("*外 **内** 外*"), "<em>外 <strong>内</strong> 外</em>")
+        self.assertEqual(render_inline("***都有***"), "<strong><em>都有</em></strong>")
+        self.assertEqual(render_inline("**含 `*` 的代码**"), "<strong>含 <code>*</code> 的代码</strong>")
+        self.assertEqual(render_inline("2 * 3 = 6"), "2 * 3 = 6")
+
+    def test_links_and_images(self):
+        self.assertEqual(
+            render_inline("[**官网**](https://a.com/?x=1&y=2 \"标题\")"),
+            '<a href="https://a.com/?x=1&amp;y=2"><strong>官网</strong></a>',
+        )
+        self.assertEqual(
+            render_inline("![图 \"1\"](img.png)"),
+            '<img src="img.png" alt="图 &quot;1&quot;"/>',
+        )
+        self.assertEqual(render_inline("[不是链接] (x)"), "[不是链接] (x)")
+        self.assertEqual(render_inline("[[a](x)"), '[<a href="x">a</a>')
+        self.assertEqual(render_inline("[a] [b](y)"), '[a] <a href="y">b</a>')
+
+    def test_unclosed_brackets_are_linear(self):
+        """大量未闭合的方括号、缺少 ")" 的链接不应出现二次方耗时"""
+        for text in ("[a " * 20000, "[" * 20000, "[a](" * 20000, "![[" * 20000):
+            start = time.perf_counter()
+            self.assertEqual(render_inline(text), text)
+            self.assertLess(time.perf_counter() - start, 2, text[:8])
+
+    def test_deeply_nested_links(self):
+        """深层嵌套的链接、强调不超出递归深度，超过层数上限的内层按文本输出"""
+        for depth in (600, 1200):
+            text = "[" * depth + "a" + "](x)" * depth
+            start = time.perf_counter()
+            html = render_inline(text)
+            self.assertLess(time.perf_counter() - start, 2)
+            self.assertEqual(html.count("<a "), MAX_INLINE_NESTING)
+        self.assertLessEqual(render_inline("*" * 3000 + "a" + "*" * 3000).count("<em>"), MAX_INLINE_NESTING)
+        self.assertIn("<p>", markdown_to_html("[" * 1200 + "a" + "](x)" * 1200))
+        nested = "[" * 3 + "a" + "](x)" * 3
+        self.assertEqual(render_inline(nested), '<a href="x"><a href="x"><a href="x">a</a></a></a>')
+
+    def test_escapes(self):
+        self.assertEqual(render_inline("\\*不是斜体\\*"), "*不是斜体*")
+        self.assertEqual(render_inline("<script>&"), "&lt;script&gt;&amp;")
+        self.assertEqual(render_inline("路径 C:\\dir"), "路径 C:\\dir")
+
+
+class TestZhihuConversion(unittest.TestCase):
+    """知乎适配器使用渲染器"""
+
+    def test_convert_to_html(self):
+        adapter = ZhihuAdapter(cookies={"z_c0": "token"})
+        text = "# 标题\n\n正文 `*x*`"
+        self.assertEqual(adapter._convert_to_html(text), markdown_to_html(text))
+        self.assertEqual(
+            adapter._convert_to_html(text),
+            "<h1>标题</h1><p>正文 <code>*x*</code></p>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
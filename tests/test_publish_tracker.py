@@ -0,0 +1,724 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布追踪器测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from unittest import mock
+from datetime import datetime, timedelta
+
+from scripts.publisher import tracker
+from scripts.publisher.tracker import (
+    PostStatus, PublishRecord, MemoryRecordStore, SQLiteRecordStore, JournaledRecordStore,
+    ColumnarRecordStore,
+    set_record_store, save_records,
+    query_by_platform, query_by_topic_id, query_by_date_range, query_by_date,
+    query_all_published, query_failed,
+    count_by_platform, count_by_platform_detailed, daily_trend, daily_trend_detailed,
+    get_statistics_summary, generate_record_id, publish_time_series, bucket_start,
+    generate_dashboard, LocalMemoryServer, get_memory_client, set_memory_client,
+    save_to_memory, save_records_to_memory, batch_save_records, MemoryWriteQueue,
+)
+
+
+def make_record(seq, platform="知乎", topic_id="TOPIC-1", days_ago=0,
+                status=PostStatus.PUBLISHED, ai_score=0.1, word_count=1000, case_count=1):
+    """构造测试记录"""
+    publish_time = datetime.now().replace(microsecond=0) - timedelta(days=days_ago, seconds=seq)
+    return PublishRecord(
+        title=f"文章{seq}",
+        topic_id=topic_id,
+        publish_time=publish_time,
+        platform=platform,
+        account="CEO思考者",
+        post_url=f"https://example.com/{seq}",
+        ai_score=ai_score,
+        word_count=word_count,
+        case_count=case_count,
+        record_id=f"PUB-{publish_time:%Y-%m-%d}-{seq:03d}",
+        status=status,
+    )
+
+
+def make_sample():
+    """构造一组覆盖多平台、多日期、多状态的记录"""
+    return [
+        make_record(1, "知乎", "TOPIC-1", 0, ai_score=0.1, word_count=1000, case_count=1),
+        make_record(2, "知乎", "TOPIC-2", 1, ai_score=0.3, word_count=2000, case_count=2),
+        make_record(3, "简书", "TOPIC-1", 2, ai_score=0.2, word_count=1500, case_count=0),
+        make_record(4, "CSDN", "TOPIC-3", 10, ai_score=0.4, word_count=3000, case_count=3),
+        make_record(5, "知乎", "TOPIC-3", 0, status=PostStatus.FAILED),
+    ]
+
+
+class StoreContractMixin:
+    """记录存储接口的公共测试（内存与 SQLite 实现行为一致）"""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self._previous = tracker._record_store
+        self.store = self.make_store()
+        set_record_store(self.store)
+        self.sample = make_sample()
+        save_records(self.sample)
+
+    def tearDown(self):
+        tracker._record_store = self._previous
+
+    def ids(self, records):
+        return sorted(r.record_id for r in records)
+
+    def test_record_has_slots(self):
+        """记录类型使用 __slots__，to_dict 可还原"""
+        record = self.sample[0]
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(PublishRecord.from_dict(record.to_dict()), record)
+
+    def test_get_roundtrip(self):
+        """按ID读取记录与写入一致"""
+        self.assertEqual(self.store.get(self.sample[1].record_id), self.sample[1])
+        self.assertIsNone(self.store.get("PUB-0000-00-00-000"))
+
+    def test_queries(self):
+        """按平台、选题、状态查询"""
+        self.assertEqual(self.ids(query_by_platform("知乎")), self.ids(self.sample[:2]))
+        self.assertEqual(self.ids(query_by_topic_id("TOPIC-3")), self.ids([self.sample[3], self.sample[4]]))
+        self.assertEqual(len(query_all_published()), 4)
+        self.assertEqual(self.ids(query_failed()), [self.sample[4].record_id])
+
+    def test_date_queries(self):
+        """按日期范围查询（左闭右开，结果按时间升序）"""
+        records = query_by_date_range(datetime.now() - timedelta(days=3), datetime.now())
+        self.assertEqual(self.ids(records), self.ids(self.sample[:3]))
+        self.assertEqual([r.publish_time for r in records],
+                         sorted(r.publish_time for r in records))
+        self.assertEqual(self.ids(query_by_date(self.sample[3].publish_time)), [self.sample[3].record_id])
+
+    def test_statistics(self):
+        """统计结果"""
+        self.assertEqual(count_by_platform(), {"知乎": 2, "简书": 1, "CSDN": 1})
+        detailed = count_by_platform_detailed()
+        self.assertEqual(detailed["知乎"]["total_words"], 3000)
+        self.assertEqual(detailed["知乎"]["avg_ai_score"], 0.2)
+        self.assertEqual(sorted(detailed["知乎"]["records"]), self.ids(self.sample[:2]))
+
+        summary = get_statistics_summary()
+        self.assertEqual(summary["total_published"], 4)
+        self.assertEqual(summary["total_failed"], 1)
+        self.assertEqual(summary["total_words"], 7500)
+        self.assertEqual(summary["avg_ai_score"], 0.25)
+
+    def test_trends(self):
+        """每日趋势只统计窗口内的已发布记录"""
+        trend = daily_trend(7)
+        self.assertEqual(len(trend), 8)
+        self.assertEqual(sum(trend.values()), 3)
+        detailed = daily_trend_detailed(7)
+        self.assertEqual([d["total"] for d in detailed], list(trend.values()))
+        today = detailed[-1]
+        self.assertEqual(today["by_platform"], {"知乎": 1})
+
+    def test_time_series(self):
+        """各粒度分桶：聚合路径与逐条分桶路径结果一致"""
+        for granularity, days in (("day", 30), ("week", 30), ("hour", 2)):
+            series = publish_time_series(days, granularity)
+            detailed = publish_time_series(days, granularity, include_records=True)
+            self.assertEqual(
+                [(b["start"], b["total"], b["by_platform"]) for b in series],
+                [(b["start"], b["total"], b["by_platform"]) for b in detailed],
+            )
+            self.assertEqual(sum(b["total"] for b in series), len(query_by_date_range(
+                bucket_start(datetime.now() - timedelta(days=days), granularity), datetime.now()
+            )))
+        weeks = publish_time_series(30, "week")
+        self.assertTrue(all(
+            datetime.strptime(b["start"], "%Y-%m-%d").weekday() == 0 for b in weeks
+        ))
+        self.assertEqual(len(publish_time_series(1, "hour")), 25)
+        with self.assertRaises(ValueError):
+            publish_time_series(7, "month")
+        self.assertIn("每周趋势", generate_dashboard(30, granularity="week"))
+
+    def test_update_status(self):
+        """状态更新后统计随之变化"""
+        self.assertTrue(self.store.update_status(self.sample[4].record_id, PostStatus.PUBLISHED))
+        self.assertEqual(count_by_platform()["知乎"], 3)
+        self.assertFalse(self.store.update_status("PUB-0000-00-00-000", PostStatus.FAILED))
+
+    def assert_aggregates_consistent(self):
+        """增量聚合与按记录重新计算的结果一致"""
+        for status in PostStatus:
+            records = self.store.query(status=status)
+            expected_platforms = {}
+            expected_days = {}
+            for r in records:
+                for key, bucket in ((r.platform, expected_platforms),
+                                    (r.publish_time.strftime("%Y-%m-%d"), expected_days)):
+                    totals = bucket.setdefault(key, [0, 0, 0, 0.0])
+                    totals[0] += 1
+                    totals[1] += r.word_count
+                    totals[2] += r.case_count
+                    totals[3] += r.ai_score
+            for actual, expected in ((self.store.totals_by_platform(status), expected_platforms),
+                                     (self.store.totals_by_day(status), expected_days)):
+                self.assertEqual(sorted(actual), sorted(expected))
+                for key, totals in expected.items():
+                    got = actual[key]
+                    self.assertEqual([got["count"], got["total_words"], got["total_cases"]], totals[:3])
+                    self.assertAlmostEqual(got["ai_score_sum"], totals[3])
+            self.assertEqual(self.store.totals(status)["count"], len(records))
+
+    def test_aggregates_track_changes(self):
+        """写入、覆盖、状态变更后增量聚合保持一致"""
+        self.assert_aggregates_consistent()
+        moved = make_record(2, "CSDN", "TOPIC-2", 5, ai_score=0.9, word_count=10, case_count=0)
+        moved.record_id = self.sample[1].record_id
+        self.store.add(moved)
+        self.store.update_status(self.sample[0].record_id, PostStatus.FAILED, "下线")
+        self.store.add(make_record(9, "掘金", "TOPIC-9", 3))
+        self.assert_aggregates_consistent()
+
+        first_day = datetime.now().date() - timedelta(days=3)
+        days = self.store.totals_by_day(PostStatus.PUBLISHED, first_day, datetime.now().date())
+        self.assertEqual(list(days), [(first_day + timedelta(days=n)).strftime("%Y-%m-%d") for n in (0, 1)])
+
+    def test_id_counter_continues(self):
+        """记录ID计数器续接存储中的最大序号"""
+        seq = int(generate_record_id().rsplit("-", 1)[1])
+        self.assertGreater(seq, 5)
+
+    def test_sequences_per_day(self):
+        """序号按日独立，预留区间连续且不重叠"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        other = (datetime.now() - timedelta(days=10)).strftime("%Y-%m-%d")
+        self.assertEqual(self.store.max_sequence(today), 5)
+        self.assertEqual(self.store.max_sequence(other), 4)
+        self.assertEqual(self.store.max_sequence("2000-01-01"), 0)
+        self.assertEqual(self.store.reserve_sequence(today, 3), 6)
+        self.assertEqual(self.store.reserve_sequence(today), 9)
+        self.assertEqual(self.store.reserve_sequence("2000-01-01"), 1)
+
+        # 导入的带ID记录推进当日序号
+        self.store.add(make_record(50))
+        self.assertEqual(self.store.reserve_sequence(today), 51)
+
+    def test_allocator_threads(self):
+        """多线程并发分配不重复"""
+        allocated = []
+
+        def worker():
+            allocated.extend(generate_record_id() for _ in range(500))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(allocated)), 4000)
+        self.assertTrue(all(len(rid.split("-")) == 5 for rid in allocated))
+
+
+class TestMemoryRecordStore(StoreContractMixin, unittest.TestCase):
+    """内存记录存储测试"""
+
+    def make_store(self):
+        return MemoryRecordStore()
+
+
+class TestColumnarRecordStore(StoreContractMixin, unittest.TestCase):
+    """列式内存记录存储测试"""
+
+    def make_store(self):
+        return ColumnarRecordStore()
+
+    def test_overwrite_and_clear(self):
+        """覆盖写入更新列值和统计，清空后可继续写入"""
+        record = make_record(1, "知乎", word_count=10)
+        self.store.add(record)
+        record = make_record(1, "CSDN", word_count=20)
+        self.store.add(record)
+        self.assertEqual(self.store.get(record.record_id), record)
+        self.assertEqual(self.store.count(), len(self.sample))
+        self.assertNotIn("知乎", {r.platform for r in self.store.query(topic_id="TOPIC-1")})
+
+        self.store.clear()
+        self.assertEqual(self.store.count(), 0)
+        self.assertEqual(self.store.totals_by_platform(PostStatus.PUBLISHED), {})
+        self.store.add(record)
+        self.assertEqual(self.store.query(), [record])
+
+    def test_invalid_record_leaves_store_consistent(self):
+        """数值按列类型转换；无法转换的记录整体拒绝，不留下不等长的列"""
+        record = make_record(90, word_count=10.5)
+        self.store.add(record)
+        self.assertEqual(self.store.get(record.record_id).word_count, 10)
+
+        bad = make_record(91, ai_score="高")
+        with self.assertRaises(ValueError):
+            self.store.add(bad)
+        self.assertIsNone(self.store.get(bad.record_id))
+        self.assertEqual(len(self.store.query()), len(self.sample) + 1)
+        self.assertEqual(len({len(column) for column in self.store._columns()}), 1)
+
+    def test_many_distinct_accounts(self):
+        """账号、平台编号超过 65535 个时仍可写入"""
+        records = []
+        for i in range(66000):
+            record = make_record(i)
+            record.account = f"账号{i}"
+            records.append(record)
+        self.store.add_many(records)
+        self.assertEqual(self.store.get(records[-1].record_id).account, "账号65999")
+
+    def test_compact_memory(self):
+        """列式存储占用的内存明显少于逐条保存记录对象"""
+        import tracemalloc
+
+        def measure(store):
+            tracemalloc.start()
+            records = [
+                make_record(i, ("知乎", "简书", "CSDN")[i % 3], f"TOPIC-{i % 50}", i % 365)
+                for i in range(5000)
+            ]
+            store.add_many(records)
+            del records
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        self.assertLess(measure(ColumnarRecordStore()), measure(MemoryRecordStore()) * 0.75)
+
+
+class TestMemoryIndexes(unittest.TestCase):
+    """内存存储二级索引测试"""
+
+    def test_matches_full_scan(self):
+        """随机写入、覆盖、改状态后，索引查询与全表扫描结果一致"""
+        rng = random.Random(7)
+        store = MemoryRecordStore()
+        platforms, topics = ["知乎", "简书", "CSDN"], ["T1", "T2", "T3", "T4"]
+        statuses = list(PostStatus)
+        for seq in range(1, 301):
+            store.add(make_record(
+                rng.randint(1, 200), rng.choice(platforms), rng.choice(topics),
+                rng.randint(0, 30), rng.choice(statuses),
+            ))
+            if seq % 7 == 0:
+                rid = rng.choice(list(store._records))
+                store.update_status(rid, rng.choice(statuses))
+
+        now = datetime.now()
+        for _ in range(200):
+            kwargs = {
+                "platform": rng.choice(platforms + [None]),
+                "topic_id": rng.choice(topics + [None]),
+                "status": rng.choice(statuses + [None]),
+                "start": rng.choice([None, now - timedelta(days=rng.randint(0, 31))]),
+                "end": rng.choice([None, now - timedelta(days=rng.randint(0, 31))]),
+            }
+            expected = sorted(
+                (r for r in store._records.values()
+                 if (kwargs["platform"] is None or r.platform == kwargs["platform"])
+                 and (kwargs["topic_id"] is None or r.topic_id == kwargs["topic_id"])
+                 and (kwargs["status"] is None or r.status == kwargs["status"])
+                 and (kwargs["start"] is None or r.publish_time >= kwargs["start"])
+                 and (kwargs["end"] is None or r.publish_time < kwargs["end"])),
+                key=lambda r: (r.publish_time, r.record_id),
+            )
+            self.assertEqual(store.query(**kwargs), expected, kwargs)
+
+        self.assertEqual(len(store._by_time), len(store._records))
+        self.assertEqual(sum(len(ids) for ids in store._by_status.values()), len(store._records))
+
+
+class TestSQLiteRecordStore(StoreContractMixin, unittest.TestCase):
+    """SQLite 记录存储测试"""
+
+    def make_store(self):
+        return SQLiteRecordStore(":memory:")
+
+    def test_persistence(self):
+        """文件数据库重新打开后记录仍在"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "records.db")
+            store = SQLiteRecordStore(db_path)
+            store.add_many(self.sample)
+            store.close()
+
+            reopened = SQLiteRecordStore(db_path)
+            self.assertEqual(reopened.count(), len(self.sample))
+            self.assertEqual(reopened.max_sequence(), 5)
+            reopened.close()
+
+    def test_demo_data_not_persisted(self):
+        """演示数据写入单独的内存存储，不写入当前的持久化存储"""
+        count = tracker.init_demo_data()
+        self.assertEqual(self.store.count(), len(self.sample))
+        self.assertIsInstance(tracker.get_record_store(), MemoryRecordStore)
+        self.assertEqual(tracker.get_record_store().count(), count)
+
+    def test_allocator_processes(self):
+        """多个进程共享同一数据库分配记录ID不重复"""
+        script = (
+            "import sys\n"
+            "from scripts.publisher.tracker import SQLiteRecordStore, set_record_store, generate_record_id\n"
+            "set_record_store(SQLiteRecordStore(sys.argv[1]))\n"
+            "print('\\n'.join(generate_record_id() for _ in range(200)))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "records.db")
+            SQLiteRecordStore(db_path).close()
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, "-c", script, db_path],
+                    cwd=root, stdout=subprocess.PIPE, text=True,
+                )
+                for _ in range(4)
+            ]
+            allocated = [line for p in procs for line in p.communicate()[0].split()]
+        self.assertEqual(len(allocated), 800)
+        self.assertEqual(len(set(allocated)), 800)
+
+    def test_first_record_creates_default_store(self):
+        """新进程中未先取存储就创建记录：默认存储的创建不能与ID分配互锁"""
+        script = (
+            "from scripts.publisher.tracker import create_publish_record\n"
+            "record = create_publish_record('标题', 'TOPIC-1', '知乎', '账号', 10.0, 100, 0)\n"
+            "print(record.record_id)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, PUBLISH_TRACKER_DB=os.path.join(tmp, "records.db"))
+            env.pop("PUBLISH_TRACKER_JOURNAL", None)
+            output = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=root, env=env, capture_output=True, text=True, timeout=30,
+            )
+        self.assertEqual(output.returncode, 0, output.stderr)
+        self.assertTrue(output.stdout.strip().startswith("PUB-"), output.stdout)
+
+    def test_rebuilds_sequences_for_existing_database(self):
+        """旧数据库（无序号表）打开时从记录ID重建每日序号"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "records.db")
+            store = SQLiteRecordStore(db_path)
+            store.add_many(self.sample)
+            store._execute("DROP TABLE record_sequences")
+            store.close()
+
+            reopened = SQLiteRecordStore(db_path)
+            self.assertEqual(reopened.max_sequence(datetime.now().strftime("%Y-%m-%d")), 5)
+            self.assertEqual(reopened.max_sequence(), 5)
+            reopened.close()
+
+    def test_rebuilds_stats_for_existing_database(self):
+        """旧数据库（无统计表）打开时从记录表重建统计聚合"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "records.db")
+            store = SQLiteRecordStore(db_path)
+            store.add_many(self.sample)
+            store._execute("DROP TABLE publish_stats")
+            store.close()
+
+            reopened = SQLiteRecordStore(db_path)
+            self.assertEqual(reopened.totals(PostStatus.PUBLISHED)["count"], 4)
+            self.assertEqual(reopened.totals_by_platform(PostStatus.PUBLISHED)["知乎"]["total_words"], 3000)
+            reopened.close()
+
+    def test_queries_use_indexes(self):
+        """按平台、选题、日期查询走索引"""
+        queries = [
+            ("SELECT * FROM publish_records WHERE platform = ? AND status = ?", ("知乎", "published")),
+            ("SELECT * FROM publish_records WHERE topic_id = ?", ("TOPIC-1",)),
+            ("SELECT * FROM publish_records WHERE publish_time >= ?", ("2026-01-01",)),
+        ]
+        for sql, params in queries:
+            plan = " ".join(row[-1] for row in self.store._execute(f"EXPLAIN QUERY PLAN {sql}", params))
+            self.assertIn("INDEX", plan, sql)
+
+
+class TestJournaledRecordStore(StoreContractMixin, unittest.TestCase):
+    """带预写日志的内存存储测试"""
+
+    def make_store(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self._tmp.name, "records.jsonl")
+        return JournaledRecordStore(self.journal)
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+        super().tearDown()
+
+    def test_replay(self):
+        """重新打开时回放日志，恢复记录、状态和ID计数器"""
+        self.store.update_status(self.sample[0].record_id, PostStatus.FAILED, "下架")
+        self.store.close()
+
+        reopened = JournaledRecordStore(self.journal)
+        self.assertEqual(reopened.count(), len(self.sample))
+        restored = reopened.get(self.sample[0].record_id)
+        self.assertEqual(restored.status, PostStatus.FAILED)
+        self.assertEqual(restored.error_message, "下架")
+        self.assertEqual(reopened.get(self.sample[1].record_id), self.sample[1])
+        self.assertEqual(reopened.totals(PostStatus.PUBLISHED)["count"], 3)
+
+        self.assertEqual(reopened.max_sequence(), 5)
+        set_record_store(reopened)
+        self.assertTrue(generate_record_id().endswith("-006"))
+        reopened.close()
+
+    def test_truncated_tail(self):
+        """写入中途崩溃留下的不完整末行被丢弃，之前的记录完整"""
+        self.store.close()
+        with open(self.journal, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "record": {"title": "半')
+
+        reopened = JournaledRecordStore(self.journal)
+        self.assertEqual(reopened.count(), len(self.sample))
+        reopened.add(make_record(9))
+        reopened.close()
+        self.assertEqual(JournaledRecordStore(self.journal).count(), len(self.sample) + 1)
+
+    def test_corrupt_middle_line_raises(self):
+        """中间的完整行损坏或字段无法识别时报错，不截断其后的有效记录"""
+        self.store.close()
+        with open(self.journal, "rb") as f:
+            original = f.read()
+        lines = original.splitlines(keepends=True)
+        for bad in (b'{"op": "put", "record": {"title": \n',
+                    b'{"op": "put", "record": {"title": "t", "new_field": 1}}\n'):
+            with open(self.journal, "wb") as f:
+                f.write(b"".join(lines[:2] + [bad] + lines[2:]))
+            with self.assertRaises(ValueError) as ctx:
+                JournaledRecordStore(self.journal)
+            self.assertIn("第 3 行", str(ctx.exception))
+            with open(self.journal, "rb") as f:
+                self.assertEqual(len(f.read()), len(original) + len(bad))
+        with open(self.journal, "wb") as f:
+            f.write(original)
+
+    def test_compaction(self):
+        """日志膨胀后压缩为快照，内容不变"""
+        store = JournaledRecordStore(
+            os.path.join(self._tmp.name, "compact.jsonl"), compact_min_ops=20, compact_ratio=2.0
+        )
+        record = make_record(1)
+        for i in range(30):
+            record.word_count = i
+            store.add(record)
+        stats = store.journal_stats()
+        self.assertEqual(stats["records"], 1)
+        self.assertLess(stats["ops"], 20)
+        store.close()
+
+        reopened = JournaledRecordStore(os.path.join(self._tmp.name, "compact.jsonl"))
+        self.assertEqual(reopened.get(record.record_id).word_count, 29)
+        reopened.close()
+
+    def test_group_commit(self):
+        """并发写入共享 fsync（模拟较慢的磁盘）"""
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            time.sleep(0.002)
+            real_fsync(fd)
+
+        before = self.store.journal_stats()["fsyncs"]
+        threads = [
+            threading.Thread(
+                target=lambda base: [self.store.add(make_record(base + i)) for i in range(50)],
+                args=(100 + t * 100,),
+            )
+            for t in range(8)
+        ]
+        with mock.patch.object(tracker.os, "fsync", slow_fsync):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        stats = self.store.journal_stats()
+        self.assertEqual(stats["records"], len(self.sample) + 400)
+        self.assertLess(stats["fsyncs"] - before, 200)
+        self.store.close()
+        self.assertEqual(JournaledRecordStore(self.journal).count(), len(self.sample) + 400)
+
+
+class TestMemoryBatching(unittest.TestCase):
+    """MCP Memory 批量写入测试（使用本地替身服务）"""
+
+    def setUp(self):
+        self._previous = get_memory_client()
+        self.server = LocalMemoryServer()
+        set_memory_client(self.server)
+        self.records = [make_record(i, "知乎", f"TOPIC-{i % 3}") for i in range(1, 121)]
+
+    def tearDown(self):
+        set_memory_client(self._previous)
+
+    def test_single_save(self):
+        """单条写入：一次实体调用、一次关系调用"""
+        save_to_memory(self.records[0])
+        self.assertEqual(self.server.calls, {"create_entities": 1, "create_relations": 1})
+        self.assertIn(self.records[0].record_id, self.server.entities)
+
+    def test_batches(self):
+        """按批写入：每批一次实体调用和一次关系调用，关系去重"""
+        report = save_records_to_memory(self.records, batch_size=50)
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.saved), 120)
+        self.assertEqual(report.calls, 6)
+        self.assertEqual(self.server.calls, {"create_entities": 3, "create_relations": 3})
+        self.assertEqual(len(self.server.entities), 120)
+        # 每批：3 个"选题->平台"关系 + 每条记录一个"记录->选题"关系
+        self.assertEqual(len(self.server.relations), 120 + 3 * 3)
+
+    def test_partial_failure(self):
+        """整批被拒时逐条重试，只报告问题记录"""
+        bad = self.records[7].record_id
+        self.server.fail_entities = {bad}
+        report = save_records_to_memory(self.records, batch_size=50)
+        self.assertEqual(list(report.failed), [bad])
+        self.assertEqual(len(report.saved), 119)
+        self.assertNotIn(bad, self.server.entities)
+        self.assertNotIn(bad, {r["from"] for r in self.server.relations})
+
+        self.server.fail_entities = {self.records[0].record_id}
+        report = save_records_to_memory(self.records[:10], isolate_failures=False)
+        self.assertEqual(len(report.failed), 10)
+        self.assertEqual(report.calls, 1)
+
+    def test_outage_stops_isolation(self):
+        """服务不可用时不逐条重试，其余批次也不再调用"""
+        self.server.unavailable = True
+        report = save_records_to_memory(self.records, batch_size=50)
+        self.assertEqual(len(report.failed), 120)
+        self.assertEqual(report.calls, 1)
+        self.assertIn("不可用", report.failed[self.records[-1].record_id])
+
+    def test_compat_wrapper(self):
+        """batch_save_records 保持返回每条记录的结果列表"""
+        self.server.fail_entities = {self.records[1].record_id}
+        results = batch_save_records(self.records[:3])
+        self.assertEqual([r["record_id"] for r in results], [r.record_id for r in self.records[:3]])
+        self.assertEqual([r["success"] for r in results], [True, False, True])
+        self.assertIn("实体写入失败", results[1]["error"])
+
+    def test_relation_failure(self):
+        """关系写入失败单独报告，不影响实体"""
+        self.server.fail_relations = True
+        report = save_records_to_memory(self.records[:10])
+        self.assertEqual(len(report.saved), 10)
+        self.assertEqual(len(report.relation_errors), 1)
+        self.assertFalse(report.ok)
+
+
+class TestMemoryWriteQueue(unittest.TestCase):
+    """MCP Memory 后台写入队列测试"""
+
+    def setUp(self):
+        self._previous = get_memory_client()
+        self.server = LocalMemoryServer()
+        set_memory_client(self.server)
+        self.records = [make_record(i, "知乎", f"TOPIC-{i % 3}") for i in range(1, 31)]
+
+    def tearDown(self):
+        set_memory_client(self._previous)
+
+    def test_flush_writes_batches(self):
+        """提交后刷新：全部写入，按批调用"""
+        write_queue = MemoryWriteQueue(batch_size=10, flush_interval=0.05)
+        for record in self.records:
+            self.assertTrue(write_queue.submit(record))
+        self.assertTrue(write_queue.flush(timeout=5))
+        self.assertEqual(len(self.server.entities), 30)
+        metrics = write_queue.metrics()
+        self.assertEqual(metrics["written"], 30)
+        self.assertEqual(metrics["pending"], 0)
+        self.assertEqual(metrics["depth"], 0)
+        self.assertGreaterEqual(metrics["batches"], 3)
+        self.assertGreater(metrics["flush_ms_max"], 0)
+        self.assertTrue(write_queue.shutdown())
+
+    def test_slow_backend_does_not_block_submit(self):
+        """后端阻塞时提交立即返回，队列满则丢弃"""
+        release = threading.Event()
+        original = self.server.create_entities
+
+        def blocked(entities):
+            release.wait(5)
+            return original(entities)
+
+        self.server.create_entities = blocked
+        write_queue = MemoryWriteQueue(capacity=5, batch_size=1, flush_interval=0.01)
+        started = time.perf_counter()
+        accepted = [write_queue.submit(record) for record in self.records[:20]]
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertGreater(accepted.count(False), 0)
+        self.assertEqual(write_queue.metrics()["dropped"], accepted.count(False))
+        self.assertLessEqual(write_queue.metrics()["depth"], 5)
+
+        release.set()
+        self.assertTrue(write_queue.flush(timeout=5))
+        self.assertEqual(write_queue.metrics()["written"], accepted.count(True))
+        write_queue.shutdown()
+
+    def test_retry_with_backoff(self):
+        """写入失败的记录退避重试，恢复后写入成功"""
+        bad = self.records[0].record_id
+        self.server.fail_entities = {bad}
+        write_queue = MemoryWriteQueue(batch_size=10, flush_interval=0.01, backoff=0.01, max_retries=5)
+        for record in self.records[:5]:
+            write_queue.submit(record)
+        deadline = time.monotonic() + 5
+        while write_queue.metrics()["retries"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertNotIn(bad, self.server.entities)
+        self.server.fail_entities = set()
+        self.assertTrue(write_queue.flush(timeout=5))
+        self.assertIn(bad, self.server.entities)
+        metrics = write_queue.metrics()
+        self.assertEqual(metrics["written"], 5)
+        self.assertEqual(metrics["failed"], 0)
+        self.assertGreaterEqual(metrics["retries"], 2)
+        write_queue.shutdown()
+
+    def test_give_up_after_max_retries(self):
+        """超过重试次数后放弃并计为失败"""
+        self.server.fail_entities = {self.records[0].record_id}
+        write_queue = MemoryWriteQueue(flush_interval=0.01, backoff=0.01, max_retries=2)
+        write_queue.submit(self.records[0])
+        self.assertTrue(write_queue.flush(timeout=5))
+        metrics = write_queue.metrics()
+        self.assertEqual(metrics["failed"], 1)
+        self.assertEqual(metrics["retries"], 2)
+        write_queue.shutdown()
+
+    def test_shutdown_flushes_and_rejects(self):
+        """关闭时刷新剩余记录，之后拒绝新记录"""
+        write_queue = MemoryWriteQueue(flush_interval=0.5)
+        for record in self.records[:3]:
+            write_queue.submit(record)
+        self.assertTrue(write_queue.shutdown(timeout=5))
+        self.assertEqual(len(self.server.entities), 3)
+        self.assertFalse(write_queue.submit(self.records[3]))
+        self.assertEqual(write_queue.metrics()["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
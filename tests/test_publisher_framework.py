@@ -8,14 +8,22 @@
 3. 适配器接口测试
 """
 
+import asyncio
 import sys
 import os
+import time
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.publisher import Content, PlatformPublisher, PublishResult, PostStatus
 from scripts.publisher.base import PublisherRegistry, Platform
+from scripts.publisher.zhihu import ZhihuAdapter
+from scripts.publisher.adapter import LazyAdapter
+from scripts.publisher.preprocess import BodyReplace, FieldStage, PreprocessPipeline
+from scripts.publisher.publisher import UnifiedPublisher, PublisherConfig as UnifiedPublisherConfig
+from scripts.publisher.retry import get_circuit_breaker, reset_circuit_breakers
+from scripts.ai_detector import get_detector, DetectionCache, get_detection_cache, set_detection_cache
 from config.publisher import get_publisher_config
 
 
@@ -110,6 +118,61 @@ class TestContentModel:
         print("[PASS] to_platform_format")
 
 
+class TestPreprocessPipeline:
+    """预处理流水线测试"""
+
+    def test_zhihu_preprocess(self):
+        """知乎预处理：原内容不变，未改动的字段与原对象共享"""
+        content = Content(
+            title="标题。", body="第一段\n\n\n第二段", tags=list("abcdef"), category="cat"
+        )
+        processed = ZhihuAdapter().preprocess_content(content)
+        assert processed.title == "标题"
+        assert processed.tags == ["#a#", "#b#", "#c#", "#d#", "#e#"]
+        assert processed.body == "第一段\n\n第二段"
+        assert content.title == "标题。" and content.tags == list("abcdef")
+        assert content.body == "第一段\n\n\n第二段"
+        assert processed.category is content.category
+
+        plain = Content(title="标题", body="正文")
+        processed = LazyAdapter(ZhihuAdapter).preprocess_content(plain)
+        assert processed.body is plain.body
+        print("[PASS] zhihu preprocess")
+
+    def test_unchanged_returns_original(self):
+        """没有字段变化时返回原对象"""
+        pipeline = PreprocessPipeline([
+            FieldStage("title", str.strip),
+            BodyReplace("\r\n", "\n"),
+        ])
+        content = Content(title="标题", body="正文")
+        assert pipeline.apply(content) is content
+        print("[PASS] unchanged content")
+
+    def test_fused_replacements(self):
+        """相邻替换合并为一次扫描：长字面量优先，替换结果不再参与匹配"""
+        pipeline = PreprocessPipeline([
+            BodyReplace("\n\n\n", "\n\n"),
+            BodyReplace("\n", "<br>"),
+            FieldStage("summary", lambda summary: summary or "摘要"),
+            BodyReplace("<br>", "|"),
+        ])
+        assert len(pipeline._steps) == 3
+        processed = pipeline.apply(Content(title="t", body="a\n\n\nb\nc"))
+        assert processed.body == "a\n\nb|c"
+        assert processed.summary == "摘要"
+        print("[PASS] fused replacements")
+
+    def test_invalid_stage(self):
+        """字段名错误时在构建时报错"""
+        try:
+            PreprocessPipeline([FieldStage("no_such_field", str.strip)])
+        except ValueError:
+            print("[PASS] invalid stage")
+            return
+        raise AssertionError("expected ValueError")
+
+
 class TestPublishResult:
     """发布结果测试"""
 
@@ -208,6 +271,215 @@ class TestPlatformEnum:
         print("[PASS] Platform enum values")
 
 
+class SlowPublisher(PlatformPublisher):
+    """模拟耗时发布的测试发布器"""
+
+    def __init__(self, name, delay):
+        self._name = name
+        self._delay = delay
+
+    @property
+    def platform(self):
+        return Platform.CUSTOM
+
+    @property
+    def platform_name(self):
+        return self._name
+
+    def publish(self, content):
+        time.sleep(self._delay)
+        return PublishResult.success_result(self._name, f"http://{self._name}.test")
+
+    def get_status(self, post_id):
+        return None
+
+    def login(self):
+        return True
+
+    def is_logged_in(self):
+        return True
+
+
+class TestUnifiedPublisher:
+    """统一发布器测试"""
+
+    def test_shares_compiled_detector(self):
+        """多个发布器复用同一个已编译检测器"""
+        first = UnifiedPublisher(UnifiedPublisherConfig())
+        second = UnifiedPublisher(UnifiedPublisherConfig())
+        assert first._ai_detector is second._ai_detector
+        assert first._ai_detector is get_detector()
+        print("[PASS] shared detector")
+
+    def test_ai_detection_blocks_publish(self):
+        """AI味超过阈值时拒绝发布"""
+        publisher = UnifiedPublisher(UnifiedPublisherConfig(ai_threshold=10))
+        content = Content(title="Test", body="首先，准备。其次，实施。最后，总结。")
+        result = publisher.publish(content, "zhihu")
+        assert result.success is False
+        assert "AI味检测未通过" in result.error
+        print("[PASS] AI detection blocks publish")
+
+    def test_publish_multi_detects_once(self):
+        """多平台发布同一正文只检测一次"""
+        previous = get_detection_cache()
+        cache = DetectionCache()
+        set_detection_cache(cache)
+        try:
+            publisher = UnifiedPublisher(UnifiedPublisherConfig(ai_threshold=10))
+            content = Content(title="Test", body="首先，准备。其次，实施。最后，总结。")
+            publisher.publish_multi(content, ["zhihu", "xiaohongshu", "wechat"])
+            stats = cache.stats()
+            assert stats["misses"] == 1
+            assert stats["memory_hits"] == 0
+        finally:
+            set_detection_cache(previous)
+        print("[PASS] publish_multi detects once")
+
+    def _slow_publisher(self, delays, **config):
+        publisher = UnifiedPublisher(UnifiedPublisherConfig(
+            enable_ai_detection=False, enable_auto_track=False, **config
+        ))
+        for name, delay in delays.items():
+            publisher.register_publisher(SlowPublisher(name, delay))
+        return publisher
+
+    def test_publish_multi_concurrent(self):
+        """多平台并发发布，总耗时接近最慢平台，并记录各平台耗时"""
+        delays = {f"p{i}": 0.2 for i in range(5)}
+        publisher = self._slow_publisher(delays)
+        content = Content(title="Test", body="正文")
+        started = time.perf_counter()
+        results = publisher.publish_multi(content, list(delays))
+        elapsed = time.perf_counter() - started
+        assert list(results) == list(delays)
+        assert all(r.success for r in results.values())
+        assert all(r.elapsed_ms >= 190 for r in results.values())
+        assert elapsed < 0.6
+        print(f"[PASS] publish_multi concurrent: {elapsed * 1000:.0f} ms")
+
+    def test_publish_multi_timeout(self):
+        """单平台超时记为失败，不影响其他平台"""
+        publisher = self._slow_publisher({"fast": 0.0, "slow": 1.0}, publish_timeout=0.2)
+        content = Content(title="Test", body="正文")
+        started = time.perf_counter()
+        results = publisher.publish_multi(content, ["fast", "slow"])
+        assert time.perf_counter() - started < 0.8
+        assert results["fast"].success is True
+        assert results["slow"].success is False
+        assert "超时" in results["slow"].error
+        # 超时平台可能仍在后台发布，不可自动重试
+        assert results["slow"].retryable is False
+        print("[PASS] publish_multi timeout")
+
+    def test_publish_multi_timeout_starts_with_task(self):
+        """平台数超过并发数时，排队等待线程的时间不计入超时"""
+        delays = {f"q{i}": 0.15 for i in range(4)}
+        publisher = self._slow_publisher(delays, publish_timeout=0.25, max_concurrency=2)
+        results = publisher.publish_multi(Content(title="Test", body="正文"), list(delays))
+        assert all(r.success for r in results.values()), {p: r.error for p, r in results.items()}
+        print("[PASS] publish_multi per-task timeout")
+
+    def test_publish_multi_cancels_queued(self):
+        """线程被超时任务占用、一直未开始的平台取消：未发布、可重试、不计入熔断"""
+        reset_circuit_breakers()
+        publisher = self._slow_publisher(
+            {"hung": 1.0, "queued": 0.0}, publish_timeout=0.2, max_concurrency=1
+        )
+        results = publisher.publish_multi(Content(title="Test", body="正文"), ["hung", "queued"])
+        assert results["hung"].retryable is False
+        assert results["queued"].success is False
+        assert results["queued"].retryable is True
+        assert "未发布" in results["queued"].error
+        assert get_circuit_breaker("queued").stats()["failures"] == 0
+        assert get_circuit_breaker("hung").stats()["failures"] == 1
+        reset_circuit_breakers()
+        print("[PASS] publish_multi cancels queued")
+
+    def test_publish_multi_serial(self):
+        """顺序模式结果与并发模式一致"""
+        platforms = ["a", "b", "missing"]
+        publisher = self._slow_publisher({"a": 0.0, "b": 0.0})
+        content = Content(title="Test", body="正文")
+        serial = publisher.publish_multi(content, platforms, concurrent=False)
+        parallel = publisher.publish_multi(content, platforms)
+        assert [r.success for r in serial.values()] == [True, True, False]
+        assert [r.success for r in parallel.values()] == [True, True, False]
+        print("[PASS] publish_multi serial")
+
+
+class TestAsyncPublishing:
+    """异步发布接口测试"""
+
+    BODY = "今天去公园散步，看到很多人在放风筝。" * 10
+
+    def test_sync_publisher_default_async(self):
+        """同步发布器通过默认实现获得异步接口"""
+        publisher = SlowPublisher("sync", 0.0)
+        result = asyncio.run(publisher.apublish(Content(title="Test", body="正文")))
+        assert result.success is True
+        assert asyncio.run(publisher.alogin()) is True
+        print("[PASS] default async wrappers")
+
+    def test_zhihu_native_async(self):
+        """知乎适配器原生异步路径"""
+        adapter = ZhihuAdapter(cookies={"z_c0": "token"})
+
+        async def run():
+            result = await adapter.apublish(Content(title="测试文章", body=self.BODY))
+            status = await adapter.aget_status(result.post_id)
+            return result, status
+
+        result, status = asyncio.run(run())
+        assert result.success is True
+        assert adapter.is_logged_in()
+        assert status.status == PostStatus.PUBLISHED
+        print("[PASS] zhihu native async")
+
+    def test_unified_apublish_multi(self):
+        """统一发布器异步多平台发布：并发执行且不阻塞事件循环"""
+        publisher = UnifiedPublisher(UnifiedPublisherConfig(
+            enable_auto_track=False, publish_timeout=0.5
+        ))
+        for name in ("a", "b", "c"):
+            publisher.register_publisher(SlowPublisher(name, 0.2))
+        publisher.register_publisher(SlowPublisher("slow", 1.0))
+        content = Content(title="Test", body=self.BODY)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            results = await publisher.apublish_multi(content, ["a", "b", "c", "slow"])
+            elapsed = time.perf_counter() - started
+            task.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(run())
+        assert [results[p].success for p in ("a", "b", "c", "slow")] == [True, True, True, False]
+        assert "超时" in results["slow"].error
+        assert results["slow"].retryable is False
+        assert elapsed < 1.0
+        assert ticks > 10
+        print(f"[PASS] apublish_multi: {elapsed * 1000:.0f} ms, {ticks} loop ticks")
+
+    def test_unified_ai_rejection(self):
+        """异步发布同样执行AI检测"""
+        publisher = UnifiedPublisher(UnifiedPublisherConfig(ai_threshold=10))
+        content = Content(title="Test", body="首先，准备。其次，实施。最后，总结。")
+        result = asyncio.run(publisher.apublish(content, "zhihu"))
+        assert result.success is False
+        assert "AI味检测未通过" in result.error
+        print("[PASS] async AI rejection")
+
+
 def run_all_tests():
     """运行所有测试"""
     print("=" * 60)
@@ -222,6 +494,9 @@ def run_all_tests():
         TestPublisherRegistry,
         TestPostStatus,
         TestPlatformEnum,
+        TestUnifiedPublisher,
+        TestAsyncPublishing,
+        TestPreprocessPipeline,
     ]
 
     total_passed = 0
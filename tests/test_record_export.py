@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布记录导出测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+from scripts.publisher.tracker import (
+    PostStatus, PublishRecord, MemoryRecordStore, SQLiteRecordStore, ColumnarRecordStore,
+    RECORD_COLUMNS,
+)
+from scripts.publisher.export import export_records, read_columnar, guess_format
+
+
+def make_records(n=57):
+    """构造多平台、多状态的记录，部分记录发布时间相同（测试分页的并列排序）"""
+    base = datetime(2026, 3, 1, 9, 0, 0)
+    platforms = ["知乎", "简书", "CSDN"]
+    records = []
+    for i in range(1, n + 1):
+        publish_time = base + timedelta(hours=i // 2)
+        records.append(PublishRecord(
+            title=f"文章,{i}\"引号\"",
+            topic_id=f"TOPIC-{i % 4}",
+            publish_time=publish_time,
+            platform=platforms[i % 3],
+            account="CEO思考者",
+            post_url=None if i % 5 == 0 else f"https://example.com/{i}",
+            ai_score=round(i / 100, 2),
+            word_count=1000 + i,
+            case_count=i % 3,
+            record_id=f"PUB-{publish_time:%Y-%m-%d}-{i:03d}",
+            status=PostStatus.FAILED if i % 7 == 0 else PostStatus.PUBLISHED,
+            error_message="超时" if i % 7 == 0 else None,
+        ))
+    return records
+
+
+class ExportContractMixin:
+    """各存储实现导出结果一致"""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+        self.records = make_records()
+        self.store.add_many(self.records)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def expected(self, **filters):
+        return [r.record_id for r in self.store.query(**filters)]
+
+    def test_iter_rows_chunks(self):
+        """分块读取：每块不超过 chunk_size，拼接后与查询结果一致"""
+        chunks = list(self.store.iter_rows(chunk_size=5))
+        self.assertTrue(all(len(chunk) <= 5 for chunk in chunks))
+        self.assertEqual([row[0] for chunk in chunks for row in chunk], self.expected())
+
+        start, end = datetime(2026, 3, 1, 12), datetime(2026, 3, 2, 3)
+        rows = [row for chunk in self.store.iter_rows(
+            platform="知乎", status=PostStatus.PUBLISHED, start=start, end=end, chunk_size=3
+        ) for row in chunk]
+        self.assertEqual(
+            [row[0] for row in rows],
+            self.expected(platform="知乎", status=PostStatus.PUBLISHED, start=start, end=end),
+        )
+
+    def test_jsonl_roundtrip(self):
+        """JSON Lines 每行可还原为原记录"""
+        path = os.path.join(self.tmp.name, "records.jsonl")
+        self.assertEqual(export_records(path, store=self.store, chunk_size=4), len(self.records))
+        with open(path, encoding="utf-8") as f:
+            restored = [PublishRecord.from_dict(json.loads(line)) for line in f]
+        by_id = {r.record_id: r for r in self.records}
+        self.assertEqual(restored, [by_id[r.record_id] for r in restored])
+        self.assertEqual([r.record_id for r in restored], self.expected())
+
+    def test_csv_filters(self):
+        """CSV 导出：表头 + 过滤后的记录，特殊字符正确转义"""
+        path = os.path.join(self.tmp.name, "failed.csv")
+        count = export_records(path, store=self.store, status=PostStatus.FAILED, chunk_size=2)
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(RECORD_COLUMNS))
+        self.assertEqual(count, len(rows) - 1)
+        self.assertEqual([row[0] for row in rows[1:]], self.expected(status=PostStatus.FAILED))
+        self.assertEqual(rows[1][1], self.store.get(rows[1][0]).title)
+
+    def test_columnar_gzip_roundtrip(self):
+        """列式 + gzip：字典编码后可还原，体积小于 JSON Lines"""
+        columnar = os.path.join(self.tmp.name, "records.pcol.gz")
+        jsonl = os.path.join(self.tmp.name, "records.jsonl.gz")
+        export_records(columnar, store=self.store, chunk_size=20)
+        export_records(jsonl, store=self.store, chunk_size=20)
+        with gzip.open(columnar, "rt", encoding="utf-8") as f:
+            f.readline()
+            group = json.loads(f.readline())
+        self.assertEqual(group["rows"], 20)
+        self.assertIn("dict", group["columns"]["platform"])
+
+        restored = [PublishRecord.from_dict(row) for row in read_columnar(columnar)]
+        self.assertEqual([r.record_id for r in restored], self.expected())
+        self.assertEqual(restored[0], self.store.get(restored[0].record_id))
+        self.assertLess(os.path.getsize(columnar), os.path.getsize(jsonl))
+
+    def test_file_object_and_empty(self):
+        """可写入文件对象；无匹配记录时只写表头"""
+        buffer = io.StringIO()
+        self.assertEqual(export_records(buffer, "csv", store=self.store, platform="不存在"), 0)
+        self.assertEqual(buffer.getvalue().strip(), ",".join(RECORD_COLUMNS))
+
+
+class TestMemoryStoreExport(ExportContractMixin, unittest.TestCase):
+    """内存存储导出测试"""
+
+    def make_store(self):
+        return MemoryRecordStore()
+
+
+class TestSQLiteStoreExport(ExportContractMixin, unittest.TestCase):
+    """SQLite 存储导出测试"""
+
+    def make_store(self):
+        return SQLiteRecordStore(":memory:")
+
+
+class TestColumnarStoreExport(ExportContractMixin, unittest.TestCase):
+    """列式内存存储导出测试"""
+
+    def make_store(self):
+        return ColumnarRecordStore()
+
+
+class TestExportOptions(unittest.TestCase):
+    """导出参数测试"""
+
+    def test_guess_format(self):
+        self.assertEqual(guess_format("a.csv"), "csv")
+        self.assertEqual(guess_format("a.csv.gz"), "csv")
+        self.assertEqual(guess_format("a.pcol"), "columnar")
+        self.assertEqual(guess_format("a.txt"), "jsonl")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_records(io.StringIO(), "parquet", store=MemoryRecordStore())
+
+    def test_failed_export_leaves_no_file(self):
+        """导出中途失败时不留下目标文件和临时文件"""
+        class BrokenStore(MemoryRecordStore):
+            def iter_rows(self, *args, **kwargs):
+                yield [("PUB-2026-03-01-001",) + ("x",) * (len(RECORD_COLUMNS) - 1)]
+                raise RuntimeError("读取失败")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "records.jsonl")
+            with self.assertRaises(RuntimeError):
+                export_records(path, store=BrokenStore())
+            self.assertEqual(os.listdir(tmp), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重试策略与熔断器测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import random
+
+from scripts.publisher.adapter import BaseAdapter
+from scripts.publisher.base import Content, Platform, PlatformPublisher, PublishResult
+from scripts.publisher.publisher import UnifiedPublisher, PublisherConfig as UnifiedPublisherConfig
+from scripts.publisher.retry import (
+    CircuitBreaker, CircuitState, RetryPolicy, circuit_breaker_stats, get_circuit_breaker,
+    is_retryable_error, is_retryable_status, is_transient_error, reset_circuit_breakers,
+    reset_retry_stats, retry_stats,
+)
+from scripts.publisher.transport import ConnectError, TransportError
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def transient_failure():
+    return PublishResult.failed_result("503 Service Unavailable", retryable=True)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """重试策略测试"""
+
+    def setUp(self):
+        reset_retry_stats()
+        self.sleeps = []
+
+    def test_full_jitter_bounds(self):
+        """等待时间在 [0, min(上限, 基数 * 2^n)] 内"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, rng=random.Random(7))
+        for retry in range(6):
+            cap = min(5.0, 2 ** retry)
+            delays = [policy.delay(retry) for _ in range(200)]
+            self.assertTrue(all(0 <= d <= cap for d in delays))
+            self.assertGreater(max(delays), cap / 2)
+
+    def test_retries_transient_failures(self):
+        outcomes = [transient_failure(), transient_failure(), PublishResult.success_result("1", "http://test/1")]
+        policy = RetryPolicy(max_retries=3, base_delay=0.5, rng=random.Random(1))
+        result = policy.run(lambda: outcomes.pop(0), sleep=self.sleeps.append)
+        self.assertTrue(result.success)
+        self.assertEqual(result.attempts, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(retry_stats()["retries"], 2)
+
+    def test_business_error_not_retried(self):
+        """平台明确拒绝（不可重试）的失败只尝试一次"""
+        calls = []
+        result = RetryPolicy().run(
+            lambda: calls.append(1) or PublishResult.failed_result("403 Forbidden"),
+            sleep=self.sleeps.append,
+        )
+        self.assertFalse(result.success)
+        self.assertEqual((len(calls), result.attempts, self.sleeps), (1, 1, []))
+
+    def test_exhausted(self):
+        """超过最大重试次数或总耗时上限后停止"""
+        result = RetryPolicy(max_retries=2, base_delay=0).run(transient_failure, sleep=self.sleeps.append)
+        self.assertEqual(result.attempts, 3)
+        result = RetryPolicy(max_retries=5, base_delay=10, deadline=0.001).run(
+            transient_failure, sleep=self.sleeps.append
+        )
+        self.assertEqual(result.attempts, 1)
+        self.assertEqual(retry_stats()["exhausted"], 2)
+
+    def test_exception_classified(self):
+        """建立连接失败可重试；请求发出后的传输错误结果未知，不重试；其他异常不重试"""
+        def refused():
+            raise ConnectError("connection refused")
+
+        result = RetryPolicy(max_retries=1, base_delay=0).run(refused, sleep=self.sleeps.append)
+        self.assertEqual((result.attempts, result.retryable, result.transient), (2, True, True))
+
+        def read_timeout():
+            raise TransportError("请求超时")
+
+        result = RetryPolicy(max_retries=1, base_delay=0).run(read_timeout, sleep=self.sleeps.append)
+        self.assertEqual((result.attempts, result.retryable, result.transient), (1, False, True))
+
+        for error in (PermissionError("denied"), FileNotFoundError("cookies.json"), TimeoutError()):
+            self.assertFalse(is_retryable_error(error), error)
+        self.assertFalse(is_transient_error(PermissionError("denied")))
+
+        def buggy():
+            raise KeyError("id")
+
+        self.assertEqual(RetryPolicy(base_delay=0).run(buggy, sleep=self.sleeps.append).attempts, 1)
+
+    def test_async(self):
+        outcomes = [transient_failure(), PublishResult.success_result("1", "http://test/1")]
+
+        async def call():
+            return outcomes.pop(0)
+
+        result = asyncio.run(RetryPolicy(base_delay=0).arun(call))
+        self.assertEqual((result.success, result.attempts), (True, 2))
+
+    def test_retryable_status(self):
+        self.assertTrue(is_retryable_status(503))
+        self.assertTrue(is_retryable_status(429))
+        self.assertFalse(is_retryable_status(403))
+        # 服务端错误时平台可能已处理请求
+        self.assertFalse(is_retryable_status(500))
+        self.assertFalse(is_retryable_status(502))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """熔断器测试"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=self.clock)
+
+    def test_open_half_open_close(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        # 冷却后只放行一次探测
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.assertTrue(self.breaker.rejects())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.stats(), {"state": "closed", "failures": 0, "opens": 1, "rejected": 2})
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.clock.now = 19
+        self.assertTrue(self.breaker.rejects())
+
+    def test_business_errors_count_as_success(self):
+        """平台可达（业务错误）时清零失败计数"""
+        self.breaker.record(transient_failure())
+        self.breaker.record(transient_failure())
+        self.breaker.record(PublishResult.failed_result("403 Forbidden"))
+        self.breaker.record(transient_failure())
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_unknown_outcome_counts_as_failure(self):
+        """请求发出后超时（不可重试）仍说明平台不可用，计入熔断"""
+        for _ in range(3):
+            self.breaker.record(PublishResult.failed_result("请求超时", transient=True))
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+    def test_policy_stops_when_open(self):
+        """重试过程中熔断后不再尝试"""
+        calls = []
+        result = RetryPolicy(max_retries=10, base_delay=0).run(
+            lambda: calls.append(1) or transient_failure(), breaker=self.breaker, sleep=lambda s: None
+        )
+        self.assertEqual((len(calls), result.attempts, result.circuit_state), (3, 3, "open"))
+
+
+class FlakyAdapter(BaseAdapter):
+    """前几次发布抛出传输异常的适配器"""
+
+    def __init__(self, failures, error=ConnectError("connection refused")):
+        super().__init__()
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self._logged_in = True
+
+    @property
+    def platform(self):
+        return Platform.CUSTOM
+
+    @property
+    def platform_name(self):
+        return "flaky"
+
+    def login(self):
+        return True
+
+    def _do_publish(self, content):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return PublishResult.success_result(str(self.calls), "http://flaky.test", platform=self.platform)
+
+    def _do_get_status(self, post_id):
+        return None
+
+
+class CountingPublisher(PlatformPublisher):
+    """非适配器发布器：始终返回可重试失败"""
+
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def platform(self):
+        return Platform.CUSTOM
+
+    @property
+    def platform_name(self):
+        return "down"
+
+    def publish(self, content):
+        self.calls += 1
+        return transient_failure()
+
+    def get_status(self, post_id):
+        return None
+
+    def login(self):
+        return True
+
+    def is_logged_in(self):
+        return True
+
+
+class TestPublishIntegration(unittest.TestCase):
+    """适配器与统一发布器集成测试"""
+
+    def setUp(self):
+        reset_circuit_breakers()
+        reset_retry_stats()
+        self.content = Content(title="测试文章", body="今天去公园散步，看到很多人在放风筝。" * 10)
+
+    def tearDown(self):
+        reset_circuit_breakers()
+
+    def test_adapter_retries(self):
+        adapter = FlakyAdapter(failures=2)
+        adapter.retry_policy = RetryPolicy(max_retries=3, base_delay=0)
+        result = adapter.publish(self.content)
+        self.assertTrue(result.success, result.error)
+        self.assertEqual((result.attempts, result.circuit_state), (3, "closed"))
+
+    def test_adapter_does_not_resend_after_read_timeout(self):
+        """请求发出后超时，平台可能已发布，不重复调用 _do_publish"""
+        adapter = FlakyAdapter(failures=1, error=TransportError("请求超时: POST http://flaky.test"))
+        adapter.retry_policy = RetryPolicy(max_retries=3, base_delay=0)
+        result = adapter.publish(self.content)
+        self.assertFalse(result.success)
+        self.assertEqual((adapter.calls, result.attempts, result.retryable), (1, 1, False))
+
+    def test_adapter_short_circuits(self):
+        adapter = FlakyAdapter(failures=100)
+        adapter.retry_policy = RetryPolicy(max_retries=10, base_delay=0)
+        adapter.publish(self.content)
+        calls = adapter.calls
+        result = adapter.publish(self.content)
+        self.assertEqual(adapter.calls, calls)
+        self.assertEqual((result.attempts, result.circuit_state), (0, "open"))
+
+    def test_unified_publisher_skips_open_platform(self):
+        """熔断中的平台不分发，直接返回失败"""
+        publisher = UnifiedPublisher(UnifiedPublisherConfig(enable_ai_detection=False, enable_auto_track=False))
+        down = CountingPublisher()
+        publisher.register_publisher(down)
+        breaker = get_circuit_breaker("down")
+        for _ in range(breaker.failure_threshold):
+            publisher.publish(self.content, "down")
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        results = publisher.publish_multi(self.content, ["down"])
+        self.assertEqual(down.calls, breaker.failure_threshold)
+        self.assertEqual((results["down"].circuit_state, results["down"].attempts), ("open", 0))
+        self.assertIn("熔断", results["down"].error)
+        metrics = publisher.get_reliability_metrics()
+        self.assertEqual(metrics["circuit_breakers"]["down"]["rejected"], 1)
+        self.assertEqual(circuit_breaker_stats()["down"]["opens"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
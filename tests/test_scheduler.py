@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+限流与发布调度测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from scripts.publisher.base import Content, Platform, PlatformPublisher, PublishResult
+from scripts.publisher.publisher import UnifiedPublisher, PublisherConfig as UnifiedPublisherConfig
+from scripts.publisher.retry import reset_circuit_breakers
+from scripts.publisher.scheduler import PublishScheduler, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingPublisher(PlatformPublisher):
+    """记录每次发布时间的测试发布器"""
+
+    def __init__(self, name, delay=0.0):
+        self._name = name
+        self._delay = delay
+        self.published = []
+        self._lock = threading.Lock()
+
+    @property
+    def platform(self):
+        return Platform.CUSTOM
+
+    @property
+    def platform_name(self):
+        return self._name
+
+    def publish(self, content):
+        with self._lock:
+            self.published.append((time.monotonic(), content.title))
+        time.sleep(self._delay)
+        return PublishResult.success_result(content.title, f"http://{self._name}.test")
+
+    def get_status(self, post_id):
+        return None
+
+    def login(self):
+        return True
+
+    def is_logged_in(self):
+        return True
+
+
+class TestRateLimiter(unittest.TestCase):
+    """令牌桶与限流器测试"""
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(interval=10, burst=2, clock=clock)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(bucket.wait_time(), 10)
+        clock.now = 4
+        self.assertEqual(bucket.wait_time(), 6)
+        clock.now = 100
+        bucket.acquire()
+        self.assertEqual(bucket.wait_time(), 0)
+
+    def test_accounts_and_platforms(self):
+        """账号之间独立；平台级间隔跨账号生效"""
+        clock = FakeClock()
+        limiter = RateLimiter(300, platform_intervals={"zhihu": 60}, clock=clock)
+        self.assertTrue(limiter.try_acquire("jianshu", "a"))
+        self.assertFalse(limiter.try_acquire("jianshu", "a"))
+        self.assertEqual(limiter.wait_time("jianshu", "a"), 300)
+        self.assertTrue(limiter.try_acquire("jianshu", "b"))
+
+        self.assertTrue(limiter.try_acquire("zhihu", "a"))
+        self.assertFalse(limiter.try_acquire("zhihu", "b"))
+        self.assertEqual(limiter.ready_at("zhihu", "b"), 60)
+        clock.now = 60
+        self.assertTrue(limiter.try_acquire("zhihu", "b"))
+        self.assertEqual(limiter.wait_time("zhihu", "a"), 240)
+
+    def test_from_publisher_config(self):
+        class Config:
+            def get_publish_interval(self):
+                return 300
+
+        self.assertEqual(RateLimiter.from_publisher_config(Config()).interval, 300.0)
+
+
+class TestPublishScheduler(unittest.TestCase):
+    """发布调度器测试"""
+
+    def setUp(self):
+        reset_circuit_breakers()
+        self.publisher = UnifiedPublisher(UnifiedPublisherConfig(
+            enable_ai_detection=False, enable_auto_track=False
+        ))
+        self.platforms = {name: RecordingPublisher(name) for name in ("a", "b", "c")}
+        for publisher in self.platforms.values():
+            self.publisher.register_publisher(publisher)
+
+    def test_respects_interval_in_parallel(self):
+        """各平台按间隔发布，平台之间并行"""
+        scheduler = PublishScheduler(self.publisher, RateLimiter(0.15))
+        jobs = []
+        for i in range(3):
+            jobs += scheduler.submit(Content(title=f"t{i}", body="正文"), list(self.platforms))
+        started = time.monotonic()
+        with scheduler:
+            self.assertTrue(scheduler.drain(timeout=5))
+        elapsed = time.monotonic() - started
+
+        self.assertTrue(all(job.done and job.result.success for job in jobs))
+        for publisher in self.platforms.values():
+            times = [t for t, _ in publisher.published]
+            self.assertEqual([title for _, title in publisher.published], ["t0", "t1", "t2"])
+            self.assertTrue(all(b - a >= 0.14 for a, b in zip(times, times[1:])))
+        # 三个平台并行：约 2 个间隔，而不是 8 个
+        self.assertLess(elapsed, 0.8)
+        stats = scheduler.stats()
+        self.assertEqual((stats["dispatched"], stats["succeeded"], stats["queued"]), (9, 9, 0))
+        self.assertGreater(stats["throttled"], 0)
+
+    def test_interval_kept_when_workers_busy(self):
+        """线程全忙时不提前占用名额，线程空出后同一平台仍按间隔发布"""
+        busy = RecordingPublisher("busy", delay=0.4)
+        self.publisher.register_publisher(busy)
+        scheduler = PublishScheduler(self.publisher, RateLimiter(0.15), max_workers=1)
+        scheduler.submit(Content(title="long", body="正文"), ["busy"], priority=0)
+        scheduler.submit(Content(title="t0", body="正文"), ["a"], priority=1)
+        scheduler.submit(Content(title="t1", body="正文"), ["a"], priority=1)
+        with scheduler:
+            self.assertTrue(scheduler.drain(timeout=5))
+        (first, _), (second, _) = self.platforms["a"].published
+        self.assertGreaterEqual(second - first, 0.14)
+
+    def test_priority_and_not_before(self):
+        scheduler = PublishScheduler(self.publisher, RateLimiter(0.1))
+        scheduler.submit(Content(title="later", body="正文"), ["a"],
+                         not_before=datetime.now() + timedelta(seconds=0.3))
+        scheduler.submit(Content(title="low", body="正文"), ["a"], priority=5)
+        scheduler.submit(Content(title="high", body="正文"), ["a"], priority=1)
+        self.assertEqual([job.content.title for job in scheduler.pending()], ["high", "low", "later"])
+        with scheduler:
+            self.assertTrue(scheduler.drain(timeout=5))
+        self.assertEqual([title for _, title in self.platforms["a"].published], ["high", "low", "later"])
+
+    def test_failures_reported(self):
+        scheduler = PublishScheduler(self.publisher, RateLimiter(0))
+        (job,) = scheduler.submit(Content(title="t", body="正文"), ["missing"])
+        with scheduler:
+            result = job.wait(timeout=5)
+        self.assertFalse(result.success)
+        self.assertEqual(scheduler.stats()["failed"], 1)
+
+    def test_stop_keeps_pending(self):
+        scheduler = PublishScheduler(self.publisher, RateLimiter(60))
+        scheduler.submit(Content(title="t0", body="正文"), ["a"])
+        scheduler.submit(Content(title="t1", body="正文"), ["a"])
+        scheduler.start()
+        self.assertFalse(scheduler.drain(timeout=0.2))
+        scheduler.stop()
+        self.assertEqual([job.content.title for job in scheduler.pending()], ["t1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 传输层测试用例
+"""
+
+import unittest
+import sys
+import os
+
+# 添加父目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import socket
+import time
+
+from scripts.publisher.base import Content, PostStatus
+from scripts.publisher.fake_server import FakeServer
+from scripts.publisher.transport import (
+    AsyncConnectionPool, ConnectError, ConnectionPool, TransportConfig, TransportError,
+    get_transport, set_transport,
+)
+from scripts.publisher.zhihu import ZhihuAdapter
+
+
+BODY = "今天去公园散步，看到很多人在放风筝。" * 10
+
+
+def closed_port_url():
+    """没有监听的本地端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+def echo(request):
+    return 200, {"path": request.path, "query": request.query, "body": request.json()}
+
+
+class FakeConfig:
+    """模拟 config.publisher.PublisherConfig 的代理与超时接口"""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+
+    def get_timeout(self):
+        return 12
+
+    def is_proxy_enabled(self):
+        return self.enabled
+
+    def get_proxy(self):
+        return {"http": "http://127.0.0.1:8080", "https": ""}
+
+
+class TestConnectionPool(unittest.TestCase):
+    """同步连接池测试"""
+
+    def setUp(self):
+        self.server = FakeServer({("POST", "/echo"): echo, ("GET", "/echo"): echo}).start()
+        self.pool = ConnectionPool(TransportConfig(timeout=5))
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def test_keep_alive(self):
+        """同一主机的请求复用同一个连接"""
+        for i in range(5):
+            response = self.pool.post(f"{self.server.url}/echo", params={"i": i}, json={"n": i})
+            self.assertTrue(response.ok)
+            self.assertEqual(response.json(), {"path": "/echo", "query": {"i": [str(i)]}, "body": {"n": i}})
+        self.assertEqual(self.server.connections, 1)
+        stats = self.pool.stats()
+        self.assertEqual((stats["requests"], stats["connections"], stats["reused"]), (5, 1, 4))
+        self.assertEqual(stats["idle"], 1)
+
+    def test_stale_connection_retried(self):
+        """空闲连接被对端关闭后，在新连接上重试"""
+        self.pool.get(f"{self.server.url}/echo")
+        (idle,) = self.pool._idle.values()
+        idle[0][0].sock.shutdown(socket.SHUT_RDWR)
+        self.assertTrue(self.pool.get(f"{self.server.url}/echo").ok)
+        self.assertEqual(self.pool.stats()["retries"], 1)
+
+    def test_post_not_resent_after_sending(self):
+        """复用连接在请求发出后中断：POST 不重发，GET 在新连接上重发"""
+        self.server.route("POST", "/drop", lambda r: None)
+        self.server.route("GET", "/drop", lambda r: None)
+        self.pool.get(f"{self.server.url}/echo")
+        with self.assertRaises(TransportError):
+            self.pool.post(f"{self.server.url}/drop", json={})
+        self.assertEqual([r.method for r in self.server.requests if r.path == "/drop"], ["POST"])
+
+        self.pool.get(f"{self.server.url}/echo")
+        with self.assertRaises(TransportError):
+            self.pool.get(f"{self.server.url}/drop")
+        self.assertEqual([r.method for r in self.server.requests if r.path == "/drop"], ["POST", "GET", "GET"])
+
+    def test_connection_close_not_pooled(self):
+        self.server.route("GET", "/close", lambda r: (200, "bye", {"Connection": "close"}))
+        self.assertEqual(self.pool.get(f"{self.server.url}/close").text, "bye")
+        self.assertEqual(self.pool.stats()["idle"], 0)
+
+    def test_errors(self):
+        """超时、连接失败抛出 TransportError；非 2xx 正常返回"""
+        self.server.route("GET", "/slow", lambda r: (time.sleep(0.5), (200, "ok"))[1])
+        with self.assertRaises(TransportError) as ctx:
+            self.pool.get(f"{self.server.url}/slow", timeout=0.1)
+        # 请求已发出，不是连接阶段的错误
+        self.assertNotIsInstance(ctx.exception, ConnectError)
+        with self.assertRaises(ConnectError):
+            self.pool.post(closed_port_url(), json={})
+        self.assertEqual(self.pool.get(f"{self.server.url}/missing").status, 404)
+        with self.assertRaises(TransportError):
+            self.pool.get("ftp://example.com/")
+
+    def test_http_proxy(self):
+        """http 经代理时请求行为完整 URL"""
+        pool = ConnectionPool(TransportConfig(proxies={"http": self.server.url}))
+        response = pool.post("http://zhihu.invalid/echo", json={})
+        self.assertTrue(response.ok)
+        self.assertTrue(self.server.requests[-1].proxied)
+        self.assertEqual(self.server.requests[-1].headers["host"], "zhihu.invalid")
+        pool.close()
+
+    def test_config_from_publisher_settings(self):
+        config = TransportConfig.from_publisher_config(FakeConfig(enabled=True))
+        self.assertEqual(config.timeout, 12.0)
+        self.assertEqual(config.proxies, {"http": "http://127.0.0.1:8080"})
+        self.assertEqual(TransportConfig.from_publisher_config(FakeConfig(enabled=False)).proxies, {})
+
+
+class TestAsyncConnectionPool(unittest.TestCase):
+    """异步连接池测试"""
+
+    def test_keep_alive_and_chunked(self):
+        with FakeServer({("POST", "/echo"): echo}) as server:
+            server.route("GET", "/chunked", lambda r: (
+                200, b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n", {"Transfer-Encoding": "chunked"}
+            ))
+            pool = AsyncConnectionPool(TransportConfig(timeout=5))
+
+            async def run():
+                results = [await pool.post(f"{server.url}/echo", json={"n": i}) for i in range(3)]
+                results.append(await pool.get(f"{server.url}/chunked"))
+                await pool.aclose()
+                return results
+
+            results = asyncio.run(run())
+            self.assertEqual([r.json()["body"] for r in results[:3]], [{"n": 0}, {"n": 1}, {"n": 2}])
+            self.assertEqual(results[3].text, "hello world")
+            self.assertEqual(server.connections, 1)
+            self.assertEqual(pool.stats()["reused"], 3)
+
+    def test_new_event_loop_drops_idle(self):
+        """空闲连接不跨事件循环复用"""
+        with FakeServer({("POST", "/echo"): echo}) as server:
+            pool = AsyncConnectionPool(TransportConfig(timeout=5))
+            for _ in range(2):
+                asyncio.run(pool.post(f"{server.url}/echo", json={}))
+            self.assertEqual(server.connections, 2)
+
+    def test_post_not_resent_after_sending(self):
+        """复用连接在请求发出后中断时 POST 不重发"""
+        with FakeServer({("POST", "/echo"): echo, ("POST", "/drop"): lambda r: None}) as server:
+            pool = AsyncConnectionPool(TransportConfig(timeout=5))
+
+            async def run():
+                await pool.post(f"{server.url}/echo", json={})
+                try:
+                    await pool.post(f"{server.url}/drop", json={})
+                finally:
+                    await pool.aclose()
+
+            with self.assertRaises(TransportError):
+                asyncio.run(run())
+            self.assertEqual(len([r for r in server.requests if r.path == "/drop"]), 1)
+            self.assertEqual(pool.stats()["retries"], 0)
+
+    def test_connect_error(self):
+        """建立连接失败抛出 ConnectError，读超时抛出普通 TransportError"""
+        with FakeServer() as server:
+            server.route("GET", "/slow", lambda r: (time.sleep(0.5), (200, "ok"))[1])
+            pool = AsyncConnectionPool(TransportConfig(timeout=0.1))
+            with self.assertRaises(ConnectError):
+                asyncio.run(pool.post(closed_port_url(), json={}))
+            with self.assertRaises(TransportError) as ctx:
+                asyncio.run(pool.get(f"{server.url}/slow"))
+            self.assertNotIsInstance(ctx.exception, ConnectError)
+
+
+class TestAdapterTransport(unittest.TestCase):
+    """适配器共用连接池"""
+
+    def setUp(self):
+        self.server = FakeServer().start()
+        self.server.route("POST", "/api/v4/articles", lambda r: (200, {"id": 42}))
+        self.server.route("GET", "/api/v4/articles/42", lambda r: (200, {"voteup_count": 7}))
+        self.previous = get_transport()
+        set_transport(ConnectionPool(TransportConfig(timeout=5)))
+
+    def tearDown(self):
+        set_transport(self.previous)
+        self.server.stop()
+
+    def test_adapters_share_pool(self):
+        """多个适配器实例经全局连接池发布，只建立一个连接"""
+        for _ in range(3):
+            adapter = ZhihuAdapter(cookies={"z_c0": "token"}, api_base=self.server.url)
+            result = adapter.publish(Content(title="测试文章", body=BODY))
+            self.assertTrue(result.success, result.error)
+            self.assertEqual(result.post_id, "42")
+        status = adapter.get_status("42")
+        self.assertEqual((status.status, status.like_count), (PostStatus.PUBLISHED, 7))
+        self.assertEqual(self.server.connections, 1)
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["cookie"], "z_c0=token")
+        self.assertIn("<p>", request.json()["content"])
+
+    def test_async_publish(self):
+        adapter = ZhihuAdapter(cookies={"z_c0": "token"}, api_base=self.server.url)
+        adapter.async_transport = AsyncConnectionPool(TransportConfig(timeout=5))
+
+        async def run():
+            result = await adapter.apublish(Content(title="测试文章", body=BODY))
+            await adapter.async_transport.aclose()
+            return result
+
+        result = asyncio.run(run())
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(self.server.requests[0].json()["title"], "测试文章")
+
+    def test_http_error(self):
+        self.server.route("POST", "/api/v4/articles", lambda r: (403, {"error": "forbidden"}))
+        adapter = ZhihuAdapter(cookies={"z_c0": "token"}, api_base=self.server.url)
+        result = adapter.publish(Content(title="测试文章", body=BODY))
+        self.assertFalse(result.success)
+        self.assertIn("403", result.error)
+
+    def test_server_error_not_resent(self):
+        """5xx 时平台可能已处理请求，不重发；计入熔断"""
+        self.server.route("POST", "/api/v4/articles", lambda r: (500, {"error": "internal"}))
+        adapter = ZhihuAdapter(cookies={"z_c0": "token"}, api_base=self.server.url)
+        result = adapter.publish(Content(title="测试文章", body=BODY))
+        self.assertEqual((result.success, result.retryable, result.transient), (False, False, True))
+        self.assertEqual(len(self.server.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()